@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 로컬 스텁 서버 및 테스트 데이터
+"""
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 텍스트/페이지 데이터
+- 저장된 페이지 폴더가 있으면 사용, 없으면 합성 데이터 생성
+"""
+import os
+import random
+
+_FILLER = [
+    '채용공고', '회사소개', '복지', '연봉정보', '기업리뷰', '면접후기', '서비스 소개',
+    '개인정보처리방침', '이용약관', '고객센터', '공지사항', '뉴스룸', '인재채용',
+    'Products', 'Solutions', 'About us', 'Careers', 'Blog', 'Pricing',
+]
+
+
+def filler_text(rnd, length):
+    """연락처 없는 본문 텍스트 (length자 이상)"""
+    words = []
+    size = 0
+    while size < length:
+        word = rnd.choice(_FILLER)
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words)
+
+
+def synthetic_text(index, length=3000, seed=None):
+    """연락처가 포함된 합성 텍스트 (푸터 위치에 연락처)"""
+    rnd = random.Random(index if seed is None else seed)
+    body = filler_text(rnd, length)
+    footer = (
+        f" (주)테스트기업{index} 대표: 홍길동 사업자등록번호 123-45-{index:05d}"
+        f" 주소: 서울특별시 강남구 테헤란로 {index} 전화 02-{1000 + index % 9000}-{index % 10000:04d}"
+        f" 마케팅 문의 marketing{index}@example{index}.co.kr 대표메일 info@example{index}.co.kr"
+    )
+    return body + footer
+
+
+def synthetic_page(index, length=20000):
+    """합성 HTML 페이지 (네비게이션 + 본문 + 푸터)"""
+    rnd = random.Random(index)
+    nav = ''.join(f'<li><a href="/{w}">{w}</a></li>' for w in rnd.sample(_FILLER, 8))
+    body = []
+    size = 0
+    while size < length:
+        para = ' '.join(rnd.choice(_FILLER) for _ in range(30))
+        body.append(f'<div class="section"><p>{para}</p></div>')
+        size += len(para) + 40
+    return (
+        f'<html><head><title>테스트기업{index}</title>'
+        f'<script>var cfg = {{"api": "https://api.example.com", "ts": {index}}};</script></head>'
+        f'<body><nav><ul>{nav}</ul></nav><h1>테스트기업{index}</h1>{"".join(body)}'
+        f'<footer id="footer"><p>{synthetic_text(index, length=0)}</p>'
+        f'<a href="http://www.example{index}.co.kr">홈페이지</a></footer></body></html>'
+    )
+
+
+def load_pages(directory, limit=None):
+    """폴더의 .html 파일 읽기 (없으면 빈 리스트)"""
+    if not directory or not os.path.isdir(directory):
+        return []
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(('.html', '.htm')):
+            continue
+        with open(os.path.join(directory, name), encoding='utf-8', errors='ignore') as f:
+            pages.append(f.read())
+        if limit and len(pages) >= limit:
+            break
+    return pages
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+합성 픽스처 아카이브 (실제로 기록한 아카이브가 없을 때 e2e 벤치마크용)
+- 사람인 리뷰 목록/상세, 원티드 채용공고/기업 API, 기업 홈페이지와 하위 페이지를
+  실제 수집 때와 같은 URL로 아카이브에 넣음
+- 기업 홈페이지는 세 종류를 번갈아 생성
+  0: 푸터에 영업 메일 (홈페이지에서 종료)
+  1: 대표 메일만 있고 /contact에 영업 메일 (하위 페이지에서 조기 종료)
+  2: 메일 없음 (하위 페이지를 모두 읽고 AI 파싱)
+"""
+import json
+import random
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import WANTED_PAGE_SIZE
+from bench.corpus import filler_text
+
+SARAMIN_REVIEW_URL = 'https://www.saramin.co.kr/zf_user/company-review'
+WANTED_API_URL = 'https://www.wanted.co.kr/api/v4'
+WANTED_CATEGORIES = [518, 507, 508, 510, 512]
+HTML = {'Content-Type': 'text/html; charset=utf-8'}
+JSON = {'Content-Type': 'application/json; charset=utf-8'}
+
+
+def _sections(rnd, length):
+    return ''.join(f'<div class="section"><p>{filler_text(rnd, 300)}</p></div>' for _ in range(max(1, length // 300)))
+
+
+def company_site(index, page_length=20000):
+    """기업 홈페이지와 하위 페이지 {경로: HTML}"""
+    rnd = random.Random(index)
+    domain = f'replay{index}.example.kr'
+    kind = index % 3
+    nav = ('<nav><ul><li><a href="/about">회사소개</a></li><li><a href="/contact">문의하기</a></li>'
+           '<li><a href="/careers">인재채용</a></li><li><a href="/news">뉴스룸</a></li></ul></nav>')
+    footer_mail = {0: f'영업 문의 sales@{domain}', 1: f'대표메일 info@{domain}', 2: ''}[kind]
+    home = (
+        f'<html><head><title>리플레이기업{index}</title></head><body>{nav}'
+        f'<h1>리플레이기업{index}</h1>{_sections(rnd, page_length)}'
+        f'<footer id="footer"><p>(주)리플레이기업{index} 서울특별시 강남구 테헤란로 {index}'
+        f' 전화 02-{1000 + index % 9000}-{index % 10000:04d} {footer_mail}</p></footer></body></html>'
+    )
+    contact_mail = f'제휴/영업 문의 partner@{domain}' if kind == 1 else '문의는 홈페이지 게시판을 이용해 주세요'
+    pages = {
+        '/': home,
+        '/about': f'<html><body>{nav}<h2>회사소개</h2>{_sections(rnd, page_length // 2)}</body></html>',
+        '/contact': f'<html><body>{nav}<h2>문의하기</h2><p>{contact_mail}</p>{_sections(rnd, 2000)}</body></html>',
+    }
+    return f'https://www.{domain}', pages
+
+
+def saramin_detail(index, website, page_length=30000):
+    rnd = random.Random(index * 7)
+    return (
+        f'<html><body><h1>리플레이기업{index}기업정보채용중3</h1>'
+        f'<ul class="info_list"><li>홈페이지 <a href="{website}">{website}</a></li>'
+        f'<li>업종 소프트웨어 개발</li><li>주소 서울 강남구 테헤란로 {index}</li></ul>'
+        f'<div class="review">{_sections(rnd, page_length)}</div>'
+        f'<footer>사람인 고객센터 help@saramin.co.kr 02-2025-4733</footer></body></html>'
+    )
+
+
+def _record(archive, url, content, headers):
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    archive.record('GET', url, None, 200, headers, content)
+
+
+def _record_site(archive, index, page_length):
+    website, pages = company_site(index, page_length)
+    for path, html in pages.items():
+        _record(archive, website + path, html, HTML)
+    return website
+
+
+def build_synthetic_archive(archive, companies=40, page_length=20000, list_size=20):
+    """
+    사람인/원티드 각각 companies개 기업을 아카이브에 기록
+    사람인 목록은 list_size개씩, 원티드는 카테고리별로 WANTED_PAGE_SIZE개씩 나눠서 기록
+    """
+    # 사람인: 목록 → 상세 → 홈페이지
+    pages = max(1, -(-companies // list_size))
+    for page in range(1, pages + 6):  # 목록 순환 범위까지 (기업이 없으면 빈 목록)
+        csns = [f'replay{i:05d}' for i in range((page - 1) * list_size, min(page * list_size, companies))]
+        links = ''.join(f'<li><a href="/zf_user/company-review/view?csn={csn}">기업</a></li>' for csn in csns)
+        _record(archive, f'{SARAMIN_REVIEW_URL}?page={page}', f'<html><body><ul>{links}</ul></body></html>', HTML)
+    for i in range(companies):
+        website = _record_site(archive, i, page_length)
+        _record(archive, f'{SARAMIN_REVIEW_URL}/view?csn=replay{i:05d}', saramin_detail(i, website), HTML)
+
+    # 원티드: 카테고리별 채용공고 → 기업 API → 홈페이지
+    per_category = -(-companies // len(WANTED_CATEGORIES))
+    company_id = 100000
+    for category in WANTED_CATEGORIES:
+        jobs = []
+        for _ in range(per_category):
+            index = companies + company_id - 100000  # 사람인 기업과 겹치지 않는 번호
+            website = _record_site(archive, index, page_length)
+            _record(archive, f'{WANTED_API_URL}/companies/{company_id}', json.dumps({'company': {
+                'id': company_id,
+                'name': f'리플레이기업{index}',
+                'industry_name': 'IT, 컨텐츠',
+                'link': website,
+                'address': f'서울 강남구 테헤란로 {index}',
+                'description': filler_text(random.Random(index), 1500),
+                'tags': [{'title': '스타트업'}],
+            }}, ensure_ascii=False), JSON)
+            jobs.append({'id': company_id * 10, 'position': '백엔드 개발자',
+                         'company': {'id': company_id, 'name': f'리플레이기업{index}'}})
+            company_id += 1
+
+        for offset in range(0, len(jobs) + 1, WANTED_PAGE_SIZE):
+            url = (f'{WANTED_API_URL}/jobs?country=kr&tag_type_ids={category}&job_sort=job.latest_order'
+                   f'&years=-1&locations=all&offset={offset}&limit={WANTED_PAGE_SIZE}')
+            _record(archive, url, json.dumps({'data': jobs[offset:offset + WANTED_PAGE_SIZE]}, ensure_ascii=False), JSON)
+    return archive.count()
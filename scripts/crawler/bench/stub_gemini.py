@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Gemini generateContent 스텁 서버
+- 요청당 고정 지연 + 입력 토큰 비례 지연을 흉내냄
+- 배치 프롬프트("=== [키] 회사명")는 키별 결과로 응답
+- truncate_over보다 많은 기업이 든 배치는 잘린 응답(MAX_TOKENS)을 반환
+"""
+import re
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser.ai_parser import estimate_tokens
+from parser.extractor import EMAIL_PATTERN
+
+EMAIL_RE = re.compile(EMAIL_PATTERN)
+SECTION_RE = re.compile(r'^=== \[(c\d+)\] .*$', re.MULTILINE)
+
+
+def _contacts(text):
+    emails = EMAIL_RE.findall(text)
+    return {
+        'contacts': [{'name': None, 'title': None, 'email': emails[0], 'phone': None, 'department': None}] if emails else [],
+        'company_email': emails[-1] if emails else None,
+        'company_phone': None,
+    }
+
+
+class StubGeminiServer:
+    def __init__(self, latency=0.5, per_1k_tokens=0.02, truncate_over=None):
+        self.latency = latency
+        self.per_1k_tokens = per_1k_tokens
+        self.truncate_over = truncate_over
+        self.requests = 0
+        self.input_tokens = 0
+        self._server = None
+
+    def _respond(self, prompt):
+        tokens = estimate_tokens(prompt)
+        self.requests += 1
+        self.input_tokens += tokens
+        time.sleep(self.latency + tokens / 1000 * self.per_1k_tokens)
+
+        matches = list(SECTION_RE.finditer(prompt))
+        if not matches:
+            return json.dumps(_contacts(prompt.split('웹페이지 내용:')[-1]), ensure_ascii=False), 'STOP'
+
+        results = {}
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(prompt)
+            results[match.group(1)] = _contacts(prompt[match.end():end])
+        text = json.dumps({'results': results}, ensure_ascii=False)
+        if self.truncate_over and len(matches) > self.truncate_over:
+            return text[:len(text) // 2], 'MAX_TOKENS'
+        return text, 'STOP'
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+            disable_nagle_algorithm = True
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                text, finish = stub._respond(body['contents'][0]['parts'][0]['text'])
+                payload = json.dumps({'candidates': [{
+                    'content': {'parts': [{'text': text}]},
+                    'finishReason': finish,
+                }]}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}/v1beta/models/stub:generateContent"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
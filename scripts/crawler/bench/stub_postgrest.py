@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+PostgREST(Supabase REST) 호환 스텁 서버 (메모리 저장)
+- GET: col=eq.값, col=in.("a","b"), or=(a.eq.x,b.eq.y), select=, order=, limit=, offset=
+- POST: 단건/배열, on_conflict + Prefer: resolution=merge-duplicates (upsert)
+- PATCH: 필터에 맞는 행 수정
+- unique 제약조건이 없는 컬럼으로 on_conflict하면 400 (실제 PostgREST와 동일)
+"""
+import re
+import json
+import time
+import threading
+from urllib.parse import urlparse, parse_qsl
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+_IN_VALUE_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|([^,]+)')
+
+
+def _parse_in(value):
+    """in.(...) 값 목록 파싱"""
+    inner = value[value.index('(') + 1:value.rindex(')')]
+    items = []
+    for quoted, bare in _IN_VALUE_RE.findall(inner):
+        items.append(re.sub(r'\\(.)', r'\1', quoted) if quoted else bare)
+    return items
+
+
+def _match(row, column, expr):
+    op, _, value = expr.partition('.')
+    if op == 'eq':
+        return str(row.get(column)) == value
+    if op == 'in':
+        return str(row.get(column)) in _parse_in(expr)
+    return False
+
+
+def _matches(row, filters):
+    for column, expr in filters:
+        if column == 'or':
+            parts = expr.strip('()').split(',')
+            if not any(_match(row, *p.split('.', 1)) for p in parts):
+                return False
+        elif not _match(row, column, expr):
+            return False
+    return True
+
+
+class StubPostgrestServer:
+    def __init__(self, latency=0.05, unique=None):
+        self.latency = latency
+        self.unique = unique or {'companies': {'name'}, 'settings': {'key'}}
+        self.tables = {}
+        self.requests = 0
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _handle(self, method, path, query, body, prefer):
+        self.requests += 1
+        time.sleep(self.latency)
+
+        table = path.rstrip('/').rsplit('/', 1)[-1]
+        params = parse_qsl(query, keep_blank_values=True)
+        options = dict(params)
+        select = options.get('select')
+        on_conflict = options.get('on_conflict')
+        filters = [(k, v) for k, v in params if k not in ('select', 'on_conflict', 'order', 'limit', 'offset')]
+
+        with self._lock:
+            rows = self.tables.setdefault(table, [])
+
+            if method == 'GET':
+                found = [r for r in rows if _matches(r, filters)]
+                if options.get('order'):
+                    column, _, direction = options['order'].partition('.')
+                    found.sort(key=lambda r: r.get(column) or 0, reverse=direction == 'desc')
+                offset = int(options.get('offset', 0))
+                found = found[offset:offset + int(options['limit'])] if 'limit' in options else found[offset:]
+                if select and select != '*':
+                    columns = select.split(',')
+                    found = [{c: r.get(c) for c in columns} for r in found]
+                return 200, found
+
+            if method == 'PATCH':
+                found = [r for r in rows if _matches(r, filters)]
+                for r in found:
+                    r.update(body)
+                return 200, found
+
+            if method == 'POST':
+                items = body if isinstance(body, list) else [body]
+                if on_conflict and on_conflict not in self.unique.get(table, set()):
+                    return 400, {'code': '42P10', 'message': 'there is no unique or exclusion constraint matching the ON CONFLICT specification'}
+                merge = 'merge-duplicates' in prefer
+                saved = []
+                for item in items:
+                    existing = None
+                    if on_conflict:
+                        existing = next((r for r in rows if r.get(on_conflict) == item.get(on_conflict)), None)
+                    if existing and merge:
+                        existing.update(item)
+                        saved.append(existing)
+                        continue
+                    if existing:
+                        return 409, {'code': '23505', 'message': 'duplicate key value violates unique constraint'}
+                    row = {'id': self._next_id, **item}
+                    self._next_id += 1
+                    rows.append(row)
+                    saved.append(row)
+                return 201, saved
+
+        return 405, {'message': 'method not allowed'}
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+            disable_nagle_algorithm = True
+            def _serve(self, method):
+                url = urlparse(self.path)
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length)) if length else None
+                status, payload = stub._handle(method, url.path, url.query, body, self.headers.get('Prefer', ''))
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._serve('GET')
+
+            def do_POST(self):
+                self._serve('POST')
+
+            def do_PATCH(self):
+                self._serve('PATCH')
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
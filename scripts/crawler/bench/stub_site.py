@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+기업 웹사이트/목록 페이지 스텁 서버
+- /page/{번호}: 합성 HTML 페이지 (ETag, Last-Modified 포함)
+- If-None-Match/If-Modified-Since가 현재 버전과 같으면 304 (본문 없음)
+- change(비율)로 일부 페이지의 버전을 올려 "바뀐 페이지"를 흉내냄
+"""
+import time
+import random
+import hashlib
+import threading
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.corpus import synthetic_page
+
+
+class StubSiteServer:
+    def __init__(self, latency=0.02, page_length=20000):
+        self.latency = latency
+        self.page_length = page_length
+        self.versions = {}  # 페이지 번호 -> (버전, 수정 시각)
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    def change(self, ratio, seed=0):
+        """전체 페이지 중 ratio 비율의 버전을 올림"""
+        rnd = random.Random(seed)
+        with self._lock:
+            for index in list(self.versions):
+                if rnd.random() < ratio:
+                    version, _ = self.versions[index]
+                    self.versions[index] = (version + 1, time.time())
+
+    def _page(self, index):
+        with self._lock:
+            version, modified = self.versions.setdefault(index, (0, time.time() - 86400))
+        body = synthetic_page(index * 1000 + version, length=self.page_length).encode('utf-8')
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        return body, etag, formatdate(modified, usegmt=True)
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                stub.requests += 1
+                time.sleep(stub.latency)
+                try:
+                    index = int(self.path.rstrip('/').rsplit('/', 1)[-1])
+                except ValueError:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                body, etag, modified = stub._page(index)
+                if self.headers.get('If-None-Match') == etag or (
+                        not self.headers.get('If-None-Match') and self.headers.get('If-Modified-Since') == modified):
+                    stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+
+                stub.bytes_sent += len(body)
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', modified)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
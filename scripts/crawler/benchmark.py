@@ -0,0 +1,590 @@
+# -*- coding: utf-8 -*-
+"""
+ColdMail 크롤러 벤치마크 (외부 네트워크 없이 로컬 스텁/데이터로 실행)
+사용법:
+  python benchmark.py ai-batch [--companies 40] [--latency 0.5]
+  python benchmark.py extract [--corpus 저장된_페이지_폴더]
+  python benchmark.py storage [--rows 200] [--latency 0.05]
+  python benchmark.py http-cache [--pages 100] [--changed 0.1]
+  python benchmark.py html-parse [--corpus 저장된_페이지_폴더] [--backends selectolax lxml bs4]
+  python benchmark.py parse-scaling [--corpus 저장된_페이지_폴더] [--max-workers 4]
+  python benchmark.py saramin-detail [--archive 기록한_아카이브] [--pages 50]
+  python benchmark.py e2e [--archive 기록한_아카이브] [--limit 40] [--latency 0.05] [--target 30]
+"""
+import os
+import re
+import sys
+import time
+import asyncio
+import hashlib
+import logging
+import argparse
+import tempfile
+import contextlib
+import multiprocessing
+
+import requests
+from bs4 import BeautifulSoup
+
+from bench.corpus import synthetic_text, synthetic_page, load_pages
+from bench.fixtures import build_synthetic_archive, saramin_detail
+from bench.stub_gemini import StubGeminiServer
+from bench.stub_postgrest import StubPostgrestServer
+from bench.stub_site import StubSiteServer
+from net.fetcher import Fetcher
+from net.http_cache import HTTPCache
+from net.rate_limit import HostRateLimiter
+from net import replay
+from net.replay import FixtureArchive, ReplayServer
+from parser.ai_parser import AIParser
+from parser.extractor import ContactExtractor, SARAMIN_BLOCKLIST
+from parser.html_doc import available_backends
+from parser.parse_pool import ParsePool, decode_body
+from storage.supabase_client import SupabaseStorage
+from storage.dedup_index import DedupIndex
+from storage.frontier import Frontier
+
+
+def bench_ai_batch(args):
+    """단건 호출 vs 배치 호출 비교"""
+    items = [
+        {'key': i, 'text': synthetic_text(i, length=args.text_length), 'company_name': f'테스트기업{i}'}
+        for i in range(args.companies)
+    ]
+
+    for mode in ['single', 'batch']:
+        stub = StubGeminiServer(latency=args.latency, per_1k_tokens=args.per_1k_tokens,
+                                truncate_over=args.truncate_over).start()
+        ai_parser = AIParser(api_key='stub', api_url=stub.url, use_cache=False)
+        started = time.perf_counter()
+
+        if mode == 'single':
+            results = {item['key']: ai_parser.extract_contacts(item['text'], item['company_name']) for item in items}
+        else:
+            results = ai_parser.extract_contacts_batch(items)
+
+        elapsed = time.perf_counter() - started
+        found = sum(1 for r in results.values() if r.get('contacts'))
+        stub.stop()
+
+        print(f"[{mode}] {elapsed:.2f}초 | 요청 {stub.requests}회 | 입력 토큰 {stub.input_tokens:,}"
+              f" | {len(items) / elapsed:.1f}건/초 | 연락처 {found}/{len(items)}"
+              f" | 배치 분할 {ai_parser.stats['batch_splits']}회")
+
+
+def _legacy_extract(text):
+    """기존 방식 (이메일 1회 + 전화번호 패턴별 4회 스캔, 부분 문자열 필터)"""
+    emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', text)
+    emails = [e for e in set(emails) if not any(x in e.lower() for x in ['saramin', 'help@', 'noreply', 'example'])]
+    phones = []
+    for pattern in [r'02-\d{3,4}-\d{4}', r'0\d{1,2}-\d{3,4}-\d{4}', r'010-\d{4}-\d{4}', r'070-\d{4}-\d{4}']:
+        phones.extend(re.findall(pattern, text))
+    phones = [p for p in set(phones) if p not in ['02-6226-5000', '02-6937-0039']]
+    return {'emails': emails, 'phones': phones}
+
+
+def _corpus_texts(args):
+    pages = load_pages(args.corpus, limit=args.pages)
+    source = args.corpus
+    if not pages:
+        pages = [synthetic_page(i) for i in range(args.pages or 200)]
+        source = '합성 페이지'
+    texts = [BeautifulSoup(page, 'html.parser').get_text(separator=' ', strip=True) for page in pages]
+    print(f"코퍼스: {source} ({len(texts)}개, {sum(len(t) for t in texts) / 1e6:.2f}M자)")
+    return texts
+
+
+def bench_extract(args):
+    """정규식 연락처 추출: 기존 방식 vs 통합 추출기"""
+    texts = _corpus_texts(args)
+    extractor = ContactExtractor(SARAMIN_BLOCKLIST)
+
+    for name, func in [('legacy', _legacy_extract), ('extractor', extractor.extract)]:
+        found = 0
+        best = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            found = 0
+            for text in texts:
+                result = func(text)
+                found += len(result['emails']) + len(result['phones'])
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        per_page = best / len(texts) * 1000
+        print(f"[{name}] {best * 1000:.1f}ms ({per_page:.3f}ms/페이지) | 추출 {found}건")
+
+
+def bench_storage(args):
+    """건별 저장(중복 확인 + 조회 + INSERT/PATCH) vs 일괄 upsert (스텁 PostgREST 서버)"""
+    rows = [
+        {'name': f'테스트기업{i}', 'website': f'https://example{i}.co.kr', 'contact_email': f'sales@example{i}.co.kr'}
+        for i in range(args.rows)
+    ]
+    # 절반은 이미 있는 기업 (업데이트 경로)
+    seed = rows[::2]
+
+    for mode in ['per-row', 'bulk']:
+        stub = StubPostgrestServer(latency=args.latency).start()
+        storage = SupabaseStorage(url=stub.url, key='stub')
+        storage.save_companies_bulk(seed)
+        stub.requests = 0
+
+        started = time.perf_counter()
+        actions = {}
+        if mode == 'per-row':
+            for row in rows:
+                storage.check_duplicate(row['name'], row['website'])
+                action = storage.save_company(row)['action']
+                actions[action] = actions.get(action, 0) + 1
+        else:
+            for i in range(0, len(rows), args.bulk_size):
+                for outcome in storage.save_companies_bulk(rows[i:i + args.bulk_size]):
+                    actions[outcome['action']] = actions.get(outcome['action'], 0) + 1
+        elapsed = time.perf_counter() - started
+        stub.stop()
+
+        connections = storage.session.connection_stats.to_dict()
+        print(f"[{mode}] {elapsed:.2f}초 | 요청 {stub.requests}회 (새 연결 {connections['handshakes']}회)"
+              f" | {len(rows) / elapsed:.1f}건/초 | {actions}")
+
+
+def bench_http_cache(args):
+    """같은 페이지를 두 번 수집: 첫 실행(캐시 없음) vs 다음 실행(조건부 요청, 일부 페이지만 변경)"""
+    stub = StubSiteServer(latency=args.latency).start()
+    urls = [f"{stub.url}/page/{i}" for i in range(args.pages)]
+    cache_dir = tempfile.mkdtemp()
+    cache = HTTPCache(path=os.path.join(cache_dir, 'http.sqlite3'), max_bytes=int(args.max_mb * 1024 * 1024))
+
+    async def crawl(fetcher):
+        # 파이프라인 상세 단계처럼 워커 몇 개가 차례로 요청
+        queue = list(reversed(urls))
+        responses = []
+
+        async def worker():
+            while queue:
+                responses.append(await fetcher.get_async(queue.pop()))
+
+        await asyncio.gather(*(worker() for _ in range(args.workers)))
+        return responses
+
+    for run in ['first', 'next']:
+        if run == 'next':
+            stub.change(args.changed)
+        before = cache.stats()
+        sent = stub.bytes_sent
+        # 모든 페이지가 같은 호스트 → 호스트 딜레이가 전체 시간을 좌우
+        limiter = HostRateLimiter(host_delays={}, default_delay=args.delay, adaptive=False, robots=False)
+        fetcher = Fetcher(limiter=limiter, cache=cache)
+        started = time.perf_counter()
+        responses = asyncio.run(crawl(fetcher))
+        elapsed = time.perf_counter() - started
+        fetcher.close()
+
+        after = cache.stats()
+        hits = after['hits'] - before['hits']
+        downloaded = after['bytes_downloaded'] - before['bytes_downloaded']
+        ok = sum(1 for r in responses if r is not None and r.text)
+        print(f"[{run}] {elapsed:.2f}초 | 304 {hits}/{len(urls)} | 다운로드 {downloaded / 1024:.0f}KB"
+              f" (서버 전송 {(stub.bytes_sent - sent) / 1024:.0f}KB) | 응답 {ok}/{len(urls)}")
+
+    stats = cache.stats()
+    print(f"캐시: 적중률 {stats['hit_ratio']:.0%}, 저장 {stats['stored_bytes'] / 1024:.0f}KB (압축),"
+          f" 삭제 {stats['evictions']}")
+    cache.close()
+    stub.stop()
+
+
+def _rss_mb():
+    """현재 프로세스 메모리 (Linux /proc 기준, 없으면 None)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _html_parse_worker(pages, repeat, queue):
+    """백엔드 하나로 상세 페이지/웹사이트 파싱 (별도 프로세스, CRAWLER_HTML_PARSER로 백엔드 지정)"""
+    from parser.html_doc import resolve_backend, parse_html
+    from sources.saramin import SaraminCrawler
+    from sources.website import WebsiteCrawler
+
+    saramin = SaraminCrawler()
+    website = WebsiteCrawler(None, ContactExtractor())
+
+    best = None
+    signatures = []
+    for _ in range(repeat):
+        signatures = []
+        started = time.process_time()
+        for page in pages:
+            detail = saramin._parse_detail({}, page)
+            site = website.parse_page(page, 'http://www.example.co.kr/')
+            signatures.append((
+                hashlib.md5(site['text'].encode('utf-8')).hexdigest(),
+                tuple(site['emails'] + site['phones']),
+                hashlib.md5(repr(site['links']).encode('utf-8')).hexdigest(),
+                (detail.get('name'), detail.get('website'), tuple(detail['emails'] + detail['phones'])),
+            ))
+        elapsed = time.process_time() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    # 파싱한 문서를 모두 들고 있을 때 늘어난 메모리 (문서 하나당)
+    before = _rss_mb()
+    docs = [parse_html(page) for page in pages]
+    after = _rss_mb()
+    del docs
+
+    queue.put({
+        'backend': resolve_backend(),
+        'cpu': best,
+        'doc_mb': None if before is None else (after - before) / len(pages),
+        'signatures': signatures,
+    })
+
+
+def bench_html_parse(args):
+    """HTML 파서 백엔드별 CPU 시간/메모리 (백엔드마다 새 프로세스에서 실행)"""
+    pages = load_pages(args.corpus, limit=args.pages)
+    source = args.corpus
+    if not pages:
+        pages = [synthetic_page(i, length=args.page_length) for i in range(args.pages or 100)]
+        source = '합성 페이지'
+    print(f"코퍼스: {source} ({len(pages)}개, {sum(len(p) for p in pages) / 1e6:.2f}M자)")
+
+    backends = args.backends or available_backends()
+    missing = [b for b in backends if b not in available_backends()]
+    if missing:
+        print(f"설치되지 않은 백엔드 제외: {', '.join(missing)}")
+    backends = [b for b in backends if b not in missing]
+
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    for backend in backends:
+        os.environ['CRAWLER_HTML_PARSER'] = backend
+        queue = context.Queue()
+        process = context.Process(target=_html_parse_worker, args=(pages, args.repeat, queue))
+        process.start()
+        results[backend] = queue.get()
+        process.join()
+    os.environ.pop('CRAWLER_HTML_PARSER', None)
+
+    reference = results.get('bs4', next(iter(results.values())))['signatures']
+    for backend, result in results.items():
+        same = [sum(1 for a, b in zip(result['signatures'], reference) if a[i] == b[i]) for i in range(4)]
+        memory = 'n/a' if result['doc_mb'] is None else f"{result['doc_mb']:.2f}MB"
+        print(f"[{backend}] CPU {result['cpu'] * 1000:.0f}ms ({result['cpu'] / len(pages) * 1000:.2f}ms/페이지)"
+              f" | 문서당 메모리 {memory}"
+              f" | bs4와 일치: 텍스트 {same[0]}/{len(pages)}, 연락처 {same[1]}/{len(pages)},"
+              f" 링크 {same[2]}/{len(pages)}, 상세 {same[3]}/{len(pages)}")
+
+
+def bench_parse_scaling(args):
+    """상세+웹사이트 파싱을 프로세스 수별로 실행 (0 = 이벤트 루프에서 직접 파싱)"""
+    from sources.saramin import parse_detail_html
+    from sources.website import parse_page
+
+    pages = load_pages(args.corpus, limit=args.pages)
+    source = args.corpus
+    if not pages:
+        pages = [synthetic_page(i, length=args.page_length) for i in range(args.pages or 200)]
+        source = '합성 페이지'
+    print(f"코퍼스: {source} ({len(pages)}개, {sum(len(p) for p in pages) / 1e6:.2f}M자), CPU {os.cpu_count()}개")
+
+    responses = []
+    for page in pages:
+        response = requests.Response()
+        response._content = page.encode('utf-8')
+        response.encoding = 'utf-8'
+        response.status_code = 200
+        responses.append(response)
+    detail_extractor = ContactExtractor(SARAMIN_BLOCKLIST)
+    site_extractor = ContactExtractor()
+
+    async def run(pool):
+        # 파싱하는 동안 이벤트 루프가 얼마나 막히는지 (수집 요청이 그만큼 늦어짐)
+        lag = 0.0
+        done = False
+
+        async def ticker():
+            nonlocal lag
+            while not done:
+                started = time.perf_counter()
+                await asyncio.sleep(0.01)
+                lag = max(lag, time.perf_counter() - started - 0.01)
+
+        async def company(response):
+            await pool.parse(parse_detail_html, response, detail_extractor)
+            await pool.parse(parse_page, response, 'http://www.example.co.kr/', site_extractor, 3000)
+
+        tick = asyncio.create_task(ticker())
+        # 첫 요청으로 워커 프로세스를 띄운 뒤 측정
+        await asyncio.gather(*(company(r) for r in responses[:max(1, pool.workers)]))
+        lag = 0.0
+        started = time.perf_counter()
+        await asyncio.gather(*(company(r) for r in responses))
+        elapsed = time.perf_counter() - started
+        done = True
+        await tick
+        return elapsed, lag
+
+    baseline = None
+    worker_counts = [0] + [w for w in (1, 2, 4, 8, 16, 32) if w <= args.max_workers]
+    for workers in worker_counts:
+        pool = ParsePool(workers)
+        elapsed, lag = asyncio.run(run(pool))
+        pool.close()
+        rate = len(responses) / elapsed
+        baseline = baseline or rate
+        label = '루프 안' if workers == 0 else f'프로세스 {workers}'
+        print(f"[{label}] {elapsed:.2f}초 | {rate:.1f}건/초 (x{rate / baseline:.2f}) | 이벤트 루프 최대 지연 {lag * 1000:.0f}ms")
+
+
+def _peak_rss_mb():
+    """프로세스 최대 메모리 (Linux /proc 기준, 없으면 None)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def bench_e2e(args):
+    """
+    기록한 아카이브(없으면 합성 아카이브)를 재생 서버로 돌려 전체 파이프라인 실행
+    사람인/원티드/기업 웹사이트는 재생 서버, Gemini/Supabase는 상태가 있는 스텁 서버 사용
+    호스트 딜레이는 --delay-scale 배로 줄여서 적용
+    --target을 주면 소스를 동시에 실행하고 스케줄러가 전체 목표(저장 수)를 나눠 줌 (main.py와 같은 방식)
+    """
+    from main import build_pipeline
+    from scheduler import SourceScheduler
+    from config import HOST_DELAYS, DEFAULT_HOST_DELAY
+    from sources.saramin import SaraminCrawler
+    from sources.wanted import WantedCrawler
+
+    work_dir = tempfile.mkdtemp()
+    archive = FixtureArchive(args.archive or os.path.join(work_dir, 'fixtures.sqlite3'))
+    if not args.archive:
+        build_synthetic_archive(archive, companies=args.limit, page_length=args.page_length)
+    print(f"아카이브: {args.archive or '합성'} (응답 {archive.count()}개) | 재생 지연 {args.latency * 1000:.0f}ms"
+          f" | 호스트 딜레이 x{args.delay_scale} | 파싱 프로세스 {args.parse_workers}")
+
+    server = ReplayServer(archive, latency=args.latency).start()
+    gemini = StubGeminiServer(latency=args.ai_latency).start()
+    postgrest = StubPostgrestServer(latency=args.db_latency).start()
+    replay.start_replay(server.url)
+
+    storage = SupabaseStorage(url=postgrest.url, key='stub')
+    ai_parser = AIParser(api_key='stub', api_url=gemini.url, use_cache=False)
+    dedup = DedupIndex(os.path.join(work_dir, 'dedup.sqlite3'))
+    frontier = Frontier(os.path.join(work_dir, 'frontier.sqlite3'))
+    limiter = HostRateLimiter(
+        host_delays={host: (low * args.delay_scale, high * args.delay_scale) for host, (low, high) in HOST_DELAYS.items()},
+        default_delay=DEFAULT_HOST_DELAY * args.delay_scale,
+        robots=False,  # Crawl-delay는 배율을 적용하지 않으므로 사용하지 않음
+    )
+    parse_pool = ParsePool(args.parse_workers)
+
+    # 수집 로그/진행 출력은 숨기고 결과만 표시
+    logging.getLogger().setLevel(logging.WARNING)
+    rss_start = _rss_mb()
+    total_companies = 0
+    total_elapsed = 0.0
+    scheduler = SourceScheduler(args.target, args.sources) if args.target else None
+
+    def report(source_name, stats, results, elapsed):
+        discovered = stats[0]['processed']
+        tally = results['sources'][source_name]
+        print(f"[{source_name}] {elapsed:.1f}초 | 기업 {discovered}개 ({discovered / elapsed * 60:.0f}건/분)"
+              f" | 저장 {tally['success']} / 실패 {tally['fail']} | AI 생략 {results['ai_calls_avoided']}"
+              f" | AI 입력 {results['ai_tokens_in']} → {results['ai_tokens_sent']}토큰")
+        for s in stats[1:]:
+            print(f"  [{s['stage']}] 처리 {s['processed']} / 스킵 {s['dropped']} / 오류 {s['errors']}"
+                  f" | p50 {s['p50_ms']}ms, p95 {s['p95_ms']}ms, p99 {s['p99_ms']}ms")
+        return discovered
+
+    try:
+        pipelines = []
+        for source_name in args.sources:
+            crawler_cls = SaraminCrawler if source_name == 'saramin' else WantedCrawler
+            crawler = crawler_cls(limiter=limiter, dedup=dedup, frontier=frontier, parse_pool=parse_pool)
+            results = {'total': 0, 'success': 0, 'fail': 0, 'stages': {}, 'ai_calls_avoided': 0,
+                       'ai_tokens_in': 0, 'ai_tokens_sent': 0}
+            pipelines.append((source_name, results, build_pipeline(
+                source_name, crawler, storage, ai_parser, dedup, results,
+                limit=args.limit, frontier=frontier, scheduler=scheduler)))
+
+        if scheduler:
+            async def run_all():
+                return await asyncio.gather(*(pipeline.run() for _, _, pipeline in pipelines))
+
+            started = time.perf_counter()
+            with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+                all_stats = asyncio.run(run_all())
+            total_elapsed = time.perf_counter() - started
+            for (source_name, results, _), stats in zip(pipelines, all_stats):
+                total_companies += report(source_name, stats, results, total_elapsed)
+            for source_name, stats in scheduler.stats().items():
+                print(f"  [스케줄러 {source_name}] 투입 {stats['admitted']} / 저장 {stats['saved']}"
+                      f" (처리 1초당 {stats['yield_per_sec']}건)")
+        else:
+            for source_name, results, pipeline in pipelines:
+                started = time.perf_counter()
+                with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+                    stats = asyncio.run(pipeline.run())
+                elapsed = time.perf_counter() - started
+                total_companies += report(source_name, stats, results, elapsed)
+                total_elapsed += elapsed
+    finally:
+        replay.stop()
+        parse_pool.close()
+        server.stop()
+        gemini.stop()
+        postgrest.stop()
+
+    peak = _peak_rss_mb()
+    memory = 'n/a' if peak is None else f"{peak:.0f}MB (시작 {rss_start:.0f}MB, 스텁 서버 포함)"
+    rate = total_companies / total_elapsed * 60 if total_elapsed else 0.0
+    print(f"전체: {total_companies}개 기업, {total_elapsed:.1f}초 ({rate:.0f}건/분) | 최대 메모리 {memory}")
+    print(f"재생 응답 {server.served} (기록 없음 {server.missing}) | Gemini 요청 {gemini.requests}"
+          f" | DB 요청 {postgrest.requests}")
+    archive.close()
+
+
+def _held_bytes(info):
+    """파싱 결과로 기업 dict에 남는 문자열 크기 (UTF-8 바이트)"""
+    size = 0
+    for value in info.values():
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, str):
+                size += len(item.encode('utf-8'))
+    return size
+
+
+def bench_saramin_detail(args):
+    """사람인 상세 페이지: 전체 파싱 vs 앞부분+푸터만 파싱 (CPU ms/페이지, 파싱한 길이, 결과 크기, 항목 일치)"""
+    from sources.saramin import parse_detail_html, parse_detail_fast, parse_detail_prefix
+    from parser.html_doc import resolve_backend
+
+    pages = []
+    source = '합성 상세 페이지'
+    if args.archive:
+        archive = FixtureArchive(args.archive)
+        pages = [decode_body(content) for _, content in archive.pages('%saramin.co.kr/zf_user/company-review/view%')]
+        archive.close()
+        source = args.archive
+    if not pages:
+        pages = [saramin_detail(i, f'https://www.replay{i}.example.kr', page_length=args.page_length)
+                 for i in range(args.pages)]
+    pages = pages[:args.pages]
+    print(f"페이지: {source} ({len(pages)}개, 평균 {sum(len(p) for p in pages) / len(pages) / 1000:.0f}K자)"
+          f" | 파서 {resolve_backend()}")
+
+    extractor = ContactExtractor(SARAMIN_BLOCKLIST)
+    results = {}
+    for label, func in (('전체', parse_detail_html), ('빠른', parse_detail_fast)):
+        best = None
+        for _ in range(args.repeat):
+            started = time.process_time()
+            infos = [func(page, extractor) for page in pages]
+            elapsed = time.process_time() - started
+            best = elapsed if best is None else min(best, elapsed)
+        results[label] = (best, infos)
+
+    # 파싱하는 동안 문서 트리로 들고 있는 입력 크기 (빠른 파싱은 앞부분 + 범위 밖 푸터)
+    def fast_input(page):
+        parsed = parse_detail_prefix(page)[2]
+        footer_at = page.rfind('<footer')
+        return len(page[:parsed].encode('utf-8')) + (len(page[footer_at:].encode('utf-8')) if footer_at >= parsed else 0)
+
+    inputs = {'전체': sum(len(page.encode('utf-8')) for page in pages) / len(pages),
+              '빠른': sum(fast_input(page) for page in pages) / len(pages)}
+    fields = ('name', 'website', 'industry_text', 'address', 'emails', 'phones')
+    reference = results['전체'][1]
+    for label, (cpu, infos) in results.items():
+        held = sum(_held_bytes(info) for info in infos) / len(pages)
+        same = ', '.join(f"{field} {sum(1 for a, b in zip(infos, reference) if a.get(field) == b.get(field))}"
+                         for field in fields)
+        print(f"[{label}] CPU {cpu / len(pages) * 1000:.2f}ms/페이지 | 파싱한 입력 {inputs[label] / 1024:.0f}KB/페이지"
+              f" | 결과 {held / 1024:.1f}KB/페이지 | 전체 파싱과 일치: {same} (/{len(pages)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ColdMail 크롤러 벤치마크')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    ai = sub.add_parser('ai-batch', help='AI 배치 추출 (스텁 Gemini 서버)')
+    ai.add_argument('--companies', type=int, default=40)
+    ai.add_argument('--text-length', type=int, default=3000)
+    ai.add_argument('--latency', type=float, default=0.5, help='요청당 고정 지연 (초)')
+    ai.add_argument('--per-1k-tokens', type=float, default=0.02, help='입력 1천 토큰당 지연 (초)')
+    ai.add_argument('--truncate-over', type=int, default=None,
+                    help='이 개수보다 큰 배치는 잘린 응답 반환 (분할 재시도 확인용)')
+    ai.set_defaults(func=bench_ai_batch)
+
+    ex = sub.add_parser('extract', help='정규식 연락처 추출 마이크로 벤치마크')
+    ex.add_argument('--corpus', type=str, default=None, help='저장된 HTML 페이지 폴더 (없으면 합성 페이지)')
+    ex.add_argument('--pages', type=int, default=None)
+    ex.add_argument('--repeat', type=int, default=5)
+    ex.set_defaults(func=bench_extract)
+
+    st = sub.add_parser('storage', help='DB 건별 저장 vs 일괄 upsert (스텁 PostgREST 서버)')
+    st.add_argument('--rows', type=int, default=200)
+    st.add_argument('--bulk-size', type=int, default=50)
+    st.add_argument('--latency', type=float, default=0.05, help='요청당 지연 (초)')
+    st.set_defaults(func=bench_storage)
+
+    hc = sub.add_parser('http-cache', help='HTTP 조건부 요청 캐시 (스텁 웹사이트 서버)')
+    hc.add_argument('--pages', type=int, default=100)
+    hc.add_argument('--changed', type=float, default=0.1, help='다음 실행 전에 바뀌는 페이지 비율')
+    hc.add_argument('--latency', type=float, default=0.02, help='요청당 지연 (초)')
+    hc.add_argument('--delay', type=float, default=0.05, help='같은 호스트 요청 간격 (초)')
+    hc.add_argument('--workers', type=int, default=2)
+    hc.add_argument('--max-mb', type=float, default=200, help='캐시 최대 크기 (MB)')
+    hc.set_defaults(func=bench_http_cache)
+
+    hp = sub.add_parser('html-parse', help='HTML 파서 백엔드 비교 (CPU 시간, 메모리, 결과 일치)')
+    hp.add_argument('--corpus', type=str, default=None, help='저장된 HTML 페이지 폴더 (없으면 합성 페이지)')
+    hp.add_argument('--pages', type=int, default=None)
+    hp.add_argument('--page-length', type=int, default=50000, help='합성 페이지 길이 (자)')
+    hp.add_argument('--repeat', type=int, default=3)
+    hp.add_argument('--backends', nargs='+', choices=['selectolax', 'lxml', 'bs4'], default=None)
+    hp.set_defaults(func=bench_html_parse)
+
+    ps = sub.add_parser('parse-scaling', help='HTML 파싱 프로세스 수별 처리량')
+    ps.add_argument('--corpus', type=str, default=None, help='저장된 HTML 페이지 폴더 (없으면 합성 페이지)')
+    ps.add_argument('--pages', type=int, default=None)
+    ps.add_argument('--page-length', type=int, default=50000, help='합성 페이지 길이 (자)')
+    ps.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    ps.set_defaults(func=bench_parse_scaling)
+
+    sd = sub.add_parser('saramin-detail', help='사람인 상세 페이지 전체 파싱 vs 빠른 파싱 (CPU, 결과 크기, 일치)')
+    sd.add_argument('--archive', type=str, default=None, help='main.py --record로 만든 아카이브 (없으면 합성)')
+    sd.add_argument('--pages', type=int, default=50)
+    sd.add_argument('--page-length', type=int, default=150000, help='합성 페이지 리뷰 본문 길이 (자)')
+    sd.add_argument('--repeat', type=int, default=3)
+    sd.set_defaults(func=bench_saramin_detail)
+
+    e2e = sub.add_parser('e2e', help='기록한 응답을 재생해 전체 파이프라인 실행 (건/분, 단계별 지연 분위수, 최대 메모리)')
+    e2e.add_argument('--archive', type=str, default=None, help='main.py --record로 만든 아카이브 (없으면 합성)')
+    e2e.add_argument('--sources', nargs='+', choices=['saramin', 'wanted'], default=['saramin', 'wanted'])
+    e2e.add_argument('--limit', type=int, default=40, help='소스별 수집 한도 (합성 아카이브 기업 수)')
+    e2e.add_argument('--target', type=int, default=0,
+                     help='전체 저장 목표 (지정하면 소스를 동시에 실행, 기본: 0 = 소스별로 차례로)')
+    e2e.add_argument('--page-length', type=int, default=20000, help='합성 페이지 길이 (자)')
+    e2e.add_argument('--latency', type=float, default=0.05, help='재생 서버 응답 지연 (초)')
+    e2e.add_argument('--ai-latency', type=float, default=0.5, help='Gemini 스텁 요청당 지연 (초)')
+    e2e.add_argument('--db-latency', type=float, default=0.05, help='PostgREST 스텁 요청당 지연 (초)')
+    e2e.add_argument('--delay-scale', type=float, default=0.02, help='호스트 딜레이 배율 (1이면 실제 딜레이)')
+    e2e.add_argument('--parse-workers', type=int, default=0)
+    e2e.set_defaults(func=bench_e2e)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,12 +14,104 @@ SUPABASE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
 
 # Gemini 설정
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+GEMINI_API_URL = 'https://generativelanguage.googleapis.com/v1beta/models/gemini-3-flash-preview:generateContent'
+
+# AI 배치 추출 (여러 기업을 한 번에 요청)
+AI_BATCH_TOKEN_BUDGET = 24000  # 배치당 입력 토큰 예산
+AI_BATCH_MAX_ITEMS = 8  # 배치당 최대 기업 수
+AI_BATCH_OUTPUT_TOKENS_PER_ITEM = 512  # 기업당 응답 토큰
+AI_BATCH_WAIT = 5  # 파이프라인에서 배치를 모으는 최대 대기 시간 (초)
+
+# AI 입력 축약 (연락처 단서 주변과 푸터만 남기고 페이지 사이 반복 문구 제거)
+AI_TEXT_TOKEN_BUDGET = 2500  # 기업당 입력 토큰 예산
+AI_CUE_WINDOW = 30  # 단서 앞뒤로 남길 단어 수
+AI_DEDUP_NGRAM = 8  # 이 단어 수만큼 연속으로 앞에서 나온 구간은 반복 문구로 보고 제거
+
+# 정규식 결과 신뢰도가 이 값 이상이면 AI 호출 생략 (1.1로 두면 항상 AI 호출)
+AI_GATE_THRESHOLD = 0.8
 
 # 크롤링 설정
 CRAWL_DELAY = 3  # 요청 간 딜레이 (초)
 MAX_RETRIES = 3  # 최대 재시도 횟수
 DAILY_LIMIT = 200  # 일일 수집 한도
 
+# 원티드 채용공고 목록 (카테고리별 offset은 frontier에 따로 저장)
+WANTED_PAGE_SIZE = 100  # 요청 한 번에 받는 공고 수 (API가 허용하는 최대)
+WANTED_MAX_OFFSET = 1000  # 카테고리별 offset이 이 값을 넘으면 처음부터
+
+# 호스트별 요청 간격 (초, 최소~최대 랜덤) - 사람인/원티드는 기존 딜레이 유지
+HOST_DELAYS = {
+    'saramin.co.kr': (CRAWL_DELAY + 1, CRAWL_DELAY + 3),
+    'wanted.co.kr': (CRAWL_DELAY + 0.5, CRAWL_DELAY + 1.5),
+}
+DEFAULT_HOST_DELAY = 1  # 기업 홈페이지 등 외부 사이트 (호스트별)
+
+# 호스트별 딜레이 자동 조정 (설정 딜레이에서 시작, 서버 응답에 따라 조정하고 다음 실행에 이어서 사용)
+POLITENESS_ADAPTIVE = True
+POLITENESS_SPEEDUP_AFTER = 10  # 연속 정상 응답이 이만큼 쌓일 때마다
+POLITENESS_SPEEDUP_FACTOR = 0.9  # 간격을 x0.9로 줄임
+POLITENESS_MIN_RATIO = 0.5  # 설정 딜레이의 50%보다 빠르게는 요청하지 않음
+POLITENESS_BACKOFF_FACTOR = 2  # 429/503/타임아웃이면 간격 x2
+POLITENESS_MAX_DELAY = 60  # 간격/Retry-After 상한 (초)
+ROBOTS_TXT_ENABLED = True  # robots.txt의 Crawl-delay/Request-rate를 최소 간격으로 사용
+ROBOTS_TXT_TTL_HOURS = 24  # 호스트별 robots.txt 재확인 주기
+FETCH_CONCURRENCY = 8  # 동시 요청 수 (서로 다른 호스트)
+COLLECT_CONCURRENCY = 8  # collect_stream()에서 동시에 처리하는 기업 수 (메모리에 남는 기업 수 상한)
+
+# HTML 파서 백엔드 ('auto': selectolax > lxml > bs4 중 설치된 것, 또는 selectolax/lxml/bs4 지정)
+HTML_PARSER = os.getenv('CRAWLER_HTML_PARSER', 'auto')
+
+# 사람인 리뷰 목록 (읽을 페이지 수는 남은 한도 / 페이지당 새 기업 수로 결정)
+SARAMIN_LIST_PREFETCH = 2  # 상세 단계보다 앞서 미리 요청해 두는 목록 페이지 수
+SARAMIN_LIST_PAGE_SIZE = 20  # 첫 페이지를 읽기 전 페이지당 새 기업 수 추정값
+SARAMIN_LIST_MAX_PAGES = 30  # 실행당 최대 목록 페이지 수 (이미 본 기업만 나와도 여기서 멈춤)
+
+# 사람인 상세 페이지는 기업명/기업 정보가 있는 앞부분(이 길이부터 두 배씩)과 푸터만 파싱
+SARAMIN_DETAIL_FAST = True
+SARAMIN_DETAIL_PREFIX = 32768  # 자
+
+# HTML 파싱/연락처 추출 프로세스 수 (0: 수집 루프에서 바로 파싱, N: 프로세스 N개로 분산)
+PARSE_WORKERS = 0
+
+# 기업 웹사이트 (홈페이지 + 문의/회사소개 등 하위 페이지)
+WEBSITE_MAX_PAGES = 4  # 도메인별 최대 요청 페이지 (홈페이지 포함)
+WEBSITE_STOP_CONFIDENCE = 0.8  # 이 신뢰도 이상 연락처를 찾으면 남은 페이지 요청 생략
+# 기업 웹사이트 응답 제한 (HTML이 아닌 응답은 본문을 받지 않음)
+WEBSITE_CONNECT_TIMEOUT = 5  # 연결 제한 시간 (초)
+WEBSITE_READ_TIMEOUT = 10  # 읽기 제한 시간 (초, 이 시간 동안 데이터가 오지 않으면 중단)
+WEBSITE_TOTAL_TIMEOUT = 15  # 본문을 받는 최대 시간 (초, 넘으면 받은 데까지 사용)
+WEBSITE_HEAD_BYTES = 512 * 1024  # 보관할 앞부분
+WEBSITE_TAIL_BYTES = 128 * 1024  # 보관할 마지막 부분 (푸터), 그 사이는 연락처만 추출하고 버림
+WEBSITE_MAX_BYTES = 4 * 1024 * 1024  # 페이지당 최대 다운로드 (넘으면 중단)
+WEBSITE_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')  # 본문을 받을 Content-Type
+
+# HTTP 연결 풀 (keep-alive 재사용) / 재시도
+HTTP_POOL_SIZE = 10  # 기본 풀 크기
+SUPABASE_POOL_SIZE = 4
+GEMINI_POOL_SIZE = 4
+HTTP_RETRIES = 3  # 429/5xx/연결 오류 재시도 횟수 (Supabase, Gemini)
+HTTP_BACKOFF = 0.5  # 재시도 간격 (0.5, 1, 2초...)
+
+# 파이프라인 단계별 워커 수 / 단계 사이 큐 크기
+PIPELINE_WORKERS = {
+    'detail': 2,
+    'website': 8,
+    'extract': 2,
+    'ai': 2,
+    'store': 1,
+}
+PIPELINE_QUEUE_SIZE = 20
+
+# 소스 동시 수집 (--limit은 전체 목표 = 이메일이 있어 저장된 기업 수)
+SCHEDULER_MAX_IN_FLIGHT = 40  # 모든 소스에서 동시에 처리 중인 기업 수 상한
+SCHEDULER_MIN_IN_FLIGHT = 2  # 소스별 최소 몫 (수확량이 낮아도 계속 측정)
+SCHEDULER_PRIOR_SECONDS = 30  # 수확량 사전값 (저장 1건 / 30초, 초반에 몇 건으로 몫이 쏠리지 않도록)
+SCHEDULER_DISCOVERY_FACTOR = 5  # 소스별 목록 수집 상한 = 목표 x 5 (중복/이메일 없는 기업 감안)
+
+# DB 일괄 저장 (개수 또는 시간 기준으로 모아서 저장)
+STORAGE_BULK_SIZE = 50
+STORAGE_FLUSH_INTERVAL = 10  # 초
+
 # 수집 소스
 SOURCES = {
     'saramin': {
@@ -49,3 +141,41 @@ USER_AGENTS = [
 # 로그 설정
 LOG_DIR = os.path.join(os.path.dirname(__file__), 'logs')
 os.makedirs(LOG_DIR, exist_ok=True)
+
+# 캐시 설정
+CACHE_DIR = os.path.join(os.path.dirname(__file__), 'cache')
+os.makedirs(CACHE_DIR, exist_ok=True)
+
+AI_CACHE_ENABLED = True
+AI_CACHE_PATH = os.path.join(CACHE_DIR, 'ai_results.sqlite3')
+AI_CACHE_TTL_DAYS = 30  # 캐시 유효 기간
+AI_CACHE_MAX_ENTRIES = 50000  # 최대 저장 개수 (넘으면 LRU 삭제)
+
+# HTTP 조건부 요청 캐시 (ETag/Last-Modified, 본문 압축 저장)
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_PATH = os.path.join(CACHE_DIR, 'http.sqlite3')
+HTTP_CACHE_MAX_MB = 200  # 넘으면 오래 안 쓴 응답부터 삭제
+
+# 호스트별로 조정된 딜레이, robots.txt 확인 결과
+POLITENESS_DB_PATH = os.path.join(CACHE_DIR, 'politeness.sqlite3')
+
+# 중복 확인 인덱스 (소스별 ID 기록 + 큰 테이블은 블룸 필터)
+DEDUP_DB_PATH = os.path.join(CACHE_DIR, 'dedup.sqlite3')
+DEDUP_BLOOM_THRESHOLD = 500000  # 이 행 수를 넘으면 집합 대신 블룸 필터
+DEDUP_BLOOM_ERROR_RATE = 0.001
+
+# 수집 진행 상태 (카테고리별 목록 위치 + 기업별 처리 상태, 중단 후 이어서 수집)
+FRONTIER_DB_PATH = os.path.join(CACHE_DIR, 'frontier.sqlite3')
+FRONTIER_MAX_ATTEMPTS = 3  # 오류난 기업을 다음 실행에서 다시 시도하는 최대 횟수
+FRONTIER_MIRROR_SETTINGS = True  # 진행 상태를 settings 테이블에도 저장
+
+# 실행 지표 (HTTP 대상/파이프라인 단계별 시간, 스킵/재시도/캐시 카운터)
+METRICS_REPORT_DIR = LOG_DIR  # 실행마다 run_YYYYMMDD_HHMMSS.json 저장
+METRICS_PORT = int(os.getenv('CRAWLER_METRICS_PORT', '0'))  # 0이 아니면 127.0.0.1:포트/metrics (Prometheus)
+# 호스트 → 지표의 HTTP 대상 이름 (서브도메인 포함, 없으면 website)
+METRICS_TARGETS = {
+    'saramin.co.kr': 'saramin',
+    'wanted.co.kr': 'wanted',
+    'generativelanguage.googleapis.com': 'gemini',
+    'supabase.co': 'supabase',
+}
@@ -2,16 +2,39 @@
 """
 ColdMail 크롤러 메인 실행 파일
 사용법: python main.py [--source saramin|rocketpunch|wanted|all] [--limit 100]
+      python main.py --record fixtures.sqlite3  (모든 HTTP 응답을 아카이브에 기록)
+      python main.py --replay fixtures.sqlite3  (기록한 응답으로 오프라인 실행)
 """
+import os
 import argparse
+import asyncio
 import logging
+from contextlib import aclosing
 from datetime import datetime
 
-from config import LOG_DIR, DAILY_LIMIT
+from config import (
+    LOG_DIR, DAILY_LIMIT, PIPELINE_WORKERS, PIPELINE_QUEUE_SIZE, AI_BATCH_MAX_ITEMS, AI_BATCH_WAIT,
+    AI_GATE_THRESHOLD, STORAGE_BULK_SIZE, STORAGE_FLUSH_INTERVAL, FRONTIER_MIRROR_SETTINGS,
+    HTTP_CACHE_ENABLED, PARSE_WORKERS, METRICS_REPORT_DIR, METRICS_PORT, HOST_DELAYS, SCHEDULER_DISCOVERY_FACTOR,
+)
 from sources.saramin import SaraminCrawler
 from sources.wanted import WantedCrawler
+from sources.stream import release_texts
 from parser.ai_parser import AIParser
+from parser.condense import condense
+from parser.contact_rank import rank_emails, best_contact
+from parser.parse_pool import ParsePool
 from storage.supabase_client import SupabaseStorage
+from storage.dedup_index import DedupIndex
+from storage.frontier import Frontier, DONE, SKIPPED, FAILED
+from net.rate_limit import HostRateLimiter
+from net.politeness import PolitenessStore
+from net.http_cache import HTTPCache
+from net import replay
+from net.replay import FixtureArchive, ReplayServer
+from scheduler import SourceScheduler
+from pipeline import Pipeline, Stage, BatchStage
+from metrics import registry
 
 # 로깅 설정
 logging.basicConfig(
@@ -25,148 +48,411 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def run_crawler(source='all', limit=DAILY_LIMIT, keywords=None):
+def build_company_data(company, source_name):
+    """
+    수집 결과에서 연락처를 결정하고 DB 저장 데이터 구성
+    이메일이 없으면 None
+    """
+    # 연락처 결정 (우선순위: AI 추출 > 정규식 추출)
+    contact_email = None
+    contact_name = None
+    contact_title = None
+
+    # AI 추출 연락처 우선
+    if company.get('ai_contacts'):
+        for contact in company['ai_contacts']:
+            if contact.get('email'):
+                contact_email = contact['email']
+                contact_name = contact.get('name')
+                contact_title = contact.get('title')
+                break
+
+    # AI 실패 시 정규식 결과 사용
+    if not contact_email and company.get('emails'):
+        contact_email = company['emails'][0]
+
+    if not contact_email:
+        contact_email = company.get('company_email')
+
+    # 전화번호 결정
+    contact_phone = None
+    if company.get('phones'):
+        contact_phone = company['phones'][0]
+    elif company.get('company_phone'):
+        contact_phone = company['company_phone']
+
+    # 이메일 없으면 스킵 (DB에 not-null 제약조건)
+    if not contact_email:
+        return None
+
+    return {
+        'name': company['name'],
+        'website': company.get('website'),
+        'contact_email': contact_email,
+        'contact_name': contact_name or '담당자',
+        'contact_title': contact_title,
+        'contact_phone': contact_phone,
+        'source': source_name,
+        'priority': 'medium',
+        'send_status': '미발송',
+        'collected_at': datetime.now().isoformat(),
+    }
+
+
+def build_pipeline(source_name, crawler, storage, ai_parser, dedup, results, limit, frontier=None, scheduler=None):
+    """
+    소스 하나에 대한 수집 파이프라인 구성
+    목록 → 상세 → 웹사이트 → 추출(중복 체크) → AI 파싱 → 저장
+    frontier가 있으면 기업별 처리 결과(done/skipped/failed)를 기록
+    scheduler(SourceScheduler)가 있으면 목록 단계에서 몫을 받아 진행하고 전체 목표를 채우면 멈춤
+    results의 total/success/fail은 전체 합계, results['sources'][소스]는 소스별 집계
+    """
+    tally = results.setdefault('sources', {}).setdefault(source_name, {'total': 0, 'success': 0, 'fail': 0})
+
+    def count(key):
+        results[key] += 1
+        tally[key] += 1
+
+    def mark(company, status):
+        if frontier:
+            frontier.mark(source_name, company.get('source_id'), status)
+        if scheduler:
+            scheduler.finish(company, saved=status == DONE)
+
+    def skip(company, reason):
+        registry.inc('skips_total', source=source_name, reason=reason)
+        mark(company, SKIPPED)
+
+    async def discover(emit):
+        try:
+            async with aclosing(crawler.iter_companies(limit=limit)) as companies:
+                async for company in companies:
+                    if scheduler and not await scheduler.admit(source_name, company):
+                        logger.info(f"[{source_name}] 전체 목표 달성, 목록 수집 종료")
+                        break
+                    await emit(company)
+        finally:
+            if scheduler:
+                scheduler.close(source_name)
+
+    async def detail(company):
+        company = await crawler.get_company_detail_async(company)
+        if not company.get('name'):
+            logger.info("  이름 없음, 스킵")
+            skip(company, 'no_name')
+            return None
+        return company
+
+    async def website(company):
+        return await crawler.enrich_website_async(company)
+
+    async def extract(company):
+        count('total')
+        if scheduler:
+            scheduler.release(company)
+
+        # 중복 체크 (실행 시작 시 적재한 인덱스, 다음 실행부터는 목록 단계에서 제외되도록 ID 기록)
+        if dedup.contains(company['name'], company.get('website')):
+            logger.info(f"  중복 스킵: {company['name']}")
+            dedup.add(company['name'], company.get('website'), source_name, company.get('source_id'))
+            skip(company, 'duplicate')
+            return None
+
+        # AI 파싱 대상 텍스트 (문의/회사소개 페이지 > 홈페이지 > 상세 본문 순, 푸터는 통째로)
+        ai_sections = [company.get('contact_page_text', ''), company.get('website_text', ''),
+                       company.get('raw_text', '')]
+        has_text = any(text.strip() for text in ai_sections + [company.get('footer_text', '')])
+
+        # 정규식 우선: 상세/웹사이트에서 찾은 이메일 + 웹사이트 텍스트 재검사 후 순위 매김
+        website_text = ' '.join([company.get('website_text', ''), company.get('footer_text', '')])
+        regex_emails = ai_parser.extract_with_regex(website_text)['emails'] if website_text.strip() else []
+        company['emails'] = rank_emails(
+            company.get('emails', []) + company.get('website_emails', []) + regex_emails,
+            company.get('website'),
+        )
+
+        # 신뢰도가 충분하면 AI 호출 생략
+        _, confidence = best_contact(company['emails'], company.get('website'))
+        company['regex_confidence'] = confidence
+        company['needs_ai'] = has_text and confidence < AI_GATE_THRESHOLD
+        if company['needs_ai']:
+            # 연락처 단서 주변과 푸터만 토큰 예산 안에서 (페이지마다 반복되는 메뉴/푸터는 한 번만)
+            company['ai_text'], tokens = condense(ai_sections, footer=company.get('footer_text'))
+            company['ai_tokens_saved'] = tokens['tokens_in'] - tokens['tokens_out']
+            results['ai_tokens_in'] += tokens['tokens_in']
+            results['ai_tokens_sent'] += tokens['tokens_out']
+            logger.info(f"  AI 입력 축약: {company['name']} {tokens['tokens_in']} → {tokens['tokens_out']}토큰"
+                        f" ({company['ai_tokens_saved']}토큰 절약)")
+        elif has_text:
+            results['ai_calls_avoided'] += 1
+            logger.info(f"  정규식 결과 사용 (신뢰도 {confidence}): {company['name']}")
+
+        # 추출이 끝난 텍스트는 비움 (AI 파싱 대상만 ai_text 유지)
+        return release_texts(company, keep=('ai_text',) if company['needs_ai'] else ())
+
+    async def ai_parse(companies):
+        # AI 파싱으로 연락처 추출 (여러 기업을 한 번에 요청)
+        targets = {i: c for i, c in enumerate(companies) if c['needs_ai']}
+        if targets:
+            logger.info(f"  AI 파싱 ({len(targets)}건): {', '.join(c['name'] for c in targets.values())}")
+            ai_results = await asyncio.to_thread(ai_parser.extract_contacts_batch, [
+                {'key': i, 'text': c['ai_text'], 'company_name': c['name']}
+                for i, c in targets.items()
+            ])
+            for i, company in targets.items():
+                ai_result = ai_results.get(i, {})
+                company['ai_contacts'] = ai_result.get('contacts', [])
+                company['company_email'] = ai_result.get('company_email')
+                company['company_phone'] = ai_result.get('company_phone')
+        # 이메일 없는 기업은 여기서 스킵, 나머지는 저장 데이터를 만들어 저장 단계로
+        # (저장 단계가 배치를 모으는 동안에도 스케줄러가 결과를 알고 목표 근처에서 멈추도록)
+        kept = []
+        for company in companies:
+            company.pop('ai_text', None)
+            company['company_data'] = build_company_data(company, source_name)
+            if not company['company_data']:
+                logger.info(f"  이메일 없음, 스킵: {company['name']}")
+                skip(company, 'no_email')
+                continue
+            if scheduler:
+                scheduler.queue(company)
+            kept.append(company)
+        return kept
+
+    async def store(companies):
+        # 일괄 저장 (크기/시간 기준으로 모아서 한 번에, 결과는 입력 순서대로 돌아옴)
+        rows = [company.pop('company_data') for company in companies]
+        outcomes = await asyncio.to_thread(storage.save_companies_bulk, rows)
+        saved = []
+        for company, outcome in zip(companies, outcomes):
+            if outcome['action'] == 'failed':
+                logger.error(f"  저장 실패: {outcome['name']}")
+                count('fail')
+                mark(company, FAILED)
+                continue
+            dedup.add(outcome['name'], company.get('website'), source_name, company.get('source_id'))
+            if outcome['action'] == 'merged':
+                # 같은 배치의 뒤쪽 같은 이름 기업으로 저장됨 (저장 수에 두 번 넣지 않음)
+                logger.info(f"  중복 스킵 (같은 배치): {outcome['name']}")
+                skip(company, 'duplicate')
+                continue
+            mark(company, DONE)
+            logger.info(f"  저장 완료: {outcome['name']} ({outcome['action']})")
+            count('success')
+            saved.append(outcome)
+        return saved
+
+    def on_error(stage, company, e):
+        name = (company or {}).get('name') or 'unknown'
+        logger.error(f"  처리 오류 [{stage}] ({name}): {e}")
+        count('fail')
+        if company:
+            mark(company, FAILED)
+
+    def stage(name, handler):
+        return Stage(name, handler, workers=PIPELINE_WORKERS[name], queue_size=PIPELINE_QUEUE_SIZE)
+
+    def near_target(batch_size):
+        # 목표까지 배치 하나가 안 남았으면 AI 배치가 차기를 기다리지 않음 (스케줄러가 결과를 기다리며 멈추지 않도록)
+        # 저장 단계는 그대로 (저장 대기는 이미 저장된 것으로 세고, 목표를 채우면 목록이 끝나 바로 저장됨)
+        return (lambda: scheduler.near_target(batch_size)) if scheduler else None
+
+    stages = [
+        stage('detail', detail),
+        stage('website', website),
+        stage('extract', extract),
+        BatchStage('ai', ai_parse, workers=PIPELINE_WORKERS['ai'], queue_size=PIPELINE_QUEUE_SIZE,
+                   batch_size=AI_BATCH_MAX_ITEMS, batch_wait=AI_BATCH_WAIT,
+                   flush_now=near_target(AI_BATCH_MAX_ITEMS)),
+        BatchStage('store', store, workers=PIPELINE_WORKERS['store'], queue_size=PIPELINE_QUEUE_SIZE,
+                   batch_size=STORAGE_BULK_SIZE, batch_wait=STORAGE_FLUSH_INTERVAL),
+    ]
+    return Pipeline(source_name, discover, stages, on_error=on_error)
+
+
+def log_time_breakdown(metrics):
+    """HTTP 대상별 요청 시간과 대기 시간 요약 (느린 실행이 어디에 시간을 썼는지)"""
+    sleeps = {}
+    for row in metrics['counters'].get('sleep_seconds_total', []):
+        key = (row['labels']['target'], row['labels']['reason'])
+        sleeps[key] = sleeps.get(key, 0) + row['value']
+    for row in metrics['histograms'].get('http_request_seconds', []):
+        target = row['labels']['target']
+        logger.info(f"  [HTTP {target}] 요청 {row['count']}회, 합계 {row['sum']:.1f}초"
+                    f" (p50 {row['p50'] * 1000:.0f}ms, p95 {row['p95'] * 1000:.0f}ms)"
+                    f" | 호스트 딜레이 대기 {sleeps.get((target, 'politeness'), 0):.1f}초"
+                    f", 재시도 대기 {sleeps.get((target, 'retry'), 0):.1f}초")
+    skips = ', '.join(f"{row['labels']['source']}/{row['labels']['reason']} {row['value']}"
+                      for row in metrics['counters'].get('skips_total', []))
+    if skips:
+        logger.info(f"  스킵: {skips}")
+
+
+def run_crawler(source='all', limit=DAILY_LIMIT, keywords=None, metrics_port=METRICS_PORT):
     """
     크롤러 실행
+    metrics_port: 0이 아니면 실행 중 127.0.0.1:포트/metrics로 지표 노출 (Prometheus)
     """
     logger.info(f"=== 크롤링 시작 (소스: {source}, 한도: {limit}) ===")
+    registry.reset()
+    if metrics_port:
+        logger.info(f"지표 엔드포인트: {registry.serve(metrics_port)}")
 
     storage = SupabaseStorage()
     ai_parser = AIParser()
 
+    # 중복 확인 인덱스 (기존 기업 한 번에 적재)
+    dedup = DedupIndex()
+    loaded = dedup.load(storage)
+    logger.info(f"중복 확인 인덱스 적재: {loaded}개 기업")
+
+    # 수집 진행 상태 (카테고리별 목록 위치, 기업별 처리 상태)
+    frontier = Frontier()
+
     results = {
         'total': 0,
         'success': 0,
         'fail': 0,
-        'companies': [],
+        'stages': {},
+        'ai_calls_avoided': 0,
+        'ai_tokens_in': 0,  # AI 파싱 대상 기업의 축약 전 텍스트 토큰 (푸터 포함, 추정)
+        'ai_tokens_sent': 0,  # 축약 후 보낸 토큰 (추정)
     }
 
-    # 수집 소스별 실행
+    # 수집 소스별 실행 (호스트별 속도 제한, HTTP 캐시는 모든 소스가 공유)
+    # 호스트별 간격은 이전 실행에서 조정된 값에서 시작
+    politeness = PolitenessStore()
+    limiter = HostRateLimiter(store=politeness)
+    http_cache = HTTPCache() if HTTP_CACHE_ENABLED else None
+    parse_pool = ParsePool(PARSE_WORKERS)  # 0이면 수집 루프에서 바로 파싱
+    if PARSE_WORKERS:
+        logger.info(f"HTML 파싱 프로세스: {PARSE_WORKERS}개")
     crawlers = []
     if source in ['saramin', 'all']:
-        # 저장된 페이지 상태 로드
+        # 로컬 진행 상태가 없으면 settings의 이전 last_page 다음부터
         state = storage.get_crawler_state('saramin')
-        start_page = state.get('last_page', 0) + 1  # 마지막 페이지 다음부터
-        if start_page > 100:  # 100페이지 넘으면 처음부터
-            start_page = 1
-        crawlers.append(('saramin', SaraminCrawler(start_page=start_page)))
+        if 'last_page' in state:
+            frontier.seed('saramin', 'review', state['last_page'] + 1)
+        crawlers.append(('saramin', SaraminCrawler(limiter=limiter, dedup=dedup, frontier=frontier,
+                                                   http_cache=http_cache, parse_pool=parse_pool)))
 
     if source in ['wanted', 'all']:
-        # 저장된 페이지 상태 로드
-        state = storage.get_crawler_state('wanted')
-        start_page = state.get('last_page', 0) + 1
-        if start_page > 50:  # 50페이지 넘으면 처음부터
-            start_page = 0
-        crawlers.append(('wanted', WantedCrawler(start_page=start_page)))
+        # 카테고리별 offset은 로컬 진행 상태에서 (이전 last_page는 카테고리 구분이 없어 사용하지 않음)
+        crawlers.append(('wanted', WantedCrawler(limiter=limiter, dedup=dedup, frontier=frontier,
+                                                 http_cache=http_cache, parse_pool=parse_pool)))
 
     # if source in ['rocketpunch', 'all']:
     #     crawlers.append(('rocketpunch', RocketpunchCrawler()))
 
-    for source_name, crawler in crawlers:
-        logger.info(f"[{source_name}] 수집 시작...")
+    # 모든 소스를 한 이벤트 루프에서 동시에 실행
+    # limit은 소스별로 나누지 않고 전체 목표(저장된 기업 수)로 두고, 스케줄러가 수확량이 좋은 소스에 몫을 더 줌
+    scheduler = SourceScheduler(limit, [source_name for source_name, _ in crawlers])
+    pipelines = [
+        (source_name, crawler, build_pipeline(source_name, crawler, storage, ai_parser, dedup, results,
+                                              limit=limit * SCHEDULER_DISCOVERY_FACTOR, frontier=frontier,
+                                              scheduler=scheduler))
+        for source_name, crawler in crawlers
+    ]
 
+    async def run_source(source_name, pipeline):
+        logger.info(f"[{source_name}] 수집 시작...")
         try:
-            companies = crawler.collect(keywords=keywords, limit=limit // len(crawlers))
-
-            for company in companies:
-                try:
-                    results['total'] += 1
-
-                    # 중복 체크
-                    if storage.check_duplicate(company['name'], company.get('website')):
-                        logger.info(f"  중복 스킵: {company['name']}")
-                        continue
-
-                    # AI 파싱으로 연락처 추출
-                    all_text = ' '.join([
-                        company.get('raw_text', ''),
-                        company.get('website_raw_text', ''),
-                        company.get('contact_page_text', ''),
-                    ])
-
-                    if all_text.strip():
-                        logger.info(f"  AI 파싱: {company['name']}")
-                        ai_result = ai_parser.extract_contacts(all_text, company['name'])
-                        company['ai_contacts'] = ai_result.get('contacts', [])
-                        company['company_email'] = ai_result.get('company_email')
-                        company['company_phone'] = ai_result.get('company_phone')
-
-                    # 연락처 결정 (우선순위: AI 추출 > 정규식 추출)
-                    contact_email = None
-                    contact_name = None
-                    contact_title = None
-
-                    # AI 추출 연락처 우선
-                    if company.get('ai_contacts'):
-                        for contact in company['ai_contacts']:
-                            if contact.get('email'):
-                                contact_email = contact['email']
-                                contact_name = contact.get('name')
-                                contact_title = contact.get('title')
-                                break
-
-                    # AI 실패 시 정규식 결과 사용
-                    if not contact_email and company.get('emails'):
-                        contact_email = company['emails'][0]
-
-                    if not contact_email:
-                        contact_email = company.get('company_email')
-
-                    # 전화번호 결정
-                    contact_phone = None
-                    if company.get('phones'):
-                        contact_phone = company['phones'][0]
-                    elif company.get('company_phone'):
-                        contact_phone = company['company_phone']
-
-                    # 이메일 없으면 스킵 (DB에 not-null 제약조건)
-                    if not contact_email:
-                        logger.info(f"  이메일 없음, 스킵: {company['name']}")
-                        continue
-
-                    # DB 저장 데이터 구성
-                    company_data = {
-                        'name': company['name'],
-                        'website': company.get('website'),
-                        'contact_email': contact_email,
-                        'contact_name': contact_name or '담당자',
-                        'contact_title': contact_title,
-                        'contact_phone': contact_phone,
-                        'source': source_name,
-                        'priority': 'medium',
-                        'send_status': '미발송',
-                        'collected_at': datetime.now().isoformat(),
-                    }
-
-                    # 저장
-                    save_result = storage.save_company(company_data)
-                    logger.info(f"  저장 완료: {company['name']} ({save_result['action']})")
-
-                    results['success'] += 1
-                    results['companies'].append(company['name'])
-
-                except Exception as e:
-                    logger.error(f"  처리 오류 ({company.get('name', 'unknown')}): {e}")
-                    results['fail'] += 1
-
-            # 수집 로그 저장
-            storage.log_collection(
-                source=source_name,
-                total=results['total'],
-                success=results['success'],
-                fail=results['fail']
-            )
-
-            # 크롤러 상태 저장 (마지막 페이지)
-            if hasattr(crawler, 'last_page'):
-                storage.save_crawler_state(source_name, {
-                    'last_page': crawler.last_page,
-                    'last_run': datetime.now().isoformat()
-                })
-                logger.info(f"[{source_name}] 페이지 상태 저장: {crawler.last_page}")
-
+            await pipeline.run()
+            return True
         except Exception as e:
             logger.error(f"[{source_name}] 크롤러 오류: {e}")
+            return False
+
+    async def run_all():
+        return await asyncio.gather(*(run_source(source_name, pipeline) for source_name, _, pipeline in pipelines))
+
+    # 중단되거나 오류가 나도 SQLite(진행 상태, 중복 확인 ID)를 닫아 WAL을 정리하고 잠금을 남기지 않음
+    try:
+        completed = asyncio.run(run_all())
+
+        # 소스별 결과/진행 상태는 각각 저장
+        for (source_name, crawler, pipeline), ok in zip(pipelines, completed):
+            tally = results['sources'][source_name]
+            if ok:
+                logger.info(f"[{source_name}] 단계별 처리 현황")
+                pipeline.log_stats()
+                results['stages'][source_name] = pipeline.stats()
+
+                website_stats = crawler.website_crawler.stats
+                logger.info(f"[{source_name}] 웹사이트 {website_stats['sites']}곳, 페이지 {website_stats['pages']}개"
+                            f" (연락처를 찾아 조기 종료 {website_stats['early_stops']}곳,"
+                            f" 구조화 데이터에서 연락처 찾음 {website_stats['structured']}개,"
+                            f" 크기/시간 제한으로 일부만 받음 {website_stats['truncated']}개,"
+                            f" HTML이 아니라 건너뜀 {crawler.fetcher.stats['skipped']}개)")
+
+                # 수집 로그 저장
+                storage.log_collection(
+                    source=source_name,
+                    total=tally['total'],
+                    success=tally['success'],
+                    fail=tally['fail']
+                )
+
+            # 진행 상태는 건마다 로컬에 기록되므로 여기서는 settings에 사본만 저장
+            snapshot = frontier.snapshot(source_name)
+            logger.info(f"[{source_name}] 진행 상태: 목록 위치 {snapshot['cursors']}, 기업 {snapshot['items']}")
+            if FRONTIER_MIRROR_SETTINGS:
+                storage.save_crawler_state(source_name, snapshot)
+    finally:
+        frontier.close()
+        dedup.close()
+
+    results['scheduler'] = scheduler.stats()
+    for source_name, stats in results['scheduler'].items():
+        logger.info(f"[{source_name}] 스케줄러: 투입 {stats['admitted']} / 완료 {stats['finished']}"
+                    f" / 저장 {stats['saved']} (처리 1초당 {stats['yield_per_sec']}건)")
+
+    parse_pool.close()
+
+    # 조정된 호스트 간격 저장 (다음 실행은 이 값에서 시작)
+    limiter.save()
+    results['politeness'] = limiter.intervals()
+    politeness.close()
+    for host in HOST_DELAYS:
+        if host in results['politeness']:
+            logger.info(f"요청 간격 [{host}]: {results['politeness'][host]}초 (다음 실행에 사용)")
+
+    logger.info(f"목록 단계 중복 제외: {dedup.skipped}건")
+    logger.info(f"AI 호출 생략: {results['ai_calls_avoided']}건 (정규식 신뢰도 {AI_GATE_THRESHOLD} 이상)")
+    logger.info(f"AI 입력 토큰: 축약 전 {results['ai_tokens_in']} → 전송 {results['ai_tokens_sent']}"
+                f" ({results['ai_tokens_in'] - results['ai_tokens_sent']}토큰 절약)")
+    if ai_parser.cache:
+        cache_stats = ai_parser.cache.stats()
+        results['ai_cache'] = cache_stats
+        logger.info(f"AI 캐시: 적중 {cache_stats['hits']} / 미적중 {cache_stats['misses']}"
+                    f" (적중률 {cache_stats['hit_ratio']:.0%}, 삭제 {cache_stats['evictions']})")
+
+    if http_cache:
+        http_stats = http_cache.stats()
+        results['http_cache'] = http_stats
+        logger.info(f"HTTP 캐시: 304 {http_stats['hits']} / 새로 받음 {http_stats['misses']}"
+                    f" (적중률 {http_stats['hit_ratio']:.0%}), 다운로드 {http_stats['bytes_downloaded'] / 1024:.0f}KB,"
+                    f" 절약 {http_stats['bytes_saved'] / 1024:.0f}KB, 저장 {http_stats['stored_bytes'] / 1024:.0f}KB")
+
+    # 연결 재사용 통계
+    results['connections'] = {
+        'supabase': storage.session.connection_stats.to_dict(),
+        'gemini': ai_parser.session.connection_stats.to_dict(),
+    }
+    for name, stats in results['connections'].items():
+        per_row = stats['saved_seconds'] / results['success'] * 1000 if results['success'] else 0
+        logger.info(f"연결 [{name}] 요청 {stats['requests']} / 핸드셰이크 {stats['handshakes']}"
+                    f" / 재사용 {stats['reused']} (연결당 {stats['avg_connect_ms']}ms,"
+                    f" 절약 추정 {stats['saved_seconds']}초, 저장 1건당 {per_row:.0f}ms)")
+
+    # 실행 지표 (HTTP 대상/단계별 시간, 스킵/재시도/캐시 카운터)를 JSON 보고서로 저장
+    metrics = registry.to_dict()
+    logger.info("시간 사용 내역")
+    log_time_breakdown(metrics)
+    report_path = os.path.join(METRICS_REPORT_DIR, f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    registry.write_report(report_path, source=source, limit=limit, results=results)
+    logger.info(f"실행 보고서: {report_path}")
+    registry.stop()
 
     logger.info(f"=== 크롤링 완료 (성공: {results['success']}, 실패: {results['fail']}) ===")
     return results
@@ -178,17 +464,44 @@ def main():
                         choices=['saramin', 'rocketpunch', 'wanted', 'all'],
                         help='수집 소스 (기본: all)')
     parser.add_argument('--limit', type=int, default=DAILY_LIMIT,
-                        help=f'수집 한도 (기본: {DAILY_LIMIT})')
+                        help=f'수집 목표 (이메일이 있어 저장된 기업 수, 모든 소스 합계, 기본: {DAILY_LIMIT})')
     parser.add_argument('--keywords', type=str, nargs='+',
                         help='검색 키워드 (예: AI 스타트업 마케팅)')
 
+    parser.add_argument('--record', type=str, metavar='ARCHIVE',
+                        help='사람인/원티드/웹사이트/Gemini/Supabase 응답을 픽스처 아카이브에 기록')
+    parser.add_argument('--replay', type=str, metavar='ARCHIVE',
+                        help='기록한 아카이브를 로컬 재생 서버로 돌려 오프라인 실행')
+    parser.add_argument('--metrics-port', type=int, default=METRICS_PORT,
+                        help='실행 중 지표를 노출할 로컬 포트 (Prometheus, 기본: 0 = 사용 안 함)')
+    parser.add_argument('--replay-latency', type=float, default=0.0,
+                        help='재생 서버 응답 지연 (초, 기본: 0)')
+
     args = parser.parse_args()
 
-    results = run_crawler(
-        source=args.source,
-        limit=args.limit,
-        keywords=args.keywords
-    )
+    archive = FixtureArchive(args.record or args.replay) if (args.record or args.replay) else None
+    server = None
+    if args.record:
+        replay.start_recording(archive)
+    elif args.replay:
+        server = ReplayServer(archive, latency=args.replay_latency).start()
+        replay.start_replay(server.url)
+
+    try:
+        results = run_crawler(
+            source=args.source,
+            limit=args.limit,
+            keywords=args.keywords,
+            metrics_port=args.metrics_port,
+        )
+    finally:
+        replay.stop()
+        if server:
+            server.stop()
+            logger.info(f"재생: 응답 {server.served}개 (기록 없음 {server.missing}개)")
+        if archive:
+            logger.info(f"픽스처 아카이브: {archive.path} (응답 {archive.count()}개)")
+            archive.close()
 
     print(f"\n수집 결과:")
     print(f"  - 총 시도: {results['total']}")
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+실행 지표
+- 히스토그램: HTTP 대상별 요청 시간(saramin/wanted/website/gemini/supabase), 파이프라인 단계별 처리 시간
+- 카운터: 스킵 사유(중복/이메일 없음/이름 없음/목록 단계 제외), 재시도, 캐시 적중/미적중, 대기 시간(호스트 딜레이/재시도)
+- 실행이 끝나면 JSON 보고서로 저장하고, 포트를 지정하면 로컬 Prometheus 엔드포인트(/metrics)로 노출
+- 모든 모듈이 같은 registry에 기록 (스레드에서 호출해도 안전)
+"""
+import json
+import time
+import bisect
+import threading
+from urllib.parse import urlparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import METRICS_TARGETS
+
+PREFIX = 'coldmail_'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def target_of(url):
+    """URL → HTTP 대상 이름 (METRICS_TARGETS에 없으면 website)"""
+    host = (urlparse(url).hostname or '').lower()
+    for domain, target in METRICS_TARGETS.items():
+        if host == domain or host.endswith('.' + domain):
+            return target
+    return 'website'
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """버킷 안에서 선형 보간한 분위수 추정 (Prometheus histogram_quantile과 같은 방식)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, count in enumerate(self.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else self.max
+            if count and seen + count >= rank:
+                return min(self.max, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+            lower = upper
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 3),
+            'avg': round(self.sum / self.count, 4) if self.count else 0.0,
+            'p50': round(self.quantile(0.5), 4),
+            'p95': round(self.quantile(0.95), 4),
+            'p99': round(self.quantile(0.99), 4),
+            'max': round(self.max, 4),
+        }
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_text(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+
+class Metrics:
+    def __init__(self):
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self.started_at = time.time()
+
+    def observe(self, name, seconds, **labels):
+        """히스토그램에 시간(초) 기록"""
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name, value=1, **labels):
+        """카운터 증가 (대기 시간처럼 초 단위 합계도 카운터로)"""
+        if not value:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.started_at = time.time()
+
+    def to_dict(self):
+        """{'histograms': {이름: [{labels, count, p50...}]}, 'counters': {이름: [{labels, value}]}}"""
+        with self._lock:
+            histograms = {}
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                histograms.setdefault(name, []).append({'labels': dict(labels), **histogram.to_dict()})
+            counters = {}
+            for (name, labels), value in sorted(self._counters.items()):
+                counters.setdefault(name, []).append({'labels': dict(labels), 'value': round(value, 3)})
+        return {'histograms': histograms, 'counters': counters}
+
+    def prometheus(self):
+        """Prometheus 텍스트 형식"""
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                metric = PREFIX + name
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f'# TYPE {metric} histogram')
+                cumulative = 0
+                for i, count in enumerate(histogram.counts):
+                    cumulative += count
+                    le = str(histogram.buckets[i]) if i < len(histogram.buckets) else '+Inf'
+                    lines.append(f'{metric}_bucket{_label_text(labels + (("le", le),))} {cumulative}')
+                lines.append(f'{metric}_sum{_label_text(labels)} {histogram.sum}')
+                lines.append(f'{metric}_count{_label_text(labels)} {histogram.count}')
+            for (name, labels), value in sorted(self._counters.items()):
+                metric = PREFIX + name
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f'# TYPE {metric} counter')
+                lines.append(f'{metric}{_label_text(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write_report(self, path, **extra):
+        """JSON 실행 보고서 저장 (extra: 실행 결과 등 함께 저장할 값)"""
+        report = {
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at)),
+            'elapsed': round(time.time() - self.started_at, 2),
+            **extra,
+            'metrics': self.to_dict(),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+        return path
+
+    def serve(self, port, host='127.0.0.1'):
+        """로컬 Prometheus 엔드포인트 시작 (/metrics)"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                body = registry.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://{host}:{self._server.server_port}/metrics"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+# 프로세스 공용 지표
+registry = Metrics()
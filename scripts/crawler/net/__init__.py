@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+from .rate_limit import TokenBucket, HostRateLimiter
+from .fetcher import Fetcher
+
+__all__ = ['TokenBucket', 'HostRateLimiter', 'Fetcher']
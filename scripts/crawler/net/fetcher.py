@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+비동기 수집 엔진
+- requests 세션을 스레드풀에서 실행하고 asyncio로 동시 요청 관리
+- 호스트별 속도 제한(HostRateLimiter)을 적용하므로
+  전체 소요 시간은 총 요청 수가 아니라 호스트 수에 비례
+- Python 3.14 호환을 위해 aiohttp 대신 requests 사용
+- cache(HTTPCache)를 주면 조건부 요청을 보내고, 304면 저장된 본문을 반환하며 딜레이 예산을 돌려받음
+- 응답 결과를 limiter에 알려 호스트별 간격을 조정 (429/503/타임아웃은 백오프 후 재시도, Retry-After 준수)
+- 호스트에 처음 요청할 때 robots.txt의 Crawl-delay 확인
+- page(PageLimits)를 주면 본문을 스트리밍으로 받아 크기/시간을 제한하고, HTML이 아닌 응답은 받지 않고 None
+"""
+import time
+import asyncio
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import requests
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import MAX_RETRIES, FETCH_CONCURRENCY
+from net.rate_limit import HostRateLimiter
+from net.session import create_session
+from net.page_body import SkippedBody
+from net.politeness import parse_retry_after, robots_delay
+from metrics import registry, target_of
+
+# 서버가 부담을 알리는 응답 (간격을 늘리고 재시도)
+THROTTLE_STATUSES = (429, 503)
+
+
+class Fetcher:
+    def __init__(self, headers=None, limiter=None, max_workers=FETCH_CONCURRENCY,
+                 timeout=30, retry_delay=5, cache=None):
+        self.limiter = limiter or HostRateLimiter()
+        self.cache = cache
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        # 재시도는 호스트별 딜레이를 지키도록 여기서 직접 처리
+        self.session = create_session(pool_size=max_workers, retries=0, headers=headers)
+        self._executor = None
+        self.stats = {
+            'requests': 0,
+            'retries': 0,
+            'failures': 0,
+            'wait_seconds': 0.0,
+            'not_modified': 0,
+            'throttled': 0,
+            'skipped': 0,  # HTML이 아니라서 본문을 받지 않은 응답
+            'truncated': 0,  # 크기/시간 제한으로 일부만 받은 응답
+        }
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='fetch')
+        return self._executor
+
+    def _send(self, url, page=None, scan=None, **kwargs):
+        """
+        실제 HTTP 요청 (스레드에서 실행)
+        page: PageLimits (본문을 제한에 맞춰 스트리밍으로 받음), scan: 버리는 본문 조각을 받는 콜백
+        """
+        if page is not None:
+            kwargs['stream'] = True
+            kwargs.setdefault('timeout', page.timeout)
+        kwargs.setdefault('timeout', self.timeout)
+        self.stats['requests'] += 1
+
+        validators = self.cache.lookup(url) if self.cache else None
+        if validators:
+            kwargs['headers'] = {**validators, **(kwargs.get('headers') or {})}
+
+        response = self.session.get(url, **kwargs)
+        if validators and response.status_code == 304:
+            cached = self.cache.revalidated(url, response)
+            if cached is not None:
+                response.close()
+                self.stats['not_modified'] += 1
+                self.limiter.refund(url)
+                self.limiter.success(url)
+                return cached
+
+        if page is not None:
+            try:
+                response.raise_for_status()
+                page.read(response, scan)
+            finally:
+                response.close()
+            if response.truncated:
+                self.stats['truncated'] += 1
+        else:
+            response.raise_for_status()
+        self.limiter.success(url)
+        if self.cache:
+            self.cache.store(url, response)
+        return response
+
+    def _fetch_robots(self, url):
+        """
+        호스트의 첫 요청 전에 robots.txt Crawl-delay 적용 (스레드에서 실행)
+        robots.txt도 같은 호스트 요청이므로 호출하는 쪽에서 limiter 슬롯을 받은 뒤 호출
+        """
+        parts = urlparse(url)
+        delay = 0.0
+        try:
+            response = self.session.get(f"{parts.scheme}://{parts.netloc}/robots.txt", timeout=(5, 10))
+            if response.status_code == 200 and 'html' not in response.headers.get('Content-Type', ''):
+                delay = robots_delay(response.text, self.session.headers.get('User-Agent', '*'))
+        except (requests.RequestException, ValueError):
+            pass
+        self.limiter.set_robots_delay(url, delay)
+
+    def _throttled(self, url, error):
+        """429/503/타임아웃이면 호스트 간격을 늘리고 True (다음 요청은 limiter가 기다림)"""
+        response = getattr(error, 'response', None)
+        status = response.status_code if response is not None else None
+        if status in THROTTLE_STATUSES or isinstance(error, requests.Timeout):
+            self.stats['throttled'] += 1
+            self.limiter.backoff(url, parse_retry_after(response))
+            return True
+        return False
+
+    def _record_retry(self, url, sleep):
+        target = target_of(url)
+        self.stats['retries'] += 1
+        registry.inc('http_retries_total', target=target)
+        if sleep:
+            registry.inc('sleep_seconds_total', self.retry_delay, target=target, reason='retry')
+
+    def get(self, url, **kwargs):
+        """동기 요청 (재시도 로직 포함)"""
+        if self.limiter.needs_robots(url):
+            self.stats['wait_seconds'] += self.limiter.acquire(url)
+            self._fetch_robots(url)
+        for attempt in range(MAX_RETRIES + 1):
+            wait = self.limiter.acquire(url)
+            self.stats['wait_seconds'] += wait
+            try:
+                return self._send(url, **kwargs)
+            except SkippedBody:
+                self.stats['skipped'] += 1
+                self.limiter.success(url)
+                return None
+            except Exception as e:
+                throttled = self._throttled(url, e)
+                if attempt < MAX_RETRIES:
+                    print(f"재시도 {attempt + 1}/{MAX_RETRIES}: {url[:60]}")
+                    self._record_retry(url, sleep=not throttled)
+                    if not throttled:
+                        time.sleep(self.retry_delay)
+                    continue
+                print(f"요청 실패: {e}")
+        self.stats['failures'] += 1
+        return None
+
+    async def _acquire_async(self, url):
+        """호스트 간격만큼 대기 (대기 중에 취소되면 예약한 슬롯을 돌려줌, 웹사이트 조기 종료 등)"""
+        try:
+            wait = await self.limiter.acquire_async(url)
+        except asyncio.CancelledError:
+            self.limiter.refund(url)
+            raise
+        self.stats['wait_seconds'] += wait
+
+    async def get_async(self, url, **kwargs):
+        """비동기 요청 (재시도 로직 포함)"""
+        loop = asyncio.get_running_loop()
+        if self.limiter.needs_robots(url):
+            await self._acquire_async(url)
+            await loop.run_in_executor(self.executor, self._fetch_robots, url)
+        for attempt in range(MAX_RETRIES + 1):
+            await self._acquire_async(url)
+            try:
+                return await loop.run_in_executor(self.executor, partial(self._send, url, **kwargs))
+            except SkippedBody:
+                self.stats['skipped'] += 1
+                self.limiter.success(url)
+                return None
+            except Exception as e:
+                throttled = self._throttled(url, e)
+                if attempt < MAX_RETRIES:
+                    print(f"재시도 {attempt + 1}/{MAX_RETRIES}: {url[:60]}")
+                    self._record_retry(url, sleep=not throttled)
+                    if not throttled:
+                        await asyncio.sleep(self.retry_delay)
+                    continue
+                print(f"요청 실패: {e}")
+        self.stats['failures'] += 1
+        return None
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.session.close()
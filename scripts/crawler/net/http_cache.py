@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP 조건부 요청 캐시 (SQLite)
+- ETag/Last-Modified가 있는 응답 본문을 압축해 저장하고, 다음 요청에 If-None-Match/If-Modified-Since 전송
+- 304(변경 없음)면 저장된 본문으로 응답을 만들어 반환 (본문을 다시 받지 않음)
+- 전체 크기가 max_bytes를 넘으면 오래 안 쓴 항목부터 삭제 (LRU)
+- Cache-Control: no-store 응답과 검증 헤더가 없는 응답은 저장하지 않음
+"""
+import json
+import time
+import zlib
+import sqlite3
+import threading
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import HTTP_CACHE_PATH, HTTP_CACHE_MAX_MB
+from metrics import registry, target_of
+
+# 캐시된 응답을 다시 만들 때 복원할 헤더
+_KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class HTTPCache:
+    def __init__(self, path=HTTP_CACHE_PATH, max_bytes=HTTP_CACHE_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0  # 304
+        self.misses = 0  # 본문을 새로 받음
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0  # 304로 받지 않은 본문 크기
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                headers TEXT NOT NULL,
+                encoding TEXT,
+                body BLOB NOT NULL,
+                body_size INTEGER NOT NULL,
+                stored_size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)')
+        self._conn.commit()
+        self._total = self._conn.execute('SELECT COALESCE(SUM(stored_size), 0) FROM responses').fetchone()[0]
+
+    def lookup(self, url):
+        """저장된 응답의 검증 헤더 (없으면 None) - 요청 헤더에 그대로 추가"""
+        with self._lock:
+            row = self._conn.execute('SELECT headers FROM responses WHERE url = ?', (url,)).fetchone()
+        if not row:
+            return None
+        headers = json.loads(row[0])
+        validators = {}
+        if headers.get('ETag'):
+            validators['If-None-Match'] = headers['ETag']
+        if headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = headers['Last-Modified']
+        return validators or None
+
+    def revalidated(self, url, response):
+        """304 응답을 저장된 본문으로 채운 응답으로 변환"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT headers, encoding, body, body_size FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+            if not row:
+                return None
+            headers = json.loads(row[0])
+            # 304에 새 검증 헤더가 오면 갱신
+            for name in ('ETag', 'Last-Modified'):
+                if response.headers.get(name):
+                    headers[name] = response.headers[name]
+            self._conn.execute(
+                'UPDATE responses SET headers = ?, accessed_at = ? WHERE url = ?',
+                (json.dumps(headers), time.time(), url)
+            )
+            self._conn.commit()
+            self.hits += 1
+            self.bytes_saved += row[3]
+        registry.inc('cache_hits_total', cache='http', target=target_of(url))
+
+        cached = requests.Response()
+        cached.status_code = 200
+        cached.url = response.url or url
+        cached.headers = CaseInsensitiveDict(headers)
+        cached.encoding = row[1]
+        cached._content = zlib.decompress(row[2])
+        cached.request = response.request
+        cached.from_cache = True
+        return cached
+
+    def store(self, url, response):
+        """
+        200 응답 기록 (검증 헤더가 있으면 저장)
+        PageLimits로 일부만 받은 응답(truncated)은 저장하지 않음 (304 때 잘린 본문을 전체처럼 돌려주지 않도록)
+        """
+        body = response.content
+        self.misses += 1
+        # 제한 읽기로 받은 응답은 보관한 본문이 아니라 실제로 받은 바이트
+        self.bytes_downloaded += getattr(response, 'bytes_read', len(body))
+        registry.inc('cache_misses_total', cache='http', target=target_of(url))
+
+        if response.status_code != 200 or 'no-store' in response.headers.get('Cache-Control', ''):
+            return
+        if getattr(response, 'truncated', False):
+            return
+        headers = {name: response.headers[name] for name in _KEPT_HEADERS if response.headers.get(name)}
+        if 'ETag' not in headers and 'Last-Modified' not in headers:
+            return
+
+        compressed = zlib.compress(body, 6)
+        if len(compressed) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._conn.execute('SELECT stored_size FROM responses WHERE url = ?', (url,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (url, headers, encoding, body, body_size, stored_size, accessed_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url, json.dumps(headers), response.encoding, compressed, len(body), len(compressed), time.time())
+            )
+            self._total += len(compressed) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """전체 크기가 한도를 넘으면 오래 안 쓴 항목부터 삭제"""
+        while self._total > self.max_bytes:
+            rows = self._conn.execute(
+                'SELECT url, stored_size FROM responses ORDER BY accessed_at ASC LIMIT 100'
+            ).fetchall()
+            if not rows:
+                self._total = 0
+                return
+            for url, size in rows:
+                if self._total <= self.max_bytes:
+                    break
+                self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+                self._total -= size
+                self.evictions += 1
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 3) if total else 0.0,
+            'bytes_downloaded': self.bytes_downloaded,
+            'bytes_saved': self.bytes_saved,
+            'stored_bytes': self._total,
+            'evictions': self.evictions,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+웹페이지 본문 제한 읽기 (기업 웹사이트용)
+- 응답 헤더의 Content-Type이 HTML이 아니거나, 첫 바이트가 PDF/이미지/압축 파일이면 본문을 받지 않고 중단
+- 본문은 조금씩 받으면서 앞부분(head_bytes)과 마지막 부분(tail_bytes, 푸터가 있는 곳)만 보관
+  (중간 부분은 받는 대로 scan 콜백에 넘겨 연락처만 추출하고 버림)
+- max_bytes를 넘거나 total_timeout이 지나면 그때까지 받은 것만 사용, </html> 뒤에 많이 남았으면 종료
+- 연결/읽기 제한 시간은 따로 적용 (timeout 속성을 requests에 그대로 전달)
+- 기록 모드에서는 여기서 보관한 본문(제한 안에서 받은 부분)만 아카이브에 기록
+"""
+import time
+from collections import deque
+import requests
+from urllib3.exceptions import HTTPError as URLLib3Error
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    WEBSITE_CONNECT_TIMEOUT, WEBSITE_READ_TIMEOUT, WEBSITE_TOTAL_TIMEOUT, WEBSITE_HEAD_BYTES, WEBSITE_TAIL_BYTES,
+    WEBSITE_MAX_BYTES, WEBSITE_CONTENT_TYPES,
+)
+
+CHUNK_BYTES = 16 * 1024
+# HTML이 아닌 파일의 첫 바이트 (Content-Type이 없거나 잘못된 서버용)
+BINARY_SIGNATURES = (b'%PDF', b'PK\x03\x04', b'\x89PNG', b'GIF8', b'\xff\xd8\xff', b'\xd0\xcf\x11\xe0', b'\x1f\x8b')
+END_MARKER = b'</html'
+
+
+class SkippedBody(Exception):
+    """HTML이 아니라서 본문을 받지 않은 응답 (재시도하지 않음)"""
+
+
+def _chunks(response, size):
+    """본문을 받는 대로 조각으로 (이미 읽은 응답은 메모리에서 나눔)"""
+    if response._content_consumed:
+        content = response.content or b''
+        for start in range(0, len(content), size):
+            yield content[start:start + size]
+        return
+    raw = response.raw
+    # read1은 size를 다 채울 때까지 기다리지 않으므로 느린 서버에서도 제한 시간을 확인할 수 있음
+    read = raw.read1 if hasattr(raw, 'read1') else raw.read
+    while True:
+        chunk = read(size, decode_content=True)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _record(response, content):
+    """기록 모드(net.replay)에서 스트리밍 응답의 본문 기록 (세션이 response.record를 붙여 둔 경우만)"""
+    record = getattr(response, 'record', None)
+    if record is not None:
+        record(content)
+
+
+class PageLimits:
+    """
+    Fetcher.get/get_async(page=...)에 넘기는 응답 제한
+    read()는 응답 본문을 제한에 맞춰 읽고 response.content를 보관한 부분으로 바꿈
+    (response.truncated: 중간/뒷부분을 버렸는지, response.bytes_read: 실제로 받은 바이트)
+    """
+
+    def __init__(self, head_bytes=WEBSITE_HEAD_BYTES, tail_bytes=WEBSITE_TAIL_BYTES, max_bytes=WEBSITE_MAX_BYTES,
+                 connect_timeout=WEBSITE_CONNECT_TIMEOUT, read_timeout=WEBSITE_READ_TIMEOUT,
+                 total_timeout=WEBSITE_TOTAL_TIMEOUT, content_types=WEBSITE_CONTENT_TYPES):
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.max_bytes = max(max_bytes, head_bytes)
+        self.total_timeout = total_timeout
+        self.timeout = (connect_timeout, read_timeout)
+        self.content_types = tuple(content_types)
+
+    def check_type(self, response):
+        """Content-Type이 HTML이 아니면 SkippedBody (없거나 octet-stream이면 첫 바이트로 판단)"""
+        content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+        if content_type and content_type != 'application/octet-stream' and content_type not in self.content_types:
+            raise SkippedBody(content_type)
+
+    def read(self, response, scan=None):
+        """
+        응답 본문을 제한에 맞춰 읽음 (스레드에서 실행)
+        scan: 버리는 중간 부분(bytes)을 받는 콜백
+        본문을 받는 중에 연결이 끊기거나 읽기 제한 시간이 지나면 받은 데까지 사용 (아무것도 못 받았으면 예외)
+        """
+        try:
+            self.check_type(response)
+        except SkippedBody:
+            _record(response, b'')
+            raise
+        deadline = time.monotonic() + self.total_timeout if self.total_timeout else None
+        head = bytearray()
+        tail = deque()
+        tail_size = 0
+        total = 0
+        truncated = False
+        gap = False  # 앞부분과 마지막 부분 사이를 버렸는지
+        previous = b''
+        try:
+            for chunk in _chunks(response, CHUNK_BYTES):
+                if not total and (chunk.lstrip()[:4].startswith(BINARY_SIGNATURES) or b'\x00' in chunk[:1024]):
+                    _record(response, chunk)  # 재생할 때도 첫 바이트로 건너뛰도록
+                    raise SkippedBody('binary')
+                total += len(chunk)
+                ended = END_MARKER in (previous[-16:] + chunk).lower()
+                previous = chunk
+
+                room = self.head_bytes - len(head)
+                if room > 0:
+                    head += chunk[:room]
+                    chunk = chunk[room:]
+                if chunk:
+                    tail.append(chunk)
+                    tail_size += len(chunk)
+                    # 마지막 tail_bytes보다 앞선 조각은 연락처만 추출하고 버림
+                    while tail and tail_size - len(tail[0]) >= self.tail_bytes:
+                        dropped = tail.popleft()
+                        tail_size -= len(dropped)
+                        truncated = gap = True
+                        if scan:
+                            scan(dropped)
+
+                # </html> 뒤가 조금 남았으면 끝까지 읽어 연결을 재사용 (많이 남았으면 연결을 끊고 중단)
+                if ended and (getattr(response.raw, 'length_remaining', None) or 0) > CHUNK_BYTES:
+                    break
+                if total >= self.max_bytes or (deadline and time.monotonic() > deadline):
+                    truncated = True
+                    break
+        except (requests.RequestException, URLLib3Error, OSError):
+            if not total:
+                raise
+            truncated = True
+        finally:
+            response.close()
+
+        if gap:
+            # 잘린 경계가 태그 중간일 수 있으므로 줄을 바꿔 이어 붙임
+            body = bytes(head) + b'\n' + b''.join(tail)
+        else:
+            body = bytes(head) + b''.join(tail)
+        _record(response, body)
+        response._content = body
+        response._content_consumed = True
+        response.truncated = truncated
+        response.bytes_read = total
+        return response
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+호스트별 요청 간격 저장소 + robots.txt/Retry-After 해석
+- HostRateLimiter가 조정한 간격과 robots.txt에서 읽은 Crawl-delay를 호스트별로 저장
+  (다음 실행은 저장된 간격에서 시작)
+- robots.txt는 ROBOTS_TXT_TTL_HOURS마다 다시 확인
+"""
+import time
+import sqlite3
+import threading
+from email.utils import parsedate_to_datetime
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import POLITENESS_DB_PATH
+
+
+def parse_retry_after(response):
+    """Retry-After 헤더(초 또는 HTTP 날짜) → 기다릴 초 (없으면 None)"""
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _seconds(value):
+    """'5', '0.5', '5s' → 초 (해석할 수 없으면 None)"""
+    try:
+        return float(value.strip().rstrip('sS'))
+    except ValueError:
+        return None
+
+
+def robots_delay(text, user_agent='*'):
+    """
+    robots.txt의 Crawl-delay / Request-rate → 최소 요청 간격 (없으면 0)
+    User-agent가 *이거나 우리 User-Agent에 포함되는 그룹만 적용
+    (urllib.robotparser는 소수점 Crawl-delay를 무시하므로 직접 해석)
+    """
+    user_agent = (user_agent or '*').lower()
+    agents = []
+    in_rules = False
+    delay = 0.0
+    for raw in text.splitlines():
+        line = raw.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        field, value = (part.strip() for part in line.split(':', 1))
+        field = field.lower()
+        if field == 'user-agent':
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+            continue
+        in_rules = True
+        if not any(agent == '*' or (agent and agent in user_agent) for agent in agents):
+            continue
+        if field == 'crawl-delay':
+            seconds = _seconds(value)
+        elif field == 'request-rate' and '/' in value:
+            count, _, period = value.partition('/')
+            count, seconds = _seconds(count), _seconds(period.split()[0] if period.split() else '')
+            seconds = seconds / count if count and seconds else None
+        else:
+            continue
+        if seconds:
+            delay = max(delay, seconds)
+    return delay
+
+
+class PolitenessStore:
+    def __init__(self, path=POLITENESS_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS hosts (
+                host TEXT PRIMARY KEY,
+                interval REAL,
+                robots_delay REAL,
+                robots_checked_at REAL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+        self._conn.commit()
+
+    def load(self):
+        """{호스트: {'interval', 'robots_delay', 'robots_checked_at'}}"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT host, interval, robots_delay, robots_checked_at FROM hosts'
+            ).fetchall()
+        return {host: {'interval': interval, 'robots_delay': robots_delay, 'robots_checked_at': checked_at}
+                for host, interval, robots_delay, checked_at in rows}
+
+    def save_intervals(self, intervals):
+        """{호스트: 간격} 저장 (robots.txt 정보는 유지)"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                'INSERT INTO hosts (host, interval, updated_at) VALUES (?, ?, ?)'
+                ' ON CONFLICT(host) DO UPDATE SET interval = excluded.interval, updated_at = excluded.updated_at',
+                [(host, interval, now) for host, interval in intervals.items()]
+            )
+            self._conn.commit()
+
+    def save_robots(self, host, delay):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO hosts (host, robots_delay, robots_checked_at, updated_at) VALUES (?, ?, ?, ?)'
+                ' ON CONFLICT(host) DO UPDATE SET robots_delay = excluded.robots_delay,'
+                ' robots_checked_at = excluded.robots_checked_at, updated_at = excluded.updated_at',
+                (host, delay, now, now)
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+호스트별 요청 속도 제한
+- 사람인/원티드는 기존 딜레이(CRAWL_DELAY + 랜덤)에서 시작
+- 그 외 기업 홈페이지는 호스트별로 독립적으로 제한하여 동시에 요청 가능
+- 자동 조정(POLITENESS_ADAPTIVE): 정상 응답이 이어지면 조금씩 빠르게(설정 딜레이의 POLITENESS_MIN_RATIO까지),
+  429/503/타임아웃이면 간격을 지수적으로 늘리고 Retry-After 동안은 요청하지 않음
+- robots.txt의 Crawl-delay는 최소 간격으로 사용
+- store(PolitenessStore)를 주면 조정된 간격을 저장하고 다음 실행은 그 값에서 시작
+"""
+import time
+import random
+import asyncio
+import threading
+from urllib.parse import urlparse
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    HOST_DELAYS, DEFAULT_HOST_DELAY, POLITENESS_ADAPTIVE, POLITENESS_SPEEDUP_AFTER, POLITENESS_SPEEDUP_FACTOR,
+    POLITENESS_MIN_RATIO, POLITENESS_BACKOFF_FACTOR, POLITENESS_MAX_DELAY, ROBOTS_TXT_ENABLED, ROBOTS_TXT_TTL_HOURS,
+)
+from metrics import registry, target_of
+
+
+class TokenBucket:
+    """
+    토큰 버킷 (GCRA 방식)
+    reserve()는 토큰 하나를 예약하고 기다려야 할 시간(초)을 반환하므로
+    동기(time.sleep)/비동기(asyncio.sleep) 양쪽에서 같이 사용할 수 있음
+    """
+
+    def __init__(self, interval, burst=1, jitter=(0, 0)):
+        self.interval = interval
+        self.burst = max(1, burst)
+        self.jitter = jitter
+        self._tat = 0.0  # 다음 토큰이 생기는 이론적 시각
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """토큰 예약 후 대기 시간 반환"""
+        with self._lock:
+            now = time.monotonic()
+            interval = self.interval + random.uniform(*self.jitter)
+            allowed_at = self._tat - (self.burst - 1) * self.interval
+            start = max(now, allowed_at)
+            self._tat = max(self._tat, now) + interval
+            return start - now
+
+    def refund(self):
+        """사용한 토큰 하나를 되돌림 (304처럼 부담이 거의 없는 응답은 딜레이에 포함하지 않음)"""
+        with self._lock:
+            self._tat = max(time.monotonic(), self._tat - self.interval)
+
+    def block_for(self, seconds):
+        """seconds 동안 새 토큰을 주지 않음 (Retry-After)"""
+        with self._lock:
+            self._tat = max(self._tat, time.monotonic() + seconds)
+
+
+class HostRateLimiter:
+    """
+    호스트별 토큰 버킷 관리
+    host_delays: {'saramin.co.kr': (최소, 최대)} 형태, 서브도메인까지 매칭
+    success()/backoff()로 응답 결과를 알려주면 adaptive일 때 간격을 조정
+    """
+
+    def __init__(self, host_delays=None, default_delay=DEFAULT_HOST_DELAY, adaptive=POLITENESS_ADAPTIVE,
+                 store=None, robots=ROBOTS_TXT_ENABLED):
+        self.host_delays = HOST_DELAYS if host_delays is None else host_delays
+        self.default_delay = default_delay
+        self.adaptive = adaptive
+        self.robots = robots
+        self.store = store
+        self._learned = store.load() if store else {}
+        self._buckets = {}
+        self._policies = {}  # 키 -> {'configured', 'floor', 'healthy'}
+        self._robots_checked = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url):
+        """URL에서 호스트 추출 (www. 제거)"""
+        host = (urlparse(url).hostname or url).lower()
+        return host[4:] if host.startswith('www.') else host
+
+    def _delay_for(self, host):
+        for domain, delay in self.host_delays.items():
+            if host == domain or host.endswith('.' + domain):
+                return domain, delay
+        return host, (self.default_delay, self.default_delay)
+
+    def key_of(self, url):
+        return self._delay_for(self.host_of(url))[0]
+
+    def bucket(self, url):
+        """URL에 해당하는 버킷 반환 (없으면 생성, 저장된 간격이 있으면 그 값에서 시작)"""
+        key, (low, high) = self._delay_for(self.host_of(url))
+        with self._lock:
+            if key not in self._buckets:
+                learned = self._learned.get(key, {})
+                floor = max(low * POLITENESS_MIN_RATIO, learned.get('robots_delay') or 0)
+                interval = max(low, floor)
+                if self.adaptive and learned.get('interval') is not None:
+                    # 이전 실행에서 늦췄더라도 백오프 한 단계 이상 느리게 시작하지는 않음
+                    interval = min(max(learned['interval'], floor), interval * POLITENESS_BACKOFF_FACTOR)
+                self._buckets[key] = TokenBucket(interval, jitter=(0, high - low))
+                self._policies[key] = {'configured': low, 'floor': floor, 'healthy': 0}
+            return self._buckets[key]
+
+    def success(self, url):
+        """정상 응답: POLITENESS_SPEEDUP_AFTER번 이어지면 간격을 줄임"""
+        if not self.adaptive:
+            return
+        bucket = self.bucket(url)
+        policy = self._policies[self.key_of(url)]
+        with self._lock:
+            policy['healthy'] += 1
+            if policy['healthy'] < POLITENESS_SPEEDUP_AFTER:
+                return
+            policy['healthy'] = 0
+            bucket.interval = max(policy['floor'], bucket.interval * POLITENESS_SPEEDUP_FACTOR)
+
+    def backoff(self, url, retry_after=None):
+        """429/503/타임아웃: 간격을 늘리고 Retry-After 동안 요청 중단"""
+        bucket = self.bucket(url)
+        policy = self._policies[self.key_of(url)]
+        registry.inc('backoffs_total', target=target_of(url))
+        with self._lock:
+            policy['healthy'] = 0
+            if self.adaptive:
+                bucket.interval = min(POLITENESS_MAX_DELAY, max(bucket.interval, policy['configured'])
+                                      * POLITENESS_BACKOFF_FACTOR)
+        bucket.block_for(min(POLITENESS_MAX_DELAY, retry_after if retry_after is not None else bucket.interval))
+
+    def needs_robots(self, url):
+        """이 호스트의 robots.txt를 확인해야 하면 True (호스트당 한 번, 저장된 결과는 TTL 동안 사용)"""
+        if not self.robots:
+            return False
+        key = self.key_of(url)
+        with self._lock:
+            if key in self._robots_checked:
+                return False
+            self._robots_checked.add(key)
+        checked_at = self._learned.get(key, {}).get('robots_checked_at')
+        return not checked_at or time.time() - checked_at > ROBOTS_TXT_TTL_HOURS * 3600
+
+    def set_robots_delay(self, url, delay):
+        """robots.txt의 Crawl-delay를 최소 간격으로 적용"""
+        delay = min(delay, POLITENESS_MAX_DELAY)
+        bucket = self.bucket(url)
+        key = self.key_of(url)
+        with self._lock:
+            policy = self._policies[key]
+            policy['floor'] = max(policy['floor'], delay)
+            bucket.interval = max(bucket.interval, delay)
+        if self.store:
+            self.store.save_robots(key, delay)
+
+    def intervals(self):
+        """호스트별 현재 간격 (설정 딜레이와 다른 호스트만)"""
+        with self._lock:
+            return {key: round(bucket.interval, 3) for key, bucket in self._buckets.items()
+                    if abs(bucket.interval - self._policies[key]['configured']) > 1e-6}
+
+    def save(self):
+        """조정된 간격 저장 (다음 실행은 이 값에서 시작, 설정 딜레이로 돌아온 호스트도 갱신)"""
+        if not (self.store and self.adaptive):
+            return
+        with self._lock:
+            intervals = {key: bucket.interval for key, bucket in self._buckets.items()
+                         if key in self._learned or bucket.interval != self._policies[key]['configured']}
+        self.store.save_intervals(intervals)
+
+    def reserve(self, url):
+        """요청 슬롯 예약 후 대기 시간 반환"""
+        return self.bucket(url).reserve()
+
+    def refund(self, url):
+        self.bucket(url).refund()
+
+    def acquire(self, url):
+        """동기 대기"""
+        wait = self.reserve(url)
+        if wait > 0:
+            registry.inc('sleep_seconds_total', wait, target=target_of(url), reason='politeness')
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url):
+        """비동기 대기"""
+        wait = self.reserve(url)
+        if wait > 0:
+            registry.inc('sleep_seconds_total', wait, target=target_of(url), reason='politeness')
+            await asyncio.sleep(wait)
+        return wait
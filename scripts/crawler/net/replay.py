@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP 기록/재생 (오프라인 실행, 벤치마크용)
+- 기록: create_session()으로 만든 모든 세션(사람인/원티드/웹사이트/Gemini/Supabase)의 요청과 응답을
+  픽스처 아카이브(SQLite)에 저장
+- 재생: 요청 URL을 로컬 재생 서버(ReplayServer)로 바꿔 보내고, 서버는 아카이브에서 응답을 찾아 돌려줌
+  (호스트별 지연 설정 가능, 응답의 url은 원래 URL로 복원)
+- 아카이브 키: 메서드 + URL(쿼리 정렬, API 키 제거) + 요청 본문 해시
+  본문이 다르면 같은 메서드/URL로 가장 최근에 기록된 응답 사용
+"""
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, quote, unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# URL에서 지우는 인증 파라미터 (Gemini ?key=)
+SECRET_PARAMS = {'key', 'apikey', 'api_key', 'access_token', 'token'}
+# 재생 시 다시 계산되므로 저장하지 않는 헤더
+SKIP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive',
+                'set-cookie', 'date', 'server'}
+LOCAL_HOSTS = {'127.0.0.1', 'localhost'}
+
+
+def normalize_url(url):
+    """쿼리 순서 정렬, 인증 파라미터 제거"""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path or '/', urlencode(query), ''))
+
+
+def body_hash(body):
+    if not body:
+        return ''
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return hashlib.sha1(body).hexdigest()
+
+
+class FixtureArchive:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                method TEXT NOT NULL,
+                url TEXT NOT NULL,
+                body_hash TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                content BLOB NOT NULL,
+                recorded_at REAL NOT NULL,
+                PRIMARY KEY (method, url, body_hash)
+            )
+        ''')
+        self._conn.commit()
+
+    def record(self, method, url, request_body, status, headers, content):
+        if status == 304:
+            return  # 조건부 요청 결과는 기록하지 않음 (이전에 기록한 200 응답 유지)
+        headers = {k: v for k, v in headers.items() if k.lower() not in SKIP_HEADERS}
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (method, url, body_hash, status, headers, content, recorded_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (method.upper(), normalize_url(url), body_hash(request_body), status,
+                 json.dumps(headers, ensure_ascii=False), zlib.compress(content or b''), time.time())
+            )
+            self._conn.commit()
+
+    def lookup(self, method, url, request_body=None):
+        """(status, headers, content) 또는 None"""
+        method, url = method.upper(), normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, headers, content FROM responses WHERE method = ? AND url = ? AND body_hash = ?',
+                (method, url, body_hash(request_body))
+            ).fetchone()
+            if not row:
+                row = self._conn.execute(
+                    'SELECT status, headers, content FROM responses WHERE method = ? AND url = ?'
+                    ' ORDER BY recorded_at DESC LIMIT 1', (method, url)
+                ).fetchone()
+        if not row:
+            return None
+        return row[0], json.loads(row[1]), zlib.decompress(row[2])
+
+    def pages(self, url_pattern):
+        """URL이 url_pattern(SQL LIKE)에 맞는 GET 200 응답 [(url, content)] (벤치마크용)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, content FROM responses WHERE method = 'GET' AND status = 200 AND url LIKE ? ORDER BY url",
+                (url_pattern,)
+            ).fetchall()
+        return [(url, zlib.decompress(content)) for url, content in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ReplayServer:
+    """
+    아카이브 응답을 돌려주는 로컬 서버
+    요청 경로: /{scheme}/{host}{path}?{query} (rewrite()로 변환)
+    latency: 요청당 기본 지연, host_latency: {'saramin.co.kr': 0.3} 형태 (서브도메인 포함)
+    """
+
+    def __init__(self, archive, latency=0.0, host_latency=None):
+        self.archive = archive
+        self.latency = latency
+        self.host_latency = host_latency or {}
+        self.served = 0
+        self.missing = 0
+        self._server = None
+
+    def _delay_for(self, host):
+        for domain, delay in self.host_latency.items():
+            if host == domain or host.endswith('.' + domain):
+                return delay
+        return self.latency
+
+    def start(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+            disable_nagle_algorithm = True
+
+            def _serve(self):
+                scheme, _, rest = self.path.lstrip('/').partition('/')
+                host, _, path = rest.partition('/')
+                url = f"{scheme}://{unquote(host)}/{path}"
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length) if length else None
+
+                time.sleep(replay._delay_for(unquote(host).split(':')[0].lower()))
+                found = replay.archive.lookup(self.command, url, body)
+                if found is None:
+                    replay.missing += 1
+                    status, headers, content = 404, {'Content-Type': 'text/plain'}, b'not recorded'
+                else:
+                    replay.served += 1
+                    status, headers, content = found
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(content)
+
+            do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = do_HEAD = _serve
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+# --- 세션 연동 (net.session.PooledAdapter가 요청마다 확인) ---
+
+_recorder = None
+_replay_url = None
+
+
+def start_recording(archive):
+    """이후 모든 세션 요청/응답을 아카이브에 기록"""
+    global _recorder
+    _recorder = archive
+
+
+def start_replay(server_url):
+    """이후 모든 세션 요청을 재생 서버로 보냄 (127.0.0.1/localhost 요청은 그대로)"""
+    global _replay_url
+    _replay_url = server_url.rstrip('/')
+
+
+def stop():
+    global _recorder, _replay_url
+    _recorder = None
+    _replay_url = None
+
+
+def recorder():
+    return _recorder
+
+
+def rewrite(url):
+    """재생 중이면 재생 서버 URL로 변환 (변환하지 않으면 None)"""
+    if not _replay_url:
+        return None
+    parts = urlsplit(url)
+    if (parts.hostname or '') in LOCAL_HOSTS:
+        return None
+    path = parts.path or '/'
+    rewritten = f"{_replay_url}/{parts.scheme}/{quote(parts.netloc, safe='')}{path}"
+    return f"{rewritten}?{parts.query}" if parts.query else rewritten
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+연결 풀 세션
+- keep-alive로 TCP/TLS 연결을 재사용 (요청마다 새 연결을 열지 않음)
+- 풀 크기, 재시도/백오프(429/5xx, Retry-After 준수)를 클라이언트별로 지정
+- 새 연결(핸드셰이크) 수와 연결에 걸린 시간을 기록해 재사용으로 절약한 시간을 추정
+- requests/urllib3는 HTTP/2를 지원하지 않으므로 HTTP/1.1 keep-alive 사용
+- 요청마다 HTTP 대상별(saramin/wanted/website/gemini/supabase) 응답 시간, 상태 코드, 재시도를 지표에 기록
+- 기록/재생(net.replay)이 켜져 있으면 모든 세션의 요청을 아카이브에 기록하거나 재생 서버로 보냄
+"""
+import time
+import threading
+from functools import partial
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import HTTP_POOL_SIZE, HTTP_RETRIES, HTTP_BACKOFF
+from net import replay
+from metrics import registry, target_of
+
+
+class ConnectionStats:
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0  # 새 연결 = 핸드셰이크 수
+        self.connect_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connect(self, seconds):
+        with self._lock:
+            self.connections += 1
+            self.connect_seconds += seconds
+
+    def to_dict(self):
+        reused = max(0, self.requests - self.connections)
+        avg_connect = self.connect_seconds / self.connections if self.connections else 0.0
+        return {
+            'requests': self.requests,
+            'handshakes': self.connections,
+            'reused': reused,
+            'avg_connect_ms': round(avg_connect * 1000, 1),
+            'saved_seconds': round(reused * avg_connect, 2),  # 재사용한 요청이 새 연결을 열었다면 들었을 시간
+        }
+
+
+class PooledAdapter(HTTPAdapter):
+    """연결 생성 시간과 요청 지표를 기록하는 HTTPAdapter"""
+
+    def __init__(self, stats, target=None, **kwargs):
+        self.stats = stats
+        self.target = target  # 지표의 HTTP 대상 이름 (없으면 호스트로 구분)
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self.stats
+
+        class TimedHTTPConnection(HTTPConnection):
+            def connect(self):
+                started = time.perf_counter()
+                super().connect()
+                stats.record_connect(time.perf_counter() - started)
+
+        class TimedHTTPSConnection(HTTPSConnection):
+            def connect(self):
+                started = time.perf_counter()
+                super().connect()
+                stats.record_connect(time.perf_counter() - started)
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': type('TimedHTTPConnectionPool', (HTTPConnectionPool,), {'ConnectionCls': TimedHTTPConnection}),
+            'https': type('TimedHTTPSConnectionPool', (HTTPSConnectionPool,), {'ConnectionCls': TimedHTTPSConnection}),
+        }
+
+    def send(self, request, *args, **kwargs):
+        self.stats.record_request()
+        target = self.target or target_of(request.url)
+        started = time.perf_counter()
+        try:
+            response = self._send(request, *args, **kwargs)
+            if not kwargs.get('stream'):
+                response.content  # 본문 다운로드까지 포함해서 측정
+        except Exception:
+            registry.inc('http_errors_total', target=target)
+            raise
+        registry.observe('http_request_seconds', time.perf_counter() - started, target=target)
+        registry.inc('http_responses_total', target=target, status=response.status_code)
+        retries = getattr(response.raw, 'retries', None)
+        if retries is not None and retries.history:
+            registry.inc('http_retries_total', len(retries.history), target=target)
+        return response
+
+    def _send(self, request, *args, **kwargs):
+        original_url = request.url
+        replay_url = replay.rewrite(original_url)
+        if replay_url:
+            request.url = replay_url
+            try:
+                response = super().send(request, *args, **kwargs)
+            finally:
+                request.url = original_url
+            response.url = original_url  # 상대 링크/리다이렉트는 원래 URL 기준
+            return response
+
+        response = super().send(request, *args, **kwargs)
+        archive = replay.recorder()
+        if archive is not None:
+            record = partial(archive.record, request.method, original_url, request.body, response.status_code,
+                             dict(response.headers))
+            if not kwargs.get('stream'):
+                record(response.content)
+            elif response.ok:
+                # 스트리밍 응답은 읽는 쪽(PageLimits)이 크기/시간 제한 안에서 실제로 받은 본문만 기록
+                response.record = record
+            else:
+                record(b'')  # 오류 응답은 본문을 받지 않으므로 상태/헤더만
+        return response
+
+
+def create_session(pool_size=HTTP_POOL_SIZE, retries=HTTP_RETRIES, backoff=HTTP_BACKOFF,
+                   retry_methods=('GET', 'HEAD'), headers=None, target=None):
+    """
+    연결 풀 세션 생성
+    retries=0이면 재시도는 호출하는 쪽에서 처리 (크롤러는 호스트별 딜레이와 함께 재시도)
+    target: 지표의 HTTP 대상 이름 (없으면 요청 호스트로 saramin/wanted/website 등 구분)
+    반환된 세션의 connection_stats에 연결 통계가 쌓임
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(retry_methods),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    ) if retries else 0
+
+    stats = ConnectionStats()
+    adapter = PooledAdapter(stats, target=target, pool_connections=pool_size, pool_maxsize=pool_size,
+                            max_retries=retry, pool_block=False)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    session.connection_stats = stats
+    return session
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+AI 추출 결과 캐시 (SQLite)
+- 키: 정규화한 입력 텍스트 + 회사명 + 프롬프트/모델 버전의 해시
+- TTL이 지난 항목은 무시하고, 최대 개수를 넘으면 오래 안 쓴 항목부터 삭제 (LRU)
+- 같은 페이지를 다시 수집해도 텍스트가 같으면 API를 호출하지 않음
+"""
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import AI_CACHE_PATH, AI_CACHE_TTL_DAYS, AI_CACHE_MAX_ENTRIES
+from metrics import registry
+
+
+def normalize_text(text):
+    """공백 차이는 같은 내용으로 취급"""
+    return ' '.join((text or '').split())
+
+
+class AICache:
+    def __init__(self, path=AI_CACHE_PATH, ttl_days=AI_CACHE_TTL_DAYS, max_entries=AI_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS ai_results (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_ai_results_accessed ON ai_results (accessed_at)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_ai_results_created ON ai_results (created_at)')
+        self._conn.commit()
+        # 항목 수는 열 때 한 번만 세고 이후에는 추가/삭제로 맞춤 (put마다 COUNT(*)로 전체를 읽지 않도록)
+        self._count = self._conn.execute('SELECT COUNT(*) FROM ai_results').fetchone()[0]
+
+    @staticmethod
+    def make_key(text, company_name, version):
+        raw = '\x00'.join([version, company_name or '', normalize_text(text)])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """캐시 조회 (없거나 만료되면 None)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, created_at FROM ai_results WHERE key = ?', (key,)
+            ).fetchone()
+            if not row or now - row[1] > self.ttl:
+                self.misses += 1
+                registry.inc('cache_misses_total', cache='ai')
+                return None
+            self._conn.execute('UPDATE ai_results SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+        registry.inc('cache_hits_total', cache='ai')
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute('SELECT 1 FROM ai_results WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO ai_results (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            if not exists:
+                self._count += 1
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        """만료 항목 삭제 후 최대 개수를 넘으면 LRU 순으로 삭제"""
+        # created_at 인덱스로 만료 항목만 찾음
+        cursor = self._conn.execute('DELETE FROM ai_results WHERE created_at < ?', (now - self.ttl,))
+        self.evictions += cursor.rowcount
+        self._count -= cursor.rowcount
+        if self._count > self.max_entries:
+            cursor = self._conn.execute('''
+                DELETE FROM ai_results WHERE key IN (
+                    SELECT key FROM ai_results ORDER BY accessed_at ASC LIMIT ?
+                )
+            ''', (self._count - self.max_entries,))
+            self.evictions += cursor.rowcount
+            self._count -= cursor.rowcount
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 3) if total else 0.0,
+            'evictions': self.evictions,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
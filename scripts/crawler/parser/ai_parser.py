@@ -6,30 +6,100 @@ AI 파싱 모듈 (Gemini)
 """
 import re
 import json
-import requests
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import GEMINI_API_KEY
+from config import (
+    GEMINI_API_KEY, GEMINI_API_URL, AI_BATCH_TOKEN_BUDGET, AI_BATCH_MAX_ITEMS,
+    AI_BATCH_OUTPUT_TOKENS_PER_ITEM, AI_CACHE_ENABLED, GEMINI_POOL_SIZE,
+)
+from net.session import create_session
+from parser.ai_cache import AICache
+from parser.extractor import ContactExtractor
+from parser.condense import estimate_tokens, fit_text
+
+# 프롬프트를 바꾸면 올려야 함 (이전 캐시 결과 무효화)
+PROMPT_VERSION = 'contacts-v1'
+
+
+def empty_result():
+    return {'contacts': [], 'company_email': None, 'company_phone': None}
 
 
 class AIParser:
-    def __init__(self):
-        if not GEMINI_API_KEY:
+    def __init__(self, api_key=None, api_url=None, use_cache=AI_CACHE_ENABLED):
+        api_key = api_key or GEMINI_API_KEY
+        if not api_key:
             raise ValueError("Gemini API 키가 없습니다.")
-        self.api_key = GEMINI_API_KEY
-        self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-3-flash-preview:generateContent?key={self.api_key}"
+        self.api_key = api_key
+        self.api_url = f"{api_url or GEMINI_API_URL}?key={self.api_key}"
+        # 캐시 키에 모델도 포함 (URL의 models/{모델}:generateContent)
+        self.model = (api_url or GEMINI_API_URL).rsplit('/', 1)[-1].split(':')[0]
+        self.cache = AICache() if use_cache else None
+        self.extractor = ContactExtractor()
+        # 연결 재사용 (generateContent는 POST라 POST도 재시도)
+        self.session = create_session(pool_size=GEMINI_POOL_SIZE, retry_methods=('POST',), target='gemini')
+        self.stats = {
+            'requests': 0,
+            'batch_requests': 0,
+            'batch_splits': 0,
+        }
+
+    def _generate(self, prompt, max_output_tokens=2048):
+        """
+        Gemini generateContent 호출
+        반환: (응답 텍스트, finishReason), API 오류 시 None
+        """
+        self.stats['requests'] += 1
+        response = self.session.post(
+            self.api_url,
+            headers={"Content-Type": "application/json"},
+            json={
+                "contents": [{"parts": [{"text": prompt}]}],
+                "generationConfig": {
+                    "temperature": 0.1,
+                    "maxOutputTokens": max_output_tokens,
+                }
+            },
+            timeout=60
+        )
+
+        if response.status_code != 200:
+            print(f"Gemini API 오류: {response.status_code} - {response.text}")
+            return None
+
+        candidate = response.json()['candidates'][0]
+        return candidate['content']['parts'][0]['text'], candidate.get('finishReason')
+
+    def _cache_key(self, text, company_name):
+        return AICache.make_key(text, company_name, f"{PROMPT_VERSION}:{self.model}")
+
+    def _cache_get(self, text, company_name):
+        if not self.cache:
+            return None
+        return self.cache.get(self._cache_key(text, company_name))
+
+    def _cache_put(self, text, company_name, result):
+        if self.cache:
+            self.cache.put(self._cache_key(text, company_name), result)
 
     def extract_contacts(self, text, company_name=None):
         """
         텍스트에서 연락처 정보 추출
+        같은 텍스트로 이미 추출한 결과가 캐시에 있으면 API를 호출하지 않음
         """
-        # 텍스트가 너무 길면 잘라냄
-        if len(text) > 10000:
-            text = text[:10000]
+        # 토큰 예산을 넘으면 연락처 단서 주변만 남김
+        text = fit_text(text)
+
+        cached = self._cache_get(text, company_name)
+        if cached is not None:
+            return cached
+        return self._request_contacts(text, company_name)
 
+    def _request_contacts(self, text, company_name=None):
+        """단건 API 호출 (캐시 조회 없이)"""
         prompt = f"""다음 웹페이지 내용에서 연락처 정보를 추출해주세요.
 
 회사명: {company_name or '알 수 없음'}
@@ -66,65 +136,164 @@ JSON 형식으로 응답해주세요:
 """
 
         try:
-            response = requests.post(
-                self.api_url,
-                headers={"Content-Type": "application/json"},
-                json={
-                    "contents": [{"parts": [{"text": prompt}]}],
-                    "generationConfig": {
-                        "temperature": 0.1,
-                        "maxOutputTokens": 2048,
-                    }
-                },
-                timeout=60
-            )
-
-            if response.status_code != 200:
-                print(f"Gemini API 오류: {response.status_code} - {response.text}")
-                return {'contacts': [], 'company_email': None, 'company_phone': None}
-
-            result = response.json()
-            result_text = result['candidates'][0]['content']['parts'][0]['text']
+            generated = self._generate(prompt)
+            if not generated:
+                return empty_result()
 
             # JSON 파싱
-            json_match = re.search(r'\{[\s\S]*\}', result_text)
+            json_match = re.search(r'\{[\s\S]*\}', generated[0])
             if json_match:
-                return json.loads(json_match.group())
+                result = json.loads(json_match.group())
+                self._cache_put(text, company_name, result)
+                return result
 
-            return {'contacts': [], 'company_email': None, 'company_phone': None}
+            return empty_result()
         except Exception as e:
             print(f"AI 파싱 오류: {e}")
-            return {'contacts': [], 'company_email': None, 'company_phone': None}
+            return empty_result()
+
+    def extract_contacts_batch(self, items):
+        """
+        여러 기업의 연락처를 한 번의 API 호출로 추출
+        items: [{'key': 식별자, 'text': 텍스트, 'company_name': 회사명}, ...]
+        반환: {key: extract_contacts와 같은 형식의 결과}
+
+        토큰 예산(AI_BATCH_TOKEN_BUDGET)에 맞춰 배치를 나누고,
+        응답이 잘리거나 JSON이 깨지면 배치를 반으로 나눠 재시도
+        """
+        results = {}
+        pending = []
+        for item in items:
+            # 축약한 텍스트를 캐시 키와 배치 구성에 그대로 사용
+            item = {**item, 'text': fit_text(item.get('text'))}
+            cached = self._cache_get(item['text'], item.get('company_name'))
+            if cached is not None:
+                results[item['key']] = cached
+            else:
+                pending.append(item)
+
+        for batch in self._plan_batches(pending):
+            results.update(self._extract_batch(batch))
+        return results
+
+    def _plan_batches(self, items):
+        """토큰 예산과 최대 개수에 맞춰 배치 구성 (text는 이미 축약된 상태)"""
+        batches = []
+        current = []
+        current_tokens = 0
+
+        for item in items:
+            item = {**item, 'tokens': estimate_tokens(item['text'])}
+
+            full = len(current) >= AI_BATCH_MAX_ITEMS
+            over_budget = current and current_tokens + item['tokens'] > AI_BATCH_TOKEN_BUDGET
+            if full or over_budget:
+                batches.append(current)
+                current = []
+                current_tokens = 0
+
+            current.append(item)
+            current_tokens += item['tokens']
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _extract_batch(self, batch):
+        if len(batch) == 1:
+            item = batch[0]
+            return {item['key']: self._request_contacts(item['text'], item.get('company_name'))}
+
+        # 프롬프트 안에서는 짧은 키 사용 (c0, c1, ...)
+        keyed = {f"c{i}": item for i, item in enumerate(batch)}
+        sections = '\n\n'.join(
+            f"=== [{key}] {item.get('company_name') or '알 수 없음'}\n{item['text']}"
+            for key, item in keyed.items()
+        )
+        prompt = f"""다음은 여러 회사의 웹페이지 내용입니다. 회사별로 연락처 정보를 추출해주세요.
+각 회사는 "=== [키] 회사명" 줄로 시작합니다.
+
+추출할 정보:
+1. 담당자 이름
+2. 직책/직급
+3. 이메일 주소
+4. 전화번호
+
+우선순위:
+- 마케팅/영업/사업개발 담당자 > 채용담당자 > 대표/CEO > info@
+
+아래 JSON 형식으로, 모든 키를 빠짐없이 포함해 응답해주세요:
+{{
+    "results": {{
+        "키": {{
+            "contacts": [
+                {{
+                    "name": "이름 또는 null",
+                    "title": "직책 또는 null",
+                    "email": "이메일 또는 null",
+                    "phone": "전화번호 또는 null",
+                    "department": "부서 또는 null"
+                }}
+            ],
+            "company_email": "회사 대표 이메일 (info@, contact@ 등)",
+            "company_phone": "회사 대표 전화번호"
+        }}
+    }}
+}}
+
+연락처를 찾을 수 없는 회사는 contacts를 빈 배열로 반환하세요.
+
+---
+{sections}
+"""
+
+        self.stats['batch_requests'] += 1
+        parsed = None
+        max_tokens = min(8192, AI_BATCH_OUTPUT_TOKENS_PER_ITEM * len(batch) + 256)
+        try:
+            generated = self._generate(prompt, max_output_tokens=max_tokens)
+        except Exception as e:
+            print(f"AI 배치 요청 오류: {e}")
+            generated = None
+        if not generated:
+            # API/전송 오류, 형식이 다른 응답은 나눠도 해결되지 않으므로 빈 결과 반환
+            return {item['key']: empty_result() for item in batch}
+
+        # 응답이 잘렸거나(MAX_TOKENS) JSON이 깨진 경우만 아래에서 나눠 재시도
+        result_text, finish_reason = generated
+        try:
+            if finish_reason != 'MAX_TOKENS':
+                json_match = re.search(r'\{[\s\S]*\}', result_text)
+                if json_match:
+                    parsed = json.loads(json_match.group()).get('results')
+        except Exception as e:
+            print(f"AI 배치 파싱 오류: {e}")
+
+        results = {}
+        missing = []
+        for key, item in keyed.items():
+            result = parsed.get(key) if isinstance(parsed, dict) else None
+            if isinstance(result, dict):
+                results[item['key']] = {**empty_result(), **result}
+                self._cache_put(item['text'], item.get('company_name'), results[item['key']])
+            else:
+                missing.append(item)
+
+        if not missing:
+            return results
+
+        # 잘렸거나 깨진 응답: 빠진 항목만 다시, 전부 빠졌으면 반으로 나눠 재시도
+        self.stats['batch_splits'] += 1
+        if len(missing) < len(batch):
+            results.update(self._extract_batch(missing))
+        else:
+            half = len(batch) // 2
+            results.update(self._extract_batch(batch[:half]))
+            results.update(self._extract_batch(batch[half:]))
+        return results
 
     def extract_with_regex(self, text):
         """
         정규식으로 기본 정보 추출 (AI 호출 전 빠른 추출)
         """
-        result = {
-            'emails': [],
-            'phones': [],
-        }
-
-        # 이메일 패턴
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        emails = re.findall(email_pattern, text)
-        # 필터링 (이미지, 예시 등 제외)
-        result['emails'] = [
-            e for e in set(emails)
-            if not any(x in e.lower() for x in ['example', 'test', '.png', '.jpg', 'noreply'])
-        ]
-
-        # 전화번호 패턴 (한국)
-        phone_patterns = [
-            r'02-\d{3,4}-\d{4}',  # 서울
-            r'0\d{1,2}-\d{3,4}-\d{4}',  # 지역번호
-            r'010-\d{4}-\d{4}',  # 휴대폰
-            r'070-\d{4}-\d{4}',  # 인터넷전화
-        ]
-        for pattern in phone_patterns:
-            phones = re.findall(pattern, text)
-            result['phones'].extend(phones)
-
-        result['phones'] = list(set(result['phones']))
-
-        return result
+        return self.extractor.extract(text)
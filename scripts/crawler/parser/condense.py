@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+AI 파싱 입력 축약 (토큰 예산 안에서 연락처 단서 주변만)
+- 여러 텍스트(푸터, 하위 페이지, 홈페이지, 상세 본문)를 우선순위 순으로 받아
+  앞에서 나온 연속 단어열(AI_DEDUP_NGRAM개)이 뒤에 다시 나오면 제거 (페이지마다 반복되는 메뉴/푸터)
+- 푸터는 통째로, 나머지는 단서(@, 전화번호, 전화/Tel/대표/담당자/문의 등) 앞뒤 AI_CUE_WINDOW 단어만 남김
+- 단서가 많은 구간부터 AI_TEXT_TOKEN_BUDGET 안에서 고르고, 원래 순서대로 이어 붙임
+- 단서가 하나도 없으면 앞부분을 예산만큼
+"""
+import re
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import AI_TEXT_TOKEN_BUDGET, AI_CUE_WINDOW, AI_DEDUP_NGRAM
+from parser.extractor import CONTACT_RE
+
+# 연락처 주변에 나오는 단어 (이메일/전화번호 자체는 CONTACT_RE)
+CUE_RE = re.compile(
+    r'전화|연락처|이메일|메일|대표|담당|문의|제휴|영업|마케팅|주소|사업자'
+    r'|\btel\b|\bphone\b|e-?mail|contact|\bceo\b',
+    re.IGNORECASE,
+)
+GAP = '…'  # 앞을 잘라낸 구간 표시
+MIN_SEGMENT_TOKENS = 100  # 예산이 이보다 적게 남으면 구간을 잘라 넣지 않음
+
+
+def estimate_tokens(text):
+    """
+    토큰 수 대략 추정
+    한글 등 비ASCII 문자는 1자당 약 1토큰, ASCII는 4자당 약 1토큰
+    """
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii) // 4
+
+
+def _dedup(sections, n):
+    """앞 텍스트에 이미 나온 n단어 연속 구간을 뒤에서 제거 (각 텍스트의 단어 목록 반환)"""
+    seen = set()
+    result = []
+    for text in sections:
+        words = text.split()
+        repeated = [False] * len(words)
+        for i in range(len(words) - n + 1):
+            shingle = tuple(words[i:i + n])
+            if shingle in seen:
+                for j in range(i, i + n):
+                    repeated[j] = True
+            else:
+                seen.add(shingle)
+        result.append([w for w, r in zip(words, repeated) if not r])
+    return result
+
+
+def _cue_windows(words, window):
+    """단서 단어 주변 구간 [(단서 수, 시작, 끝)] (겹치는 구간은 합침)"""
+    windows = []
+    for i, word in enumerate(words):
+        if not (CONTACT_RE.search(word) or CUE_RE.search(word)):
+            continue
+        start, end = max(0, i - window), min(len(words), i + window + 1)
+        if windows and start <= windows[-1][2]:
+            cues, first, _ = windows[-1]
+            windows[-1] = (cues + 1, first, end)
+        else:
+            windows.append((1, start, end))
+    return windows
+
+
+def _fit(text, budget):
+    """앞에서부터 budget 토큰까지 (단어 단위)"""
+    if estimate_tokens(text) <= budget:
+        return text
+    kept = []
+    used = 0
+    for word in text.split():
+        used += estimate_tokens(word + ' ')
+        if used > budget:
+            break
+        kept.append(word)
+    return ' '.join(kept)
+
+
+def condense(sections, budget=AI_TEXT_TOKEN_BUDGET, window=AI_CUE_WINDOW, footer=None):
+    """
+    sections: 우선순위 순 텍스트 목록 (앞에 있을수록 먼저 남고, 반복 문구는 뒤에서 제거)
+    footer: 통째로 남길 텍스트 (sections보다 앞에 둠)
+    반환: (축약한 텍스트, {'tokens_in', 'tokens_out'})
+    tokens_in/tokens_out은 같은 입력 기준 (푸터 + sections를 한 번씩 / 축약한 텍스트 전체)
+    """
+    sections = [footer or ''] + [s or '' for s in sections]
+    tokens_in = sum(estimate_tokens(s) for s in sections)
+    words = _dedup(sections, AI_DEDUP_NGRAM)
+
+    # (우선순위, 섹션 번호, 시작, 끝) - 푸터가 가장 먼저, 나머지는 단서가 많은 구간부터
+    candidates = [(float('inf'), 0, 0, len(words[0]))] if words[0] else []
+    for index, section_words in enumerate(words[1:], 1):
+        candidates += [(cues, index, start, end) for cues, start, end in _cue_windows(section_words, window)]
+    candidates.sort(key=lambda c: (-c[0], c[1], c[2]))
+
+    chosen = []
+    used = 0
+    for _, index, start, end in candidates:
+        segment = ' '.join(words[index][start:end])
+        tokens = estimate_tokens(segment)
+        if used + tokens > budget:
+            # 예산을 넘는 구간은 남은 예산만큼 앞부분만
+            if budget - used < MIN_SEGMENT_TOKENS:
+                continue
+            segment = _fit(segment, budget - used)
+            end = start + len(segment.split())
+            tokens = estimate_tokens(segment)
+        chosen.append((index, start, end))
+        used += tokens
+
+    if not chosen:
+        text = _fit(' '.join(' '.join(w) for w in words if w), budget)
+    else:
+        parts = []
+        for index, start, end in sorted(chosen):
+            segment = ' '.join(words[index][start:end])
+            parts.append(segment if start == 0 else f'{GAP} {segment}')
+        text = '\n'.join(parts)
+    return text, {'tokens_in': tokens_in, 'tokens_out': estimate_tokens(text)}
+
+
+def fit_text(text, budget=AI_TEXT_TOKEN_BUDGET):
+    """예산 안이면 그대로, 넘으면 condense (AIParser에 축약하지 않은 텍스트가 들어온 경우)"""
+    text = text or ''
+    if estimate_tokens(text) <= budget:
+        return text
+    return condense([text], budget)[0]
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+정규식 추출 결과 순위/신뢰도 계산
+- 역할 주소 우선순위는 AI 프롬프트와 같게: 영업/마케팅/제휴 > 채용 > 대표 > 문의(info@ 등)
+- 회사 도메인과 일치하면 가산, 무료 메일(gmail 등)이면 감점
+- 신뢰도가 기준 이상이면 AI 호출 없이 정규식 결과 사용
+  (역할을 알 수 없는 주소는 도메인 가산을 받아도 기준 AI_GATE_THRESHOLD 0.8 미만)
+"""
+from urllib.parse import urlparse
+
+# (점수, 로컬파트 키워드)
+ROLE_TIERS = [
+    (0.9, {'sales', 'biz', 'business', 'bizdev', 'bd', 'marketing', 'mkt', 'partner', 'partners',
+           'partnership', 'alliance', 'pr', 'ad', 'ads', 'proposal', 'cooperation', 'coop'}),
+    (0.8, {'recruit', 'recruiting', 'hr', 'jobs', 'job', 'career', 'careers', 'hire', 'people', 'talent'}),
+    (0.75, {'ceo', 'president', 'owner', 'founder', 'daepyo'}),
+    (0.65, {'contact', 'contactus', 'inquiry', 'enquiry', 'hello', 'ask', 'official',
+            'info', 'office', 'admin', 'master', 'mail'}),
+    (0.55, {'help', 'cs', 'support', 'service', 'webmaster'}),
+    (0.3, {'privacy', 'abuse', 'postmaster', 'security', 'dpo'}),
+    (0.0, {'noreply', 'no-reply', 'donotreply', 'do-not-reply', 'mailer-daemon'}),
+]
+PERSONAL_SCORE = 0.7  # 역할을 알 수 없는 주소 (예: gildong.hong@, design@), 도메인 가산을 받아도 0.75
+DOMAIN_BONUS = 0.05
+
+FREE_MAIL_DOMAINS = {
+    'gmail.com', 'naver.com', 'daum.net', 'hanmail.net', 'nate.com', 'kakao.com',
+    'hotmail.com', 'outlook.com', 'yahoo.com', 'icloud.com',
+}
+
+
+def _domain(value):
+    host = urlparse(value if '//' in value else f'//{value}').hostname or ''
+    return host[4:] if host.startswith('www.') else host
+
+
+def score_email(email, website=None):
+    """이메일 하나의 신뢰도 (0~1)"""
+    local, _, domain = email.lower().partition('@')
+    base = local.split('+')[0]
+
+    score = PERSONAL_SCORE
+    for tier_score, keywords in ROLE_TIERS:
+        if base in keywords or any(base.startswith(k + sep) for k in keywords for sep in '._-'):
+            score = tier_score
+            break
+
+    if domain in FREE_MAIL_DOMAINS:
+        score -= 0.15
+    elif website:
+        site = _domain(website)
+        if site and (domain == site or domain.endswith('.' + site) or site.endswith('.' + domain)):
+            score += DOMAIN_BONUS
+        else:
+            score -= 0.1
+
+    return round(max(0.0, min(1.0, score)), 3)
+
+
+def rank_emails(emails, website=None):
+    """신뢰도 높은 순으로 정렬 (중복 제거)"""
+    unique = list(dict.fromkeys(e.strip() for e in emails if e))
+    return sorted(unique, key=lambda e: score_email(e, website), reverse=True)
+
+
+def best_contact(emails, website=None):
+    """가장 좋은 이메일과 신뢰도 반환 (없으면 (None, 0.0))"""
+    ranked = rank_emails(emails, website)
+    if not ranked:
+        return None, 0.0
+    return ranked[0], score_email(ranked[0], website)
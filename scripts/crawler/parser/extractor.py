@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+연락처 추출 (정규식, 모든 소스 공용)
+- 이메일(@)/전화번호 시작 위치를 하나로 합친 정규식으로 문서를 한 번만 스캔
+- 전화번호는 하이픈 없는 형식, +82 형식까지 인식해 0XX-XXXX-XXXX로 정규화
+- 차단 목록은 부분 문자열 검사 대신 집합 조회 (도메인은 상위 도메인까지 확인)
+"""
+import re
+
+EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+
+# 지역번호/휴대폰/인터넷전화 앞자리 (0 다음) + 나머지 번호
+_PHONE_BODY = (
+    r'(?:2|3[1-3]|4[1-4]|5[1-5]|6[1-4]|70|1[016789]|50[2-8])'
+    r'\)?[\s.-]?\d{3,4}[\s.-]?\d{4}(?!\d)'
+)
+
+# 모든 분기가 리터럴(@, +, (, 0)로 시작해야 re가 첫 글자로 빠르게 건너뜀
+# (이메일 패턴을 그대로 분기에 넣으면 영문/숫자 위치마다 매칭을 시도해 몇 배 느려짐)
+CONTACT_RE = re.compile(
+    r'@'
+    r'|\+82[\s.-]?' + _PHONE_BODY +
+    r'|\(0' + _PHONE_BODY +
+    r'|0' + _PHONE_BODY
+)
+_EMAIL_LOCAL_RE = re.compile(r'[a-zA-Z0-9._%+-]{1,64}$')
+_EMAIL_DOMAIN_RE = re.compile(r'[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# 이메일로 잘못 잡히는 파일명 (logo@2x.png 등)
+FILE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'svg', 'webp', 'ico', 'css', 'js', 'bmp'}
+
+
+def normalize_phone(raw):
+    """전화번호를 0XX-XXXX-XXXX 형식으로 (형식이 맞지 않으면 None)"""
+    digits = re.sub(r'\D', '', raw)
+    if digits.startswith('82'):
+        digits = '0' + digits[2:]
+
+    if digits.startswith('02'):
+        area, rest = digits[:2], digits[2:]
+    elif digits.startswith('050'):
+        area, rest = digits[:4], digits[4:]
+    else:
+        area, rest = digits[:3], digits[3:]
+
+    if len(rest) == 7:
+        return f"{area}-{rest[:3]}-{rest[3:]}"
+    if len(rest) == 8:
+        return f"{area}-{rest[:4]}-{rest[4:]}"
+    return None
+
+
+class Blocklist:
+    """
+    이메일/전화번호 차단 목록
+    domains: 차단 도메인 (하위 도메인 포함, 예: saramin.co.kr → mail.saramin.co.kr도 차단)
+    locals: 차단할 이메일 로컬파트 (@ 앞부분)
+    phones: 차단할 전화번호 (정규화된 형식)
+    """
+
+    def __init__(self, domains=(), locals=(), phones=()):
+        self.domains = frozenset(d.lower() for d in domains)
+        self.locals = frozenset(l.lower() for l in locals)
+        self.phones = frozenset(phones)
+
+    def extend(self, domains=(), locals=(), phones=()):
+        return Blocklist(self.domains | set(domains), self.locals | set(locals), self.phones | set(phones))
+
+    def blocks_email(self, email):
+        local, _, domain = email.lower().partition('@')
+        if local in self.locals:
+            return True
+        if domain.rsplit('.', 1)[-1] in FILE_EXTENSIONS:
+            return True
+        # 도메인과 상위 도메인 확인 (a.b.co.kr → a.b.co.kr, b.co.kr, co.kr, kr)
+        labels = domain.split('.')
+        return any('.'.join(labels[i:]) in self.domains for i in range(len(labels)))
+
+    def blocks_phone(self, phone):
+        return phone in self.phones
+
+
+COMMON_BLOCKLIST = Blocklist(
+    domains={'example.com', 'example.co.kr', 'example.org', 'test.com', 'domain.com', 'email.com',
+             'sentry.io', 'sentry-next.wixpress.com'},
+    locals={'noreply', 'no-reply', 'donotreply', 'do-not-reply', 'mailer-daemon', 'test', 'example',
+            'your', 'youremail', 'name', 'email', 'user', 'abc'},
+)
+
+SARAMIN_BLOCKLIST = COMMON_BLOCKLIST.extend(
+    domains={'saramin.co.kr'},
+    locals={'help'},
+    phones={'02-6226-5000', '02-6937-0039'},  # 사람인 고객센터
+)
+
+WANTED_BLOCKLIST = COMMON_BLOCKLIST.extend(
+    domains={'wanted.co.kr', 'wantedlab.com', 'wix.com', 'wixpress.com', 'cafe24.com', 'cafe24corp.com'},
+)
+
+
+class ContactExtractor:
+    def __init__(self, blocklist=COMMON_BLOCKLIST):
+        self.blocklist = blocklist
+
+    def extract(self, text, max_emails=None, max_phones=None):
+        """
+        텍스트에서 이메일/전화번호 추출 (등장 순서대로, 중복 제거)
+        반환: {'emails': [...], 'phones': [...]}
+        """
+        text = text or ''
+        emails = {}
+        phones = {}
+        for match in CONTACT_RE.finditer(text):
+            start = match.start()
+
+            if match.group() == '@':
+                # @ 앞뒤로 로컬파트/도메인 확장
+                local = _EMAIL_LOCAL_RE.search(text, max(0, start - 64), start)
+                domain = _EMAIL_DOMAIN_RE.match(text, start + 1)
+                if not local or not domain:
+                    continue
+                email = text[local.start():domain.end()]
+                key = email.lower()
+                if key not in emails and not self.blocklist.blocks_email(email):
+                    emails[key] = email
+                continue
+
+            # 더 긴 숫자열의 일부 (사업자번호 등)
+            if start and text[start - 1].isdigit():
+                continue
+
+            phone = normalize_phone(match.group())
+            if phone and phone not in phones and not self.blocklist.blocks_phone(phone):
+                phones[phone] = phone
+
+        return {
+            'emails': list(emails.values())[:max_emails],
+            'phones': list(phones.values())[:max_phones],
+        }
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+HTML 파서 백엔드 (텍스트 추출, CSS 선택, 링크 수집 공용)
+- selectolax(lexbor) > lxml > BeautifulSoup(html.parser) 순으로 설치된 것을 사용 (HTML_PARSER='auto')
+- 어느 백엔드든 결과는 BeautifulSoup get_text(separator=' ', strip=True)와 같도록 맞춤
+  (script/style/template 내용과 주석은 제외)
+- selectolax/lxml은 선택 설치 (pip install selectolax 또는 pip install lxml cssselect)
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import HTML_PARSER
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+    import lxml.etree
+    import cssselect  # noqa: F401 (lxml의 cssselect()에 필요)
+except ImportError:
+    lxml = None
+
+from bs4 import BeautifulSoup
+
+BACKENDS = ('selectolax', 'lxml', 'bs4')
+_SKIP_TAGS = ('script', 'style', 'template')
+
+
+def available_backends():
+    available = []
+    if LexborHTMLParser is not None:
+        available.append('selectolax')
+    if lxml is not None:
+        available.append('lxml')
+    available.append('bs4')
+    return available
+
+
+def resolve_backend(name=None):
+    """백엔드 이름 확인 ('auto'면 설치된 것 중 가장 빠른 것)"""
+    name = name or HTML_PARSER
+    available = available_backends()
+    if name == 'auto':
+        return available[0]
+    if name not in available:
+        raise ValueError(f"HTML 파서 백엔드 '{name}'를 사용할 수 없습니다 (사용 가능: {', '.join(available)})")
+    return name
+
+
+# --- BeautifulSoup (기본, 추가 설치 없음) ---
+
+class _SoupNode:
+    def __init__(self, tag):
+        self._tag = tag
+
+    def text(self, separator=' '):
+        return self._tag.get_text(separator=separator, strip=True)
+
+    def attr(self, name, default=None):
+        value = self._tag.get(name, default)
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def select(self, selector):
+        return [_SoupNode(t) for t in self._tag.select(selector)]
+
+    def select_one(self, selector):
+        tag = self._tag.select_one(selector)
+        return _SoupNode(tag) if tag is not None else None
+
+
+def _parse_bs4(html):
+    return _SoupNode(BeautifulSoup(html, 'html.parser'))
+
+
+# --- selectolax (lexbor) ---
+
+class _LexborNode:
+    def __init__(self, node):
+        self._node = node
+
+    def text(self, separator=' '):
+        return self._node.text(separator=separator, strip=True)
+
+    def attr(self, name, default=None):
+        value = self._node.attributes.get(name, default)
+        return default if value is None else value
+
+    def select(self, selector):
+        return [_LexborNode(n) for n in self._node.css(selector)]
+
+    def select_one(self, selector):
+        node = self._node.css_first(selector)
+        return _LexborNode(node) if node is not None else None
+
+
+class _LexborDocument(_LexborNode):
+    def __init__(self, tree):
+        self._tree = tree
+        super().__init__(tree.root)
+
+    def text(self, separator=' '):
+        return self._node.text(separator=separator, strip=True) if self._node is not None else ''
+
+    def select(self, selector):
+        return [_LexborNode(n) for n in self._tree.css(selector)]
+
+    def select_one(self, selector):
+        node = self._tree.css_first(selector)
+        return _LexborNode(node) if node is not None else None
+
+
+def _parse_selectolax(html):
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(list(_SKIP_TAGS))
+    return _LexborDocument(tree)
+
+
+# --- lxml ---
+
+class _LxmlNode:
+    def __init__(self, element):
+        self._el = element
+
+    def text(self, separator=' '):
+        return separator.join(s.strip() for s in self._el.itertext() if s.strip())
+
+    def attr(self, name, default=None):
+        return self._el.get(name, default)
+
+    def select(self, selector):
+        return [_LxmlNode(e) for e in self._el.cssselect(selector)]
+
+    def select_one(self, selector):
+        found = self._el.cssselect(selector)
+        return _LxmlNode(found[0]) if found else None
+
+
+def _parse_lxml(html):
+    if not html or not html.strip():
+        html = '<html></html>'
+    try:
+        root = lxml.html.document_fromstring(html)
+    except ValueError:
+        # XML 선언(encoding=...)이 있는 문자열은 바이트로 파싱
+        root = lxml.html.document_fromstring(html.encode('utf-8'))
+    lxml.etree.strip_elements(root, *_SKIP_TAGS, with_tail=False)
+    return _LxmlNode(root)
+
+
+_PARSERS = {
+    'selectolax': _parse_selectolax,
+    'lxml': _parse_lxml,
+    'bs4': _parse_bs4,
+}
+
+
+def parse_html(html, backend=None):
+    """
+    HTML 파싱 후 문서 반환
+    문서/요소 공통: text(separator=' '), attr(name), select(css), select_one(css)
+    """
+    return _PARSERS[resolve_backend(backend)](html or '')
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+HTML 파싱/연락처 추출 프로세스 풀
+- workers=0이면 지금처럼 이벤트 루프에서 바로 파싱
+- workers>0이면 응답 본문(bytes)을 프로세스 풀로 보내 디코딩+파싱+추출하고 결과 dict만 돌려받음
+  (파싱이 수집 루프와 GIL을 두고 경쟁하지 않도록)
+- 풀에서 실행할 함수는 모듈 최상위 함수여야 함 (pickle 가능)
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from requests.compat import chardet
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import PARSE_WORKERS
+
+
+def decode_body(content, encoding=None):
+    """requests의 response.text와 같은 방식으로 본문 디코딩"""
+    if not content:
+        return ''
+    if encoding is None:
+        encoding = chardet.detect(content)['encoding'] or 'utf-8'
+    try:
+        return str(content, encoding, errors='replace')
+    except (LookupError, TypeError):
+        return str(content, errors='replace')
+
+
+def _call(func, content, encoding, args):
+    """워커 프로세스에서 실행: 디코딩 후 파싱 함수 호출"""
+    return func(decode_body(content, encoding), *args)
+
+
+class ParsePool:
+    def __init__(self, workers=PARSE_WORKERS):
+        self.workers = max(0, workers)
+        self._executor = None
+        self.stats = {'jobs': 0, 'bytes': 0}
+
+    @property
+    def executor(self):
+        if self._executor is None and self.workers:
+            # 수집 스레드가 있는 상태에서 fork하지 않도록 spawn 사용 (Windows와 동일)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    async def parse(self, func, response, *args):
+        """
+        func(html, *args)를 실행하고 결과 반환
+        response: requests.Response (풀 모드에서는 content/encoding만 전달)
+        """
+        self.stats['jobs'] += 1
+        if not self.workers:
+            return func(response.text, *args)
+
+        content = response.content
+        self.stats['bytes'] += len(content)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _call, func, content, response.encoding, args)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
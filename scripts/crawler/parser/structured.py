@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+HTML에 들어 있는 구조화 데이터에서 연락처 추출 (브라우저 렌더링 없이)
+- JSON-LD (<script type="application/ld+json">, Organization.email/telephone/address 등)
+- JSON 스크립트 (Next.js __NEXT_DATA__, Nuxt 3 __NUXT_DATA__ 등 type="application/json")
+- 인라인 상태 (window.__NUXT__, __INITIAL_STATE__, __PRELOADED_STATE__, __APOLLO_STATE__ 등)
+  JSON으로 읽히면 JSON으로, 아니면(Nuxt 2의 함수 호출 등) "email": "..." 형태만 정규식으로
+- 마이크로데이터 (itemprop="email"/"telephone"), OpenGraph (og:email, og:phone_number)
+React/Next 등 SPA는 화면 텍스트가 비어 있고 연락처가 스크립트 안에만 있는 경우가 많음
+(문서 텍스트 추출은 script 내용을 제외하므로 여기서 따로 찾음)
+"""
+import re
+import json
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser.html_doc import parse_html
+
+_SCRIPT_RE = re.compile(r'<script\b([^>]*)>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+_JSON_TYPE_RE = re.compile(r'type\s*=\s*["\']?application/(?:ld\+)?json', re.IGNORECASE)
+_STATE_RE = re.compile(
+    r'(?:window\.|self\.)?(__NUXT__|__INITIAL_STATE__|__PRELOADED_STATE__|__APOLLO_STATE__|__REDUX_STATE__'
+    r'|__INITIAL_DATA__|__APP_STATE__)\s*=\s*'
+)
+# JSON이 아닌 스크립트에서 "email": "..." / phone: '...' 형태
+_KEY_VALUE_RE = re.compile(
+    r'["\']?([A-Za-z_]*(?:[Ee]mail|[Pp]hone|[Tt]elephone|[Tt]el(?:No)?|[Cc]ontactNumber))["\']?\s*:\s*'
+    r'["\']([^"\'\\]{5,80})["\']'
+)
+
+# JSON 키 (소문자, 영문/숫자만 남긴 값)
+_PHONE_KEYS = {'tel', 'telno', 'telnumber', 'contactnumber', 'callnumber', 'mobile'}
+_ADDRESS_PARTS = ('streetAddress', 'addressLocality', 'addressRegion', 'postalCode')
+_ORG_TYPES = {'organization', 'corporation', 'localbusiness', 'store', 'ngo', 'educationalorganization',
+              'professionalservice'}
+
+MAX_NODES = 50000  # 블롭 하나에서 방문할 최대 노드 수 (큰 상태 객체 대비)
+SUMMARY_LIMIT = 1000  # 요약 텍스트 최대 길이
+
+
+def _key(name):
+    return re.sub(r'[^a-z0-9]', '', str(name).lower())
+
+
+def _is_email_key(key):
+    return key.endswith('email') or key == 'mail'
+
+
+def _is_phone_key(key):
+    return 'fax' not in key and ('phone' in key or key in _PHONE_KEYS)
+
+
+class _Collector:
+    """JSON 값에서 이메일/전화번호 후보와 기업명/주소 수집"""
+
+    def __init__(self):
+        self.email_values = []
+        self.phone_values = []
+        self.names = []
+        self.addresses = []
+
+    def walk(self, data):
+        stack = [(None, data)]
+        visited = 0
+        while stack and visited < MAX_NODES:
+            key, value = stack.pop()
+            visited += 1
+            if isinstance(value, dict):
+                self._organization(value)
+                stack.extend((_key(k), v) for k, v in reversed(list(value.items())))
+            elif isinstance(value, list):
+                stack.extend((key, v) for v in reversed(value))
+            elif isinstance(value, str):
+                self.value(key, value)
+
+    def value(self, key, value):
+        value = value.strip()
+        if not value:
+            return
+        if key and _is_phone_key(key):
+            self.phone_values.append(value)
+        elif '@' in value and (_is_email_key(key or '') or len(value) < 200):
+            # 키 이름과 상관없이 @가 있는 짧은 문자열은 이메일 후보 (검증은 ContactExtractor가)
+            self.email_values.append(value)
+
+    def _organization(self, item):
+        """JSON-LD Organization 계열의 기업명/주소"""
+        types = item.get('@type')
+        types = types if isinstance(types, list) else [types]
+        if not any(isinstance(t, str) and t.lower() in _ORG_TYPES for t in types):
+            return
+        if isinstance(item.get('name'), str) and item['name'].strip():
+            self.names.append(item['name'].strip())
+        address = item.get('address')
+        if isinstance(address, dict):
+            address = ' '.join(str(address[part]) for part in _ADDRESS_PARTS if address.get(part))
+        if isinstance(address, str) and address.strip():
+            self.addresses.append(address.strip())
+
+
+def _load_json(text):
+    """JSON 문자열 (앞뒤 공백/세미콜론, HTML 주석 허용), 읽을 수 없으면 None"""
+    text = text.strip().strip(';').strip()
+    if text.startswith('<!--'):
+        text = text[4:].rsplit('-->', 1)[0]
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def _state_value(script):
+    """window.__X__ = {...} 형태에서 JSON 객체 (JSON이 아니면 None)"""
+    match = _STATE_RE.search(script)
+    if not match:
+        return None
+    try:
+        return json.JSONDecoder().raw_decode(script, match.end())[0]
+    except ValueError:
+        return None
+
+
+def extract_structured(html, extractor, doc=None):
+    """
+    구조화 데이터의 연락처/기업 정보
+    extractor: ContactExtractor (차단 목록/전화번호 정규화), doc: 이미 파싱한 문서 (없으면 파싱)
+    반환: {'emails', 'phones', 'name', 'address', 'sources', 'text'}
+    sources: 연락처를 찾은 형식 ('json-ld', 'json', 'state', 'microdata', 'opengraph')
+    text: AI 파싱 입력에 붙일 요약 (기업명/주소/연락처, 없으면 빈 문자열)
+    """
+    html = html or ''
+    found = {}  # 형식 -> _Collector
+
+    if '<script' in html or '<SCRIPT' in html:
+        for match in _SCRIPT_RE.finditer(html):
+            attrs, script = match.group(1), match.group(2)
+            if not script.strip() or 'src=' in attrs.lower():
+                continue
+            if _JSON_TYPE_RE.search(attrs):
+                data = _load_json(script)
+                if data is not None:
+                    kind = 'json-ld' if 'ld+json' in attrs.lower() else 'json'
+                    found.setdefault(kind, _Collector()).walk(data)
+                continue
+            if not _STATE_RE.search(script):
+                continue
+            collector = found.setdefault('state', _Collector())
+            data = _state_value(script)
+            if data is not None:
+                collector.walk(data)
+            else:
+                for key, value in _KEY_VALUE_RE.findall(script):
+                    collector.value(_key(key), value)
+
+    doc = doc if doc is not None else parse_html(html)
+    for kind, selector in (('microdata', '[itemprop="email"], [itemprop="telephone"]'),
+                           ('opengraph', 'meta[property="og:email"], meta[property="og:phone_number"]')):
+        for node in doc.select(selector):
+            key = 'telephone' if 'phone' in (node.attr('itemprop') or node.attr('property') or '') else 'email'
+            value = node.attr('content') or node.attr('href') or node.text()
+            if value:
+                value = re.sub(r'^(?:mailto|tel):', '', value.strip(), flags=re.IGNORECASE)
+                found.setdefault(kind, _Collector()).value(key, value)
+
+    emails, phones, names, addresses, sources = [], [], [], [], []
+    for kind, collector in found.items():
+        new_emails = [e for e in extractor.extract(' '.join(collector.email_values))['emails'] if e not in emails]
+        # 전화번호는 값마다 따로 확인 (이어 붙이면 숫자끼리 붙어 다른 번호로 읽힐 수 있음)
+        new_phones = []
+        for value in collector.phone_values:
+            new_phones += [p for p in extractor.extract(value)['phones'] if p not in phones + new_phones]
+        if new_emails or new_phones:
+            sources.append(kind)
+        emails += new_emails
+        phones += new_phones
+        names += [n for n in collector.names if n not in names]
+        addresses += [a for a in collector.addresses if a not in addresses]
+
+    summary = ' '.join(filter(None, [
+        names[0] if names else '',
+        addresses[0] if addresses else '',
+        ' '.join(emails[:5]),
+        ' '.join(phones[:5]),
+    ]))
+    return {
+        'emails': emails,
+        'phones': phones,
+        'name': names[0] if names else None,
+        'address': addresses[0] if addresses else None,
+        'sources': sources,
+        'text': summary[:SUMMARY_LIMIT],
+    }
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+단계별 수집 파이프라인
+목록 수집 → 상세 → 웹사이트 → 추출 → AI 파싱 → 저장
+- 각 단계는 제한된 크기의 큐로 연결 (앞 단계가 너무 앞서가지 않도록 backpressure)
+- 단계별 워커 수를 따로 지정
+- 단계별 처리량/큐 깊이/처리 시간 분위수(p50/p95/p99) 통계 제공
+"""
+import time
+import asyncio
+import logging
+
+from metrics import registry
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()  # 종료 신호
+
+
+def percentile(values, pct):
+    """정렬된 값 목록의 분위수 (최근접 순위)"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+
+class StageStats:
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.pipeline = None  # 지표 라벨 (Pipeline이 지정)
+        self.processed = 0  # 다음 단계로 넘긴 건수
+        self.dropped = 0  # 핸들러가 None을 반환 (스킵)
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.latencies = []  # 핸들러 호출 1회당 처리 시간 (배치 단계는 배치 단위)
+        self.started_at = None
+        self.finished_at = None
+        self.max_depth = 0
+        self._depth_sum = 0
+        self._depth_samples = 0
+
+    def sample_depth(self, depth):
+        self.max_depth = max(self.max_depth, depth)
+        self._depth_sum += depth
+        self._depth_samples += 1
+
+    def record_latency(self, seconds):
+        self.busy_seconds += seconds
+        self.latencies.append(seconds)
+        registry.observe('stage_seconds', seconds, pipeline=self.pipeline, stage=self.name)
+
+    def to_dict(self):
+        latencies = sorted(self.latencies)
+        elapsed = (self.finished_at or time.monotonic()) - (self.started_at or time.monotonic())
+        handled = self.processed + self.dropped + self.errors
+        return {
+            'stage': self.name,
+            'workers': self.workers,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'elapsed': round(elapsed, 2),
+            'busy_seconds': round(self.busy_seconds, 2),
+            'throughput': round(handled / elapsed, 3) if elapsed > 0 else 0.0,
+            'max_queue_depth': self.max_depth,
+            'avg_queue_depth': round(self._depth_sum / self._depth_samples, 2) if self._depth_samples else 0.0,
+            'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+        }
+
+
+class Stage:
+    """
+    파이프라인 단계
+    handler: async 함수 (item -> 다음 단계로 넘길 item, None이면 스킵)
+    AI/DB 요청처럼 블로킹되는 작업은 핸들러 안에서 asyncio.to_thread로 실행
+    """
+
+    def __init__(self, name, handler, workers=1, queue_size=20):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.stats = StageStats(name, self.workers)
+        self.queue = None
+
+    async def _worker(self, output, on_error):
+        while True:
+            item = await self.queue.get()
+            self.stats.sample_depth(self.queue.qsize())
+            if item is _DONE:
+                return
+
+            started = time.monotonic()
+            try:
+                result = await self.handler(item)
+            except Exception as e:
+                self.stats.errors += 1
+                if on_error:
+                    on_error(self.name, item, e)
+                continue
+            finally:
+                self.stats.record_latency(time.monotonic() - started)
+
+            if result is None:
+                self.stats.dropped += 1
+                continue
+
+            self.stats.processed += 1
+            if output is not None:
+                await output.put(result)
+
+    async def run(self, output, on_error=None):
+        self.stats.started_at = time.monotonic()
+        await asyncio.gather(*(self._worker(output, on_error) for _ in range(self.workers)))
+        self.stats.finished_at = time.monotonic()
+
+
+class BatchStage(Stage):
+    """
+    여러 건을 모아서 처리하는 단계 (AI 배치 요청 등)
+    handler: async 함수 (items 리스트 -> 다음 단계로 넘길 item 리스트)
+    batch_size만큼 모이거나 batch_wait초가 지나면 처리
+    flush_now: 인자 없는 함수, True를 반환하면 더 모으지 않고 바로 처리 (목표 근처에서 배치를 기다리지 않도록)
+    """
+
+    def __init__(self, name, handler, workers=1, queue_size=20, batch_size=8, batch_wait=2.0, flush_now=None):
+        super().__init__(name, handler, workers=workers, queue_size=queue_size)
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.flush_now = flush_now
+
+    async def _next_batch(self):
+        """배치 하나를 모음, 종료 신호를 받으면 (배치, True) 반환"""
+        item = await self.queue.get()
+        self.stats.sample_depth(self.queue.qsize())
+        if item is _DONE:
+            return [], True
+
+        batch = [item]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            if self.flush_now and self.flush_now():
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _worker(self, output, on_error):
+        done = False
+        while not done:
+            batch, done = await self._next_batch()
+            if not batch:
+                continue
+
+            started = time.monotonic()
+            try:
+                results = await self.handler(batch)
+            except Exception as e:
+                self.stats.errors += len(batch)
+                if on_error:
+                    for item in batch:
+                        on_error(self.name, item, e)
+                continue
+            finally:
+                self.stats.record_latency(time.monotonic() - started)
+
+            results = [r for r in results if r is not None]
+            self.stats.dropped += len(batch) - len(results)
+            self.stats.processed += len(results)
+            if output is not None:
+                for result in results:
+                    await output.put(result)
+
+
+class Pipeline:
+    """
+    producer: async 함수 (emit) - emit(item)으로 첫 단계에 작업을 넣음
+    emit은 큐가 가득 차면 대기하므로 목록 수집도 하위 단계 속도에 맞춰짐
+    """
+
+    def __init__(self, name, producer, stages, on_error=None, report_interval=30):
+        self.name = name
+        self.producer = producer
+        self.stages = stages
+        self.on_error = on_error
+        self.report_interval = report_interval
+        self.discovery = StageStats('discovery', 1)
+        for stats in [self.discovery] + [s.stats for s in stages]:
+            stats.pipeline = name
+
+    async def _produce(self, first_queue):
+        async def emit(item):
+            await first_queue.put(item)
+            self.discovery.processed += 1
+            self.discovery.sample_depth(first_queue.qsize())
+
+        self.discovery.started_at = time.monotonic()
+        try:
+            await self.producer(emit)
+        except Exception as e:
+            self.discovery.errors += 1
+            if self.on_error:
+                self.on_error('discovery', None, e)
+        finally:
+            self.discovery.finished_at = time.monotonic()
+            self.discovery.busy_seconds = self.discovery.finished_at - self.discovery.started_at
+
+    async def _run_stage(self, index):
+        stage = self.stages[index]
+        output = self.stages[index + 1].queue if index + 1 < len(self.stages) else None
+        await stage.run(output, self.on_error)
+        if output is not None:
+            for _ in range(self.stages[index + 1].workers):
+                await output.put(_DONE)
+
+    async def _monitor(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            depths = ', '.join(f"{s.name}={s.queue.qsize()}" for s in self.stages)
+            logger.info(f"[{self.name}] 큐 깊이: {depths}")
+
+    async def run(self):
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=stage.queue_size)
+
+        stage_tasks = [asyncio.create_task(self._run_stage(i)) for i in range(len(self.stages))]
+        monitor = asyncio.create_task(self._monitor()) if self.report_interval else None
+
+        await self._produce(self.stages[0].queue)
+        for _ in range(self.stages[0].workers):
+            await self.stages[0].queue.put(_DONE)
+
+        await asyncio.gather(*stage_tasks)
+        if monitor:
+            monitor.cancel()
+        return self.stats()
+
+    def stats(self):
+        return [self.discovery.to_dict()] + [s.stats.to_dict() for s in self.stages]
+
+    def log_stats(self):
+        for s in self.stats():
+            logger.info(
+                f"  [{s['stage']}] 처리 {s['processed']} / 스킵 {s['dropped']} / 오류 {s['errors']}"
+                f" | {s['throughput']}건/초 | 큐 최대 {s['max_queue_depth']}, 평균 {s['avg_queue_depth']}"
+                f" | p50 {s['p50_ms']}ms, p95 {s['p95_ms']}ms"
+            )
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+소스 스케줄러 (여러 소스 동시 수집)
+- 전체 목표: 이메일이 있어 저장된 기업 수 (소스별로 미리 나누지 않음)
+- 소스별로 수집 중인 기업 수(목록에서 꺼내 상세/웹사이트를 받는 중인 기업)를 제한하고,
+  한도는 소스별 초당 수확량(저장 수 / 상세·웹사이트 수집에 쓴 시간)에 비례해 배분
+  (소스마다 SCHEDULER_MIN_IN_FLIGHT는 보장해서 수확량이 낮은 소스도 계속 측정)
+- 수집이 끝나고 AI 파싱을 기다리는 기업은 전환율(저장/처리 완료)만큼, 이메일이 있어 저장 단계로 넘어간 기업은
+  모두 저장될 것으로 보고, 예상 저장 수가 목표에 닿으면 새 기업을 넣지 않음 → 목표를 크게 넘겨 수집하지 않음
+  (저장은 STORAGE_BULK_SIZE건/STORAGE_FLUSH_INTERVAL초마다 한 번이라 저장 결과만 보면 늦게 멈춤)
+- 저장 대기를 포함해 목표를 채우면 목록 수집을 끝냄 (저장 단계가 배치를 기다리지 않고 바로 저장하도록)
+- 소스마다 처음 SCHEDULER_MIN_IN_FLIGHT건은 목표와 상관없이 투입 (늦게 시작한 소스도 측정되도록)
+- 목록이 끝난 소스의 몫은 나머지 소스가 나눠 가짐
+"""
+import time
+import asyncio
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import SCHEDULER_MAX_IN_FLIGHT, SCHEDULER_MIN_IN_FLIGHT, SCHEDULER_PRIOR_SECONDS
+
+
+class SourceScheduler:
+    """
+    admit(): 목록 단계에서 기업을 파이프라인에 넣기 전에 호출 (한도가 찰 때까지 대기, 목표 달성 시 False)
+    release(): 상세/웹사이트 수집이 끝나면 호출 (수집 슬롯 반환)
+    near_target(): AI 배치 단계가 목표 근처에서 배치를 기다리지 않고 바로 처리할지
+    queue(): 이메일이 있어 저장 단계로 넘길 때 호출 (저장 결과가 나올 때까지 저장된 것으로 예상)
+    finish(): 기업 처리 결과가 정해지면 호출 (saved=True면 목표에 반영)
+    이벤트 루프 스레드에서만 호출 (잠금 없음)
+    """
+
+    def __init__(self, target, sources, max_in_flight=SCHEDULER_MAX_IN_FLIGHT, min_in_flight=SCHEDULER_MIN_IN_FLIGHT):
+        self.target = target
+        self.max_in_flight = max(1, max_in_flight)
+        self.min_in_flight = max(1, min_in_flight)
+        self.saved = 0
+        self.queued = 0  # 저장 단계에서 저장을 기다리는 기업 수
+        self.finished = 0
+        self._sources = {name: {'admitted': 0, 'in_flight': 0, 'pending': 0, 'finished': 0, 'saved': 0,
+                                'seconds': 0.0, 'active': True} for name in sources}
+        # id(기업) -> {'company', 'source', 'started_at', 'released', 'queued'}
+        # (기업 dict를 같이 보관해 처리 결과가 나오기 전에 다른 기업이 같은 id를 받지 않도록)
+        self._items = {}
+        self._changed = asyncio.Event()
+
+    def projected(self):
+        """저장 수 + 저장 대기 수 + 수집/AI 파싱 중인 기업 중 저장될 것으로 예상되는 수"""
+        # 저장 대기는 저장된 것으로 (저장 결과보다 스킵이 먼저 기록되어 전환율이 낮게 잡히지 않도록)
+        # 처리 결과가 없을 때는 모두 저장된다고 보고 시작 (초반에 목표보다 많이 넣지 않도록)
+        conversion = (self.saved + self.queued + 1) / (self.finished + self.queued + 1)
+        waiting = sum(state['in_flight'] + state['pending'] for state in self._sources.values())
+        return self.saved + self.queued + waiting * conversion
+
+    def near_target(self, margin):
+        """예상 저장 수가 목표까지 margin건 이내 (배치 단계가 배치를 다 채우기를 기다리지 않도록)"""
+        return self.target - self.projected() <= margin
+
+    def _weight(self, state):
+        # 수확량이 아직 없는 소스도 같은 출발선에서 시작하도록 사전값(저장 1건 / SCHEDULER_PRIOR_SECONDS초)
+        return (state['saved'] + 1) / (state['seconds'] + SCHEDULER_PRIOR_SECONDS)
+
+    def allowance(self, source):
+        """이 소스가 지금 동시에 수집할 수 있는 기업 수"""
+        active = {name: state for name, state in self._sources.items() if state['active']}
+        if source not in active:
+            return 0
+        weights = {name: self._weight(state) for name, state in active.items()}
+        share = self.max_in_flight * weights[source] / sum(weights.values())
+        return max(self.min_in_flight, round(share))
+
+    async def admit(self, source, company):
+        """
+        기업을 처리 시작해도 되면 True (한도가 차 있거나 예상 저장 수가 목표에 닿았으면 대기)
+        저장 수 + 저장 대기 수가 목표를 채우면 False (소스마다 처음 min_in_flight건은 목표와 상관없이 투입)
+        """
+        state = self._sources[source]
+        while True:
+            warmup = state['admitted'] < self.min_in_flight
+            if not warmup and self.saved + self.queued >= self.target:
+                return False
+            if state['in_flight'] < self.allowance(source) and (warmup or self.projected() < self.target):
+                state['in_flight'] += 1
+                state['admitted'] += 1
+                self._items[id(company)] = {'company': company, 'source': source, 'started_at': time.monotonic(),
+                                            'released': False, 'queued': False}
+                return True
+            self._changed.clear()
+            await self._changed.wait()
+
+    def release(self, company):
+        """상세/웹사이트 수집 완료 (수집에 쓴 시간을 수확량 계산에 반영)"""
+        item = self._items.get(id(company))
+        if item is None or item['released']:
+            return
+        item['released'] = True
+        state = self._sources[item['source']]
+        state['in_flight'] -= 1
+        state['pending'] += 1
+        state['seconds'] += time.monotonic() - item['started_at']
+        self._changed.set()
+
+    def queue(self, company):
+        """저장 단계로 넘김 (이메일이 있는 기업, 저장 결과가 나올 때까지 저장될 것으로 예상)"""
+        self.release(company)
+        item = self._items.get(id(company))
+        if item is None or item['queued']:
+            return
+        item['queued'] = True
+        self._sources[item['source']]['pending'] -= 1
+        self.queued += 1
+        self._changed.set()
+
+    def finish(self, company, saved=False):
+        """기업 처리 결과 기록 (admit하지 않은 기업이나 두 번째 호출은 무시)"""
+        self.release(company)
+        item = self._items.pop(id(company), None)
+        if item is None:
+            return
+        state = self._sources[item['source']]
+        if item['queued']:
+            self.queued -= 1
+        else:
+            state['pending'] -= 1
+        state['finished'] += 1
+        self.finished += 1
+        if saved:
+            state['saved'] += 1
+            self.saved += 1
+        self._changed.set()
+
+    def close(self, source):
+        """목록이 끝난 소스 (남은 몫을 다른 소스에 배분)"""
+        self._sources[source]['active'] = False
+        self._changed.set()
+
+    def stats(self):
+        """소스별 {'admitted', 'finished', 'saved', 'yield_per_sec'} (yield_per_sec: 수집 1초당 저장 수)"""
+        return {
+            name: {
+                'admitted': state['admitted'],
+                'finished': state['finished'],
+                'saved': state['saved'],
+                'yield_per_sec': round(state['saved'] / state['seconds'], 4) if state['seconds'] else 0.0,
+            }
+            for name, state in self._sources.items()
+        }
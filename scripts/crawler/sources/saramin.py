@@ -3,94 +3,291 @@
 사람인 크롤러
 기업 정보 및 연락처 수집
 """
-import time
+import asyncio
+import math
 import random
 import re
-import requests
-from bs4 import BeautifulSoup
+from collections import deque
 from urllib.parse import urljoin
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import CRAWL_DELAY, USER_AGENTS, MAX_RETRIES
+from config import (
+    USER_AGENTS, COLLECT_CONCURRENCY, SARAMIN_DETAIL_FAST, SARAMIN_DETAIL_PREFIX,
+    SARAMIN_LIST_PREFETCH, SARAMIN_LIST_PAGE_SIZE, SARAMIN_LIST_MAX_PAGES,
+)
+from net.fetcher import Fetcher
+from parser.extractor import ContactExtractor, SARAMIN_BLOCKLIST
+from parser.html_doc import parse_html
+from parser.parse_pool import ParsePool
+from sources.stream import stream_companies, iterate_sync
+from sources.website import WebsiteCrawler, FOOTER_SELECTOR
+
+
+# 기업명 h1에 붙어 나오는 탭/건수 텍스트
+NAME_NOISE_RE = re.compile(r'기업정보.*$|채용중\d*|현직자\s*인터뷰\d*|전체보기\d*|\d+건.*$')
+INDUSTRY_RE = re.compile(r'업종[:\s]*([가-힣\s/]+?)(?:\s|$|<)')
+INFO_SELECTOR = '.info_item, .company_info dt, .company_info dd, .info_list li'
+INDUSTRY_SELECTOR = '.industry, .company_industry, [class*="industry"]'
+RAW_TEXT_LIMIT = 5000  # AI 파싱용 본문 길이
+# FOOTER_SELECTOR의 #footer, .footer 시작 태그 (빠른 파싱에서 <footer가 없을 때 푸터 위치)
+FOOTER_CONTAINER_RE = re.compile(
+    r'<[a-z][a-z0-9]*\s[^>]*?(?:\bid\s*=\s*["\']?footer[\s"\'>]|\bclass\s*=\s*["\'](?:[^"\']*\s)?footer[\s"\'])',
+    re.IGNORECASE,
+)
+
+
+def _detail_fields(doc, info):
+    """기업명/홈페이지/업종/주소 (문서 전체든 앞부분이든 같은 방식)"""
+    # 기업명 (h1이 가장 정확)
+    name_elem = doc.select_one('h1')
+    if name_elem:
+        info['name'] = NAME_NOISE_RE.sub('', name_elem.text(separator='')).strip()
+
+    # 기업 정보 테이블/리스트에서 추출
+    for item in doc.select(INFO_SELECTOR):
+        text = item.text(separator='')
+
+        # 홈페이지
+        if '홈페이지' in text or 'http' in text:
+            link = item.select_one('a')
+            if link:
+                info['website'] = link.attr('href')
+
+        # 업종
+        if '업종' in text:
+            info['industry_text'] = text.replace('업종', '').strip()
+
+        # 주소
+        if '주소' in text or '서울' in text or '경기' in text:
+            info['address'] = text
+
+    # 링크에서 홈페이지 찾기
+    for link in doc.select('a[href^="http"]'):
+        href = link.attr('href', '')
+        if href and 'saramin' not in href and 'naver' not in href and 'google' not in href:
+            if not info.get('website'):
+                info['website'] = href
+            break
+
+    # 업종
+    industry_elem = doc.select_one(INDUSTRY_SELECTOR)
+    if industry_elem:
+        info['industry_text'] = industry_elem.text(separator='')
+
+
+def _contact_fields(text, extractor, info):
+    """본문 텍스트에서 연락처/업종 (사람인 관련 이메일/전화 제외)"""
+    contacts = extractor.extract(text, max_emails=3, max_phones=3)
+    info['emails'] = contacts['emails']
+    info['phones'] = contacts['phones']
+
+    # 업종 텍스트에서 추출 시도
+    industry_match = INDUSTRY_RE.search(text)
+    if industry_match and not info.get('industry_text'):
+        info['industry_text'] = industry_match.group(1).strip()
+
+
+def parse_detail_html(html, extractor):
+    """
+    상세 페이지 HTML 파싱 (기업명, 홈페이지, 업종, 주소, 본문, 연락처)
+    프로세스 풀에서도 실행되므로 모듈 함수로 두고 결과는 dict로 반환
+    """
+    info = {}
+    doc = parse_html(html)
+    _detail_fields(doc, info)
+
+    # 연락처 정보 (전체 텍스트에서)
+    full_text = doc.text()
+    info['raw_text'] = full_text[:RAW_TEXT_LIMIT]  # AI 파싱용
+    _contact_fields(full_text, extractor, info)
+    return info
+
+
+def parse_detail_prefix(html, prefix=SARAMIN_DETAIL_PREFIX):
+    """
+    상세 페이지 앞부분만 파싱 (prefix자부터 두 배씩 늘려가며)
+    기업명(h1), 기업 정보 목록, AI 파싱용 본문 길이가 모두 채워지면 멈춤
+    반환: (문서, 텍스트, 파싱한 길이)
+    """
+    cut = max(1, prefix)
+    while True:
+        doc = parse_html(html[:cut])
+        text = doc.text()
+        if cut >= len(html) or (len(text) >= RAW_TEXT_LIMIT and doc.select_one('h1')
+                                and doc.select_one(INFO_SELECTOR)):
+            return doc, text, min(cut, len(html))
+        cut *= 2
+
+
+def _footer_start(html, start):
+    """start 이후 푸터(FOOTER_SELECTOR) 시작 위치 (<footer는 마지막 것, 없으면 첫 #footer/.footer, 없으면 -1)"""
+    footer_at = html.rfind('<footer')
+    if footer_at >= start:
+        return footer_at
+    match = FOOTER_CONTAINER_RE.search(html, start)
+    return match.start() if match else -1
+
+
+def parse_detail_fast(html, extractor):
+    """
+    상세 페이지 빠른 파싱 (parse_detail_html과 같은 항목)
+    기업명/기업 정보가 있는 앞부분과 푸터만 파싱하고, 리뷰 본문 뒷부분은 건너뜀
+    (뒷부분에만 있는 이메일/전화는 찾지 않음)
+    """
+    info = {}
+    doc, text, parsed = parse_detail_prefix(html)
+    _detail_fields(doc, info)
+    del doc
+
+    # 푸터가 파싱한 범위 밖에 있으면 푸터만 따로 (전체 파싱, 웹사이트 파싱과 같은 footer/#footer/.footer)
+    footer_at = _footer_start(html, parsed)
+    if footer_at >= 0:
+        text = f"{text} {parse_html(html[footer_at:]).text()}"
+
+    info['raw_text'] = text[:RAW_TEXT_LIMIT]  # AI 파싱용
+    _contact_fields(text, extractor, info)
+    return info
 
 
 class SaraminCrawler:
-    def __init__(self, start_page=1):
+    source = 'saramin'
+    max_page = 100  # 이 페이지를 넘으면 처음부터
+    # 상세 페이지 파싱 함수 (프로세스 풀로 보낼 수 있도록 모듈 함수)
+    parse_detail = staticmethod(parse_detail_fast if SARAMIN_DETAIL_FAST else parse_detail_html)
+
+    def __init__(self, start_page=1, limiter=None, dedup=None, frontier=None, http_cache=None, parse_pool=None):
         self.base_url = 'https://www.saramin.co.kr'
         self.review_url = 'https://www.saramin.co.kr/zf_user/company-review'
+        self.frontier = frontier  # 페이지 위치/기업별 상태 기록 (중단 후 이어서 수집)
+        if frontier:
+            start_page = frontier.cursor(self.source, 'review', start_page)
+        if start_page > self.max_page:
+            start_page = 1
         self.start_page = start_page
         self.last_page = start_page
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.fetcher = Fetcher(headers={
             'User-Agent': random.choice(USER_AGENTS),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
             'Referer': 'https://www.saramin.co.kr/',
-        })
+        }, limiter=limiter, retry_delay=5, cache=http_cache)
+        self.session = self.fetcher.session
+        self.extractor = ContactExtractor(SARAMIN_BLOCKLIST)
+        self.dedup = dedup  # 이미 수집한 기업은 목록 단계에서 제외
+        self.parse_pool = parse_pool or ParsePool(workers=0)  # 상세/웹사이트 파싱 (프로세스 풀 선택)
+        self.website_crawler = WebsiteCrawler(self.fetcher, ContactExtractor(), parse_pool=self.parse_pool)
 
-    def _request(self, url, retries=0):
-        """HTTP 요청 (재시도 로직 포함)"""
-        try:
-            delay = CRAWL_DELAY + random.uniform(1, 3)
-            print(f"대기 {delay:.1f}초...")
-            time.sleep(delay)
-
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            return response
-        except Exception as e:
-            if retries < MAX_RETRIES:
-                print(f"재시도 {retries + 1}/{MAX_RETRIES}: {url}")
-                time.sleep(5)
-                return self._request(url, retries + 1)
-            print(f"요청 실패: {e}")
-            return None
+    def _request(self, url):
+        """HTTP 요청 (호스트별 딜레이 + 재시도 로직 포함)"""
+        return self.fetcher.get(url)
+
+    async def _request_async(self, url):
+        """비동기 HTTP 요청 (다른 호스트 요청과 동시에 진행)"""
+        return await self.fetcher.get_async(url)
 
     def get_company_list(self, page=1, limit=50):
         """기업 리뷰 목록에서 기업 링크 수집 (여러 페이지에서)"""
-        companies = []
-        collected_csns = set()
-        current_page = page
-        max_pages = page + 5  # 최대 5페이지까지 순환
-
-        while len(companies) < limit and current_page < max_pages:
-            # 페이지별 URL
-            url = f"{self.review_url}?page={current_page}"
-            print(f"[사람인] 페이지 {current_page} 크롤링 중...")
-
-            response = self._request(url)
-            if not response:
-                current_page += 1
-                continue
-
-            # CSN 코드가 포함된 링크 추출
-            csn_pattern = re.findall(r'/zf_user/company-review/view\?csn=([^"&]+)', response.text)
-            new_csns = [csn for csn in set(csn_pattern) if csn not in collected_csns]
-
-            if not new_csns:
-                print(f"[사람인] 페이지 {current_page}에서 새 기업 없음, 다음 페이지로...")
-                current_page += 1
-                continue
-
-            print(f"[사람인] 페이지 {current_page}에서 {len(new_csns)}개 기업 발견")
-
-            for csn in new_csns:
-                if len(companies) >= limit:
+        return asyncio.run(self.get_company_list_async(page=page, limit=limit))
+
+    async def get_company_list_async(self, page=1, limit=50):
+        """기업 리뷰 목록에서 기업 링크 수집 (비동기)"""
+        return [company async for company in self.iter_company_list(page=page, limit=limit)]
+
+    def _next_page(self, page):
+        return page + 1 if page < self.max_page else 1
+
+    async def iter_company_list(self, page=1, limit=50):
+        """
+        기업 리뷰 목록에서 기업 링크를 찾는 대로 하나씩 반환
+        - 다음 페이지를 SARAMIN_LIST_PREFETCH개까지 미리 요청 (사람인 호스트 딜레이 안에서, 상세 단계가 기다리지 않도록)
+        - 이미 발견/처리한 csn(frontier, 중복 인덱스)은 상세 요청 전에 제외
+        - 읽을 페이지 수는 남은 한도 / 페이지당 새 기업 수(지금까지 평균)로 정하고, 실행당 SARAMIN_LIST_MAX_PAGES까지
+        """
+        found = 0
+        seen_csns = self.frontier.known_ids(self.source) if self.frontier else set()
+        pages_read = 0
+        new_total = 0
+        requested = 0
+        request_page = page
+        prefetched = deque()  # (페이지, 요청 task), 페이지 순서대로 처리
+
+        try:
+            while found < limit:
+                # 남은 한도를 채우는 데 필요한 페이지 수만큼만 미리 요청
+                per_page = max(1.0, new_total / pages_read) if pages_read else SARAMIN_LIST_PAGE_SIZE
+                needed = math.ceil((limit - found) / per_page)
+                while len(prefetched) < min(needed, SARAMIN_LIST_PREFETCH) and requested < SARAMIN_LIST_MAX_PAGES:
+                    url = f"{self.review_url}?page={request_page}"
+                    print(f"[사람인] 페이지 {request_page} 크롤링 중...")
+                    prefetched.append((request_page, asyncio.create_task(self._request_async(url))))
+                    requested += 1
+                    request_page = self._next_page(request_page)
+                if not prefetched:
                     break
-                collected_csns.add(csn)
-                companies.append({
+
+                read_page, task = prefetched.popleft()
+                response = await task
+                pages_read += 1
+                if not response:
+                    # 재시도 후에도 실패한 페이지는 건너뛰지 않고 여기서 멈춤
+                    # (저장된 위치가 이 페이지에 남아 다음 실행에서 다시 읽고, 미리 요청한 뒤 페이지는 취소)
+                    print(f"[사람인] 페이지 {read_page} 요청 실패, 다음 실행에서 이 페이지부터")
+                    self.last_page = read_page
+                    break
+
+                # CSN 코드가 포함된 링크 추출 (페이지 순서 유지)
+                csns = list(dict.fromkeys(re.findall(r'/zf_user/company-review/view\?csn=([^"&]+)', response.text)))
+                next_page = self._next_page(read_page) if csns else 1  # 빈 페이지면 목록 끝 → 다음 실행은 처음부터
+                new_csns = [csn for csn in csns if csn not in seen_csns]
+                seen_csns.update(new_csns)
+                if self.dedup:
+                    new_csns = [csn for csn in new_csns if not self.dedup.seen(self.source, csn)]
+
+                companies = [{
                     'csn': csn,
+                    'source_id': csn,
                     'detail_url': f"{self.base_url}/zf_user/company-review/view?csn={csn}"
-                })
+                } for csn in new_csns]
 
-            current_page += 1
+                # 다음 페이지 위치와 발견한 기업을 함께 기록 (한도를 넘은 기업은 다음 실행에서 처리)
+                if self.frontier:
+                    companies = self.frontier.record_page(self.source, 'review', next_page, companies)
+                self.last_page = next_page  # 다음에 읽을 페이지
+                new_total += len(companies)
 
-        self.last_page = current_page  # 마지막 페이지 저장
-        print(f"[사람인] 총 {len(companies)}개 기업 수집 (마지막 페이지: {current_page})")
-        return companies
+                if not csns:
+                    print(f"[사람인] 페이지 {read_page}에 기업 없음, 목록 끝")
+                    break
+                if not companies:
+                    print(f"[사람인] 페이지 {read_page}에서 새 기업 없음, 다음 페이지로...")
+                    continue
+
+                print(f"[사람인] 페이지 {read_page}에서 {len(companies)}개 기업 발견")
+                for company in companies:
+                    if found >= limit:
+                        break
+                    found += 1
+                    yield company
+        finally:
+            # 한도를 채웠거나 중단되면 미리 요청한 페이지는 취소 (위치가 기록되지 않아 다음 실행에서 다시 읽음)
+            for _, task in prefetched:
+                task.cancel()
+            await asyncio.gather(*(task for _, task in prefetched), return_exceptions=True)
+
+        print(f"[사람인] 총 {found}개 기업 수집 (페이지 {pages_read}개, 다음 페이지: {self.last_page})")
+
+    async def iter_companies(self, limit=50):
+        """파이프라인용 기업 목록 (이전 실행에서 끝내지 못한 기업 → 저장된 페이지부터)"""
+        resumed = self.frontier.pending(self.source, limit) if self.frontier else []
+        if resumed:
+            print(f"[사람인] 이전 실행에서 남은 기업 {len(resumed)}개부터 처리")
+        for company in resumed:
+            yield company
+        async for company in self.iter_company_list(page=self.start_page, limit=limit - len(resumed)):
+            yield company
 
     def get_company_detail(self, company):
         """기업 상세 정보 수집"""
@@ -103,160 +300,77 @@ class SaraminCrawler:
         response = self._request(url)
         if not response:
             return company
+        return self._parse_detail(company, response.text)
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # 기업명 (h1이 가장 정확)
-        name_elem = soup.select_one('h1')
-        if name_elem:
-            name = name_elem.get_text(strip=True)
-            # 불필요한 텍스트 제거
-            name = re.sub(r'기업정보.*$', '', name)
-            name = re.sub(r'채용중\d*', '', name)
-            name = re.sub(r'현직자\s*인터뷰\d*', '', name)
-            name = re.sub(r'전체보기\d*', '', name)
-            name = re.sub(r'\d+건.*$', '', name)
-            company['name'] = name.strip()
-
-        # 기업 정보 테이블/리스트에서 추출
-        info_items = soup.select('.info_item, .company_info dt, .company_info dd, .info_list li')
-
-        for item in info_items:
-            text = item.get_text(strip=True)
-
-            # 홈페이지
-            if '홈페이지' in text or 'http' in text:
-                link = item.select_one('a')
-                if link:
-                    company['website'] = link.get('href')
-
-            # 업종
-            if '업종' in text:
-                company['industry_text'] = text.replace('업종', '').strip()
-
-            # 주소
-            if '주소' in text or '서울' in text or '경기' in text:
-                company['address'] = text
-
-        # 링크에서 홈페이지 찾기
-        for link in soup.select('a[href^="http"]'):
-            href = link.get('href', '')
-            if href and 'saramin' not in href and 'naver' not in href and 'google' not in href:
-                if not company.get('website'):
-                    company['website'] = href
-                break
-
-        # 연락처 정보 (전체 텍스트에서)
-        full_text = soup.get_text(separator=' ', strip=True)
-        company['raw_text'] = full_text[:5000]  # AI 파싱용
-
-        # 정규식으로 기본 추출
-        emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', full_text)
-        phones = re.findall(r'0\d{1,2}-\d{3,4}-\d{4}', full_text)
-
-        # 사람인 관련 이메일/전화 필터링
-        filtered_emails = [
-            e for e in set(emails)
-            if not any(x in e.lower() for x in ['saramin', 'help@', 'noreply', 'example'])
-        ]
-        filtered_phones = [
-            p for p in set(phones)
-            if p not in ['02-6226-5000', '02-6937-0039']  # 사람인 고객센터 번호 제외
-        ]
-
-        company['emails'] = filtered_emails[:3]
-        company['phones'] = filtered_phones[:3]
-
-        # 업종 추출
-        industry_elem = soup.select_one('.industry, .company_industry, [class*="industry"]')
-        if industry_elem:
-            company['industry_text'] = industry_elem.get_text(strip=True)
-
-        # 업종 텍스트에서 추출 시도
-        industry_match = re.search(r'업종[:\s]*([가-힣\s/]+?)(?:\s|$|<)', full_text)
-        if industry_match and not company.get('industry_text'):
-            company['industry_text'] = industry_match.group(1).strip()
+    async def get_company_detail_async(self, company):
+        """기업 상세 정보 수집 (비동기)"""
+        url = company.get('detail_url')
+        if not url:
+            return company
+
+        print(f"  상세 정보 수집: {url[:60]}...")
 
+        response = await self._request_async(url)
+        if not response:
+            return company
+        company.update(await self.parse_pool.parse(self.parse_detail, response, self.extractor))
+        return company
+
+    def _parse_detail(self, company, html):
+        """상세 페이지 HTML 파싱"""
+        company.update(self.parse_detail(html, self.extractor))
         return company
 
     def crawl_website(self, website_url):
-        """기업 웹사이트에서 추가 연락처 수집"""
+        """기업 웹사이트에서 추가 연락처 수집 (홈페이지 + 문의/회사소개 페이지)"""
+        return asyncio.run(self.crawl_website_async(website_url))
+
+    async def crawl_website_async(self, website_url):
+        """기업 웹사이트에서 추가 연락처 수집 (비동기)"""
         if not website_url:
             return {}
 
-        result = {'website_text': '', 'website_emails': [], 'website_phones': []}
+        print(f"    웹사이트 크롤링: {website_url[:50]}...")
+        return await self.website_crawler.crawl_async(website_url)
 
-        try:
-            print(f"    웹사이트 크롤링: {website_url[:50]}...")
-            response = self._request(website_url)
-            if not response:
-                return result
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # 푸터 영역 우선
-            footer = soup.select_one('footer, #footer, .footer')
-            if footer:
-                result['footer_text'] = footer.get_text(separator=' ', strip=True)
-
-            # 전체 텍스트
-            full_text = soup.get_text(separator=' ', strip=True)
-            result['website_text'] = full_text[:3000]
-
-            # 이메일/전화 추출
-            emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', full_text)
-            phones = re.findall(r'0\d{1,2}-\d{3,4}-\d{4}', full_text)
-
-            result['website_emails'] = [e for e in set(emails) if not any(x in e.lower() for x in ['example', 'test', 'noreply'])][:5]
-            result['website_phones'] = list(set(phones))[:5]
-
-        except Exception as e:
-            print(f"    웹사이트 오류: {e}")
-
-        return result
+    async def enrich_website_async(self, company):
+        """웹사이트 크롤링 결과를 기업 정보에 병합"""
+        if company.get('website'):
+            website_data = await self.crawl_website_async(company['website'])
+            company.update(website_data)
+        return company
 
     def collect(self, keywords=None, limit=50):
-        """전체 수집 프로세스"""
-        all_companies = []
-
+        """전체 수집 프로세스 (결과를 목록으로)"""
+        return asyncio.run(self.collect_async(keywords=keywords, limit=limit))
+
+    def iter_collect(self, keywords=None, limit=50, concurrency=COLLECT_CONCURRENCY):
+        """전체 수집 프로세스 (처리가 끝난 기업부터 하나씩, 일반 for 문용)"""
+        return iterate_sync(self.collect_stream(limit=limit, concurrency=concurrency))
+
+    async def collect_stream(self, limit=50, concurrency=COLLECT_CONCURRENCY):
+        """
+        전체 수집 프로세스 (스트리밍)
+        목록에서 찾은 기업을 concurrency개까지 동시에 상세 → 웹사이트 순으로 처리하고
+        끝나는 대로 반환 (연락처 추출 후 release_texts()로 큰 텍스트를 비우면 메모리가 일정하게 유지됨)
+        """
         print(f"[사람인] 수집 시작 (시작 페이지: {self.start_page}, 한도: {limit})")
+        count = 0
+        async for company in stream_companies(self, limit=limit, concurrency=concurrency):
+            count += 1
+            print(f"\n[{count}] 처리 완료: {company.get('name')}")
+            yield company
+        print(f"\n[사람인] 수집 완료: {count}개")
 
-        # 1. 기업 목록 수집 (저장된 페이지부터 시작)
-        companies = self.get_company_list(page=self.start_page, limit=limit)
-
-        # 2. 각 기업 상세 정보 수집
-        for i, company in enumerate(companies):
-            if len(all_companies) >= limit:
-                break
-
-            print(f"\n[{i+1}/{len(companies)}] 처리 중...")
-
-            # 상세 정보
-            company = self.get_company_detail(company)
-
-            if not company.get('name'):
-                print("  이름 없음, 스킵")
-                continue
-
-            print(f"  기업명: {company.get('name')}")
-
-            # 웹사이트 추가 크롤링
-            if company.get('website'):
-                website_data = self.crawl_website(company['website'])
-                company.update(website_data)
-
-            all_companies.append(company)
-
-        print(f"\n[사람인] 수집 완료: {len(all_companies)}개")
-        return all_companies
+    async def collect_async(self, keywords=None, limit=50):
+        """전체 수집 프로세스 (비동기, collect_stream 결과를 모아서 반환)"""
+        return [company async for company in self.collect_stream(limit=limit)]
 
 
 # 테스트
 if __name__ == '__main__':
     crawler = SaraminCrawler()
-    companies = crawler.collect(limit=3)
-
-    for c in companies:
+    for c in crawler.iter_collect(limit=3):
         print(f"\n{'='*50}")
         print(f"기업: {c.get('name')}")
         print(f"웹사이트: {c.get('website')}")
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+수집 결과 스트리밍 (사람인/원티드 공용)
+- 목록에서 찾은 기업을 상세 → 웹사이트까지 처리하고 끝나는 대로 하나씩 반환
+- 동시에 처리 중인 기업은 concurrency개까지만 두어 전체 목록을 메모리에 모으지 않음
+- release_texts()로 추출이 끝난 기업의 큰 텍스트(본문/웹사이트/하위 페이지)를 비움
+"""
+import queue
+import asyncio
+import threading
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import COLLECT_CONCURRENCY
+
+# 연락처 추출/AI 파싱에만 쓰는 큰 텍스트 필드
+TEXT_FIELDS = ('raw_text', 'website_text', 'footer_text', 'contact_page_text', 'website_raw_text', 'ai_text')
+
+
+def release_texts(company, keep=()):
+    """추출이 끝난 기업에서 큰 텍스트 필드 제거"""
+    for field in TEXT_FIELDS:
+        if field not in keep:
+            company.pop(field, None)
+    return company
+
+
+async def _process(crawler, company):
+    company = await crawler.get_company_detail_async(company)
+    if not company.get('name'):
+        print("  이름 없음, 스킵")
+        return None
+    print(f"  기업명: {company.get('name')}")
+    return await crawler.enrich_website_async(company)
+
+
+async def stream_companies(crawler, limit=50, concurrency=COLLECT_CONCURRENCY):
+    """
+    crawler.iter_companies()의 기업을 처리가 끝나는 순서대로 반환 (async generator)
+    이름이 없는 기업은 건너뜀
+    """
+    pending = set()
+    listing = crawler.iter_companies(limit=limit)
+    try:
+        exhausted = False
+        while not exhausted or pending:
+            # 빈자리가 있으면 목록에서 다음 기업을 가져와 처리 시작
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    company = await listing.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.create_task(_process(crawler, company)))
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                company = task.result()
+                if company:
+                    yield company
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        await listing.aclose()
+
+
+def iterate_sync(agen, buffer=COLLECT_CONCURRENCY):
+    """
+    async generator를 일반 generator로 (별도 스레드의 이벤트 루프에서 실행)
+    소비하는 쪽이 느리면 buffer개에서 멈춰 기다리고, 중간에 그만두면 수집도 취소
+    """
+    items = queue.Queue(maxsize=buffer)
+    done = object()
+    state = {}
+
+    async def pump():
+        try:
+            async for item in agen:
+                await asyncio.to_thread(items.put, item)
+        except Exception as e:
+            state['error'] = e
+        finally:
+            await asyncio.to_thread(items.put, done)
+
+    def run():
+        loop = asyncio.new_event_loop()
+        state['loop'] = loop
+        state['task'] = loop.create_task(pump())
+        started.set()
+        try:
+            loop.run_until_complete(state['task'])
+        except asyncio.CancelledError:
+            pass
+        finally:
+            loop.close()
+
+    started = threading.Event()
+    thread = threading.Thread(target=run, name='collect-stream', daemon=True)
+    thread.start()
+    started.wait()
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                break
+            yield item
+        if 'error' in state:
+            raise state['error']
+    finally:
+        if thread.is_alive():
+            state['loop'].call_soon_threadsafe(state['task'].cancel)
+            # 취소 후 pump가 넣는 종료 신호를 받을 자리 확보
+            while thread.is_alive():
+                try:
+                    items.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            thread.join()
@@ -3,102 +3,173 @@
 원티드 크롤러
 채용공고 기반 기업 정보 및 연락처 수집
 """
-import time
+import asyncio
 import random
-import re
-import requests
 from urllib.parse import urljoin
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import CRAWL_DELAY, USER_AGENTS, MAX_RETRIES
+from config import USER_AGENTS, COLLECT_CONCURRENCY, WANTED_PAGE_SIZE, WANTED_MAX_OFFSET
+from net.fetcher import Fetcher
+from parser.extractor import ContactExtractor, WANTED_BLOCKLIST
+from sources.stream import stream_companies, iterate_sync
+from sources.website import WebsiteCrawler
 
 
 class WantedCrawler:
-    def __init__(self, start_page=0):
+    source = 'wanted'
+    # 카테고리별 수집 (518=개발, 507=마케팅, 508=경영/비즈니스, 510=영업, 512=미디어)
+    categories = [518, 507, 508, 510, 512]
+    page_size = WANTED_PAGE_SIZE
+    max_offset = WANTED_MAX_OFFSET  # 카테고리별로 이 위치를 넘으면 처음부터
+
+    def __init__(self, start_page=0, limiter=None, dedup=None, frontier=None, http_cache=None, parse_pool=None):
         self.base_url = 'https://www.wanted.co.kr'
         self.api_url = 'https://www.wanted.co.kr/api/v4'
         self.start_page = start_page
-        self.last_page = start_page
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.frontier = frontier  # 카테고리별 offset/기업별 상태 기록 (중단 후 이어서 수집)
+        self.offsets = {}  # 카테고리별 다음에 읽을 offset
+        self.fetcher = Fetcher(headers={
             'User-Agent': random.choice(USER_AGENTS),
             'Accept': 'application/json, text/plain, */*',
             'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
             'Referer': 'https://www.wanted.co.kr/',
             'Origin': 'https://www.wanted.co.kr',
-        })
-
-    def _request(self, url, retries=0, is_json=True):
-        """HTTP 요청 (재시도 로직 포함)"""
-        try:
-            delay = CRAWL_DELAY + random.uniform(0.5, 1.5)
-            print(f"대기 {delay:.1f}초...")
-            time.sleep(delay)
-
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-
-            if is_json:
-                return response.json()
+        }, limiter=limiter, retry_delay=3, cache=http_cache)
+        self.session = self.fetcher.session
+        self.extractor = ContactExtractor(WANTED_BLOCKLIST)
+        self.website_crawler = WebsiteCrawler(self.fetcher, self.extractor, parse_pool=parse_pool)
+        self.dedup = dedup  # 이미 수집한 기업은 목록 단계에서 제외
+
+    def _request(self, url, is_json=True):
+        """HTTP 요청 (호스트별 딜레이 + 재시도 로직 포함)"""
+        return self._decode(self.fetcher.get(url), is_json)
+
+    async def _request_async(self, url, is_json=True):
+        """비동기 HTTP 요청 (다른 호스트 요청과 동시에 진행)"""
+        return self._decode(await self.fetcher.get_async(url), is_json)
+
+    def _decode(self, response, is_json):
+        if response is None or not is_json:
             return response
-        except Exception as e:
-            if retries < MAX_RETRIES:
-                print(f"재시도 {retries + 1}/{MAX_RETRIES}: {url[:60]}...")
-                time.sleep(3)
-                return self._request(url, retries + 1, is_json)
-            print(f"요청 실패: {e}")
+        try:
+            return response.json()
+        except ValueError as e:
+            print(f"JSON 파싱 실패: {e}")
             return None
 
-    def get_job_list(self, offset=0, limit=50):
+    def get_job_list(self, offset=None, limit=50):
         """채용공고 목록에서 기업 ID 수집"""
+        return asyncio.run(self.get_job_list_async(offset=offset, limit=limit))
+
+    async def get_job_list_async(self, offset=None, limit=50):
+        """채용공고 목록에서 기업 ID 수집 (비동기)"""
+        return [company async for company in self.iter_job_list(offset=offset, limit=limit)]
+
+    def _start_offset(self, category, offset=None):
+        if offset is None:
+            offset = self.start_page * self.page_size
+            if self.frontier:
+                offset = self.frontier.cursor(self.source, category, offset)
+        return 0 if offset >= self.max_offset else offset
+
+    async def _fetch_jobs(self, category):
+        """카테고리의 다음 페이지 요청 → (카테고리, offset, 채용공고 리스트, 실패하면 None)"""
+        offset = self.offsets[category]
+        url = (f"{self.api_url}/jobs?country=kr&tag_type_ids={category}&job_sort=job.latest_order"
+               f"&years=-1&locations=all&offset={offset}&limit={self.page_size}")
+        print(f"[원티드] 카테고리 {category} 수집 중 (offset: {offset})...")
+        data = await self._request_async(url)
+        if not data or 'data' not in data:
+            return category, offset, None
+        return category, offset, data.get('data', [])
+
+    def _new_companies(self, jobs, seen_ids):
+        """채용공고 → 처음 보는 기업 (카테고리끼리/이전 실행과 겹치는 기업 ID 제외)"""
         companies = []
-        collected_ids = set()
-        current_offset = offset
-
-        # 카테고리별 수집 (518=개발, 507=마케팅, 508=경영/비즈니스)
-        categories = [518, 507, 508, 510, 512]  # 개발, 마케팅, 경영, 영업, 미디어
-
-        for category in categories:
-            if len(companies) >= limit:
-                break
-
-            # 원티드 API로 채용공고 조회
-            url = f"{self.api_url}/jobs?country=kr&tag_type_ids={category}&job_sort=job.latest_order&years=-1&locations=all&offset={current_offset}&limit=20"
-            print(f"[원티드] 카테고리 {category} 수집 중 (offset: {current_offset})...")
-
-            data = self._request(url)
-            if not data or 'data' not in data:
+        for job in jobs:
+            company_id = job.get('company', {}).get('id')
+            company_name = job.get('company', {}).get('name')
+            if not company_id or str(company_id) in seen_ids:
                 continue
-
-            jobs = data.get('data', [])
-            print(f"[원티드] {len(jobs)}개 채용공고 발견")
-
-            for job in jobs:
-                if len(companies) >= limit:
-                    break
-
-                company_id = job.get('company', {}).get('id')
-                company_name = job.get('company', {}).get('name')
-
-                if company_id and company_id not in collected_ids:
-                    collected_ids.add(company_id)
-                    companies.append({
-                        'company_id': company_id,
-                        'name': company_name,
-                        'detail_url': f"{self.base_url}/company/{company_id}",
-                        'job_title': job.get('position'),
-                        'job_id': job.get('id'),
-                    })
-
-            current_offset += 20
-
-        self.last_page = current_offset // 20
-        print(f"[원티드] 총 {len(companies)}개 기업 수집")
+            seen_ids.add(str(company_id))
+            if self.dedup and self.dedup.seen(self.source, company_id, company_name):
+                continue
+            companies.append({
+                'company_id': company_id,
+                'source_id': company_id,
+                'name': company_name,
+                'detail_url': f"{self.base_url}/company/{company_id}",
+                'job_title': job.get('position'),
+                'job_id': job.get('id'),
+            })
         return companies
 
+    async def iter_job_list(self, offset=None, limit=50, max_rounds=5):
+        """
+        채용공고 목록에서 기업을 찾는 대로 하나씩 반환
+        카테고리마다 offset을 따로 두고, 바퀴마다 모든 카테고리의 다음 페이지를 동시에 요청
+        (요청은 원티드 호스트 딜레이에 맞춰 차례로 나가고, 먼저 받은 페이지부터 처리, 최대 max_rounds바퀴)
+        offset을 지정하지 않으면 카테고리별로 저장된 위치부터 시작
+        기업 ID는 카테고리끼리, 그리고 이전 실행에서 발견한 ID(frontier)와 겹치면 제외
+        """
+        found = 0
+        seen_ids = self.frontier.known_ids(self.source) if self.frontier else set()
+        self.offsets = {c: self._start_offset(c, offset) for c in self.categories}
+        # 한도가 작아도 뒤쪽 카테고리가 밀리지 않도록 오래 전에 읽은 카테고리부터 요청
+        active = self.frontier.least_recent(self.source, self.categories) if self.frontier else list(self.categories)
+
+        for _ in range(max_rounds):
+            if found >= limit or not active:
+                break
+            pages = [asyncio.create_task(self._fetch_jobs(category)) for category in active]
+            try:
+                for next_page in asyncio.as_completed(pages):
+                    category, current_offset, jobs = await next_page
+                    if jobs is None:
+                        active.remove(category)  # 이번 실행에서는 건너뜀 (위치는 유지)
+                        continue
+                    print(f"[원티드] 카테고리 {category}: {len(jobs)}개 채용공고 발견")
+
+                    # 마지막 페이지면 다음 실행은 처음부터
+                    next_offset = current_offset + len(jobs)
+                    if len(jobs) < self.page_size or next_offset >= self.max_offset:
+                        next_offset = 0
+                        active.remove(category)
+                    self.offsets[category] = next_offset
+
+                    # 다음 offset과 발견한 기업을 함께 기록 (한도를 넘은 기업은 다음 실행에서 처리)
+                    companies = self._new_companies(jobs, seen_ids)
+                    if self.frontier:
+                        companies = self.frontier.record_page(self.source, category, next_offset, companies)
+
+                    for company in companies:
+                        if found >= limit:
+                            break
+                        found += 1
+                        yield company
+                    if found >= limit:
+                        break
+            finally:
+                # 한도를 채웠거나 중단되면 아직 받지 못한 페이지는 취소 (위치가 기록되지 않아 다음 실행에서 다시 읽음)
+                for page in pages:
+                    page.cancel()
+                await asyncio.gather(*pages, return_exceptions=True)
+
+        print(f"[원티드] 총 {found}개 기업 수집")
+
+    async def iter_companies(self, limit=50):
+        """파이프라인용 기업 목록 (이전 실행에서 끝내지 못한 기업 → 카테고리별 저장된 위치부터)"""
+        resumed = self.frontier.pending(self.source, limit) if self.frontier else []
+        if resumed:
+            print(f"[원티드] 이전 실행에서 남은 기업 {len(resumed)}개부터 처리")
+        for company in resumed:
+            yield company
+        async for company in self.iter_job_list(limit=limit - len(resumed)):
+            yield company
+
     def get_company_detail(self, company):
         """기업 상세 정보 수집 (API)"""
         company_id = company.get('company_id')
@@ -109,7 +180,21 @@ class WantedCrawler:
         url = f"{self.api_url}/companies/{company_id}"
         print(f"  상세 정보 수집: {company.get('name')}...")
 
-        data = self._request(url)
+        return self._parse_detail(company, self._request(url))
+
+    async def get_company_detail_async(self, company):
+        """기업 상세 정보 수집 (비동기)"""
+        company_id = company.get('company_id')
+        if not company_id:
+            return company
+
+        url = f"{self.api_url}/companies/{company_id}"
+        print(f"  상세 정보 수집: {company.get('name')}...")
+
+        return self._parse_detail(company, await self._request_async(url))
+
+    def _parse_detail(self, company, data):
+        """기업 상세 API 응답 파싱"""
         if not data or 'company' not in data:
             return company
 
@@ -143,84 +228,60 @@ class WantedCrawler:
         return company
 
     def crawl_website(self, website_url):
-        """기업 웹사이트에서 연락처 수집"""
+        """기업 웹사이트에서 연락처 수집 (홈페이지 + 문의/회사소개 페이지)"""
+        return asyncio.run(self.crawl_website_async(website_url))
+
+    async def crawl_website_async(self, website_url):
+        """기업 웹사이트에서 연락처 수집 (비동기)"""
         if not website_url:
             return {}
 
-        result = {'website_text': '', 'emails': [], 'phones': []}
-
-        try:
-            print(f"    웹사이트 크롤링: {website_url[:50]}...")
-            response = self._request(website_url, is_json=False)
-            if not response:
-                return result
-
-            text = response.text
-
-            # 이메일 추출
-            emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', text)
-            filtered_emails = [
-                e for e in set(emails)
-                if not any(x in e.lower() for x in ['example', 'test', 'noreply', 'wanted', 'wix', 'cafe24'])
-            ]
-
-            # 전화번호 추출 (한국)
-            phones = re.findall(r'0\d{1,2}-\d{3,4}-\d{4}', text)
-
-            result['emails'] = filtered_emails[:5]
-            result['phones'] = list(set(phones))[:5]
-            result['website_text'] = text[:2000]
-
-        except Exception as e:
-            print(f"    웹사이트 오류: {e}")
-
-        return result
+        print(f"    웹사이트 크롤링: {website_url[:50]}...")
+        return await self.website_crawler.crawl_async(website_url)
+
+    async def enrich_website_async(self, company):
+        """웹사이트에서 찾은 연락처를 기업 정보에 반영"""
+        if company.get('website'):
+            website_data = await self.crawl_website_async(company['website'])
+            company.update(website_data)
+            # 원티드 상세 API에는 연락처가 없으므로 웹사이트 연락처를 그대로 사용
+            if website_data.get('website_emails'):
+                company['emails'] = website_data['website_emails']
+            if website_data.get('website_phones'):
+                company['phones'] = website_data['website_phones']
+        return company
 
     def collect(self, keywords=None, limit=50):
-        """전체 수집 프로세스"""
-        all_companies = []
-
-        print(f"[원티드] 수집 시작 (시작 offset: {self.start_page * 20}, 한도: {limit})")
-
-        # 1. 채용공고에서 기업 목록 수집
-        companies = self.get_job_list(offset=self.start_page * 20, limit=limit)
-
-        # 2. 각 기업 상세 정보 수집
-        for i, company in enumerate(companies):
-            if len(all_companies) >= limit:
-                break
-
-            print(f"\n[{i+1}/{len(companies)}] 처리 중...")
-
-            # 상세 정보
-            company = self.get_company_detail(company)
-
-            if not company.get('name'):
-                print("  이름 없음, 스킵")
-                continue
-
-            print(f"  기업명: {company.get('name')}")
-
-            # 웹사이트 추가 크롤링
-            if company.get('website'):
-                website_data = self.crawl_website(company['website'])
-                if website_data.get('emails'):
-                    company['emails'] = website_data['emails']
-                if website_data.get('phones'):
-                    company['phones'] = website_data['phones']
-
-            all_companies.append(company)
-
-        print(f"\n[원티드] 수집 완료: {len(all_companies)}개")
-        return all_companies
+        """전체 수집 프로세스 (결과를 목록으로)"""
+        return asyncio.run(self.collect_async(keywords=keywords, limit=limit))
+
+    def iter_collect(self, keywords=None, limit=50, concurrency=COLLECT_CONCURRENCY):
+        """전체 수집 프로세스 (처리가 끝난 기업부터 하나씩, 일반 for 문용)"""
+        return iterate_sync(self.collect_stream(limit=limit, concurrency=concurrency))
+
+    async def collect_stream(self, limit=50, concurrency=COLLECT_CONCURRENCY):
+        """
+        전체 수집 프로세스 (스트리밍)
+        목록에서 찾은 기업을 concurrency개까지 동시에 상세 → 웹사이트 순으로 처리하고
+        끝나는 대로 반환 (연락처 추출 후 release_texts()로 큰 텍스트를 비우면 메모리가 일정하게 유지됨)
+        """
+        print(f"[원티드] 수집 시작 (한도: {limit})")
+        count = 0
+        async for company in stream_companies(self, limit=limit, concurrency=concurrency):
+            count += 1
+            print(f"\n[{count}] 처리 완료: {company.get('name')}")
+            yield company
+        print(f"\n[원티드] 수집 완료: {count}개")
+
+    async def collect_async(self, keywords=None, limit=50):
+        """전체 수집 프로세스 (비동기, collect_stream 결과를 모아서 반환)"""
+        return [company async for company in self.collect_stream(limit=limit)]
 
 
 # 테스트
 if __name__ == '__main__':
     crawler = WantedCrawler()
-    companies = crawler.collect(limit=3)
-
-    for c in companies:
+    for c in crawler.iter_collect(limit=3):
         print(f"\n{'='*50}")
         print(f"기업: {c.get('name')}")
         print(f"업종: {c.get('industry_text')}")
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+기업 웹사이트 연락처 수집 (여러 페이지)
+- 홈페이지를 먼저 읽고, 같은 도메인 링크를 연락처가 있을 가능성 순으로 정렬
+  (링크 텍스트: 문의/연락처/회사소개 등, URL: /contact, /about, /company 등)
+- 상위 페이지를 도메인별 예산(max_pages) 안에서 동시에 요청 (호스트 딜레이는 Fetcher가 적용)
+- 신뢰도 높은 연락처(영업/문의 주소 등)를 찾으면 남은 요청을 취소하고 바로 종료
+- 페이지는 PageLimits 제한 안에서 스트리밍으로 받음 (HTML이 아니면 건너뛰고, 큰 페이지는 앞부분 + 푸터만 파싱,
+  그 사이 버리는 부분은 받는 대로 연락처만 추출)
+- JSON-LD/__NEXT_DATA__/인라인 상태 등 구조화 데이터의 연락처도 함께 사용 (SPA는 화면 텍스트에 연락처가 없음)
+"""
+import re
+import asyncio
+from urllib.parse import urljoin, urlparse, urldefrag
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import WEBSITE_MAX_PAGES, WEBSITE_STOP_CONFIDENCE
+from parser.contact_rank import rank_emails, best_contact
+from parser.html_doc import parse_html
+from parser.parse_pool import ParsePool
+from parser.structured import extract_structured
+from net.page_body import PageLimits
+
+# (가중치, 링크 텍스트 키워드)
+ANCHOR_KEYWORDS = [
+    (3, ('문의', '연락처', '연락', 'contact', 'inquiry', '제휴', '오시는', '찾아오시는', 'location')),
+    (2, ('회사소개', '회사 소개', '기업소개', 'about', 'company', '고객센터', '고객지원', 'support', '회사정보')),
+    (1, ('소개', 'info', 'intro', '회사', 'cs', 'help')),
+]
+# (가중치, URL 경로 패턴)
+URL_PATTERNS = [
+    (3, re.compile(r'contact|inquiry|qna|partnership|location|map', re.IGNORECASE)),
+    (2, re.compile(r'about|company|intro|info|overview|support|customer|\bcs\b', re.IGNORECASE)),
+]
+# 연락처가 없을 페이지
+SKIP_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.zip', '.hwp', '.doc', '.docx',
+                   '.xls', '.xlsx', '.ppt', '.pptx', '.mp4')
+# 푸터 (사업자 정보/대표 연락처가 있는 곳)
+FOOTER_SELECTOR = 'footer, #footer, .footer'
+# 파싱 결과처럼 스크립트/스타일 안의 텍스트는 연락처 추출에서 제외
+_HIDDEN_TAG_RE = re.compile(r'<(/?)(?:script|style)\b', re.IGNORECASE)
+_BOUNDARY_RE = re.compile(r'[\s>][^\s>]*$')
+
+
+def _site(url):
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def score_link(url, anchor_text):
+    """링크 하나의 연락처 가능성 점수 (0이면 요청하지 않음)"""
+    text = (anchor_text or '').lower()
+    score = 0
+    for weight, keywords in ANCHOR_KEYWORDS:
+        if any(k in text for k in keywords):
+            score += weight
+            break
+    path = urlparse(url).path
+    for weight, pattern in URL_PATTERNS:
+        if pattern.search(path):
+            score += weight
+            break
+    return score
+
+
+def parse_page(html, base_url, extractor, text_limit=None):
+    """
+    페이지 하나 파싱: 텍스트, 푸터, 연락처, 같은 도메인 링크
+    프로세스 풀에서도 실행되므로 모듈 함수 (text_limit으로 돌려받을 텍스트 크기 제한)
+    """
+    doc = parse_html(html)
+
+    footer = doc.select_one(FOOTER_SELECTOR)
+    footer_text = footer.text() if footer else ''
+
+    site = _site(base_url)
+    links = []
+    mailtos = []
+    for a in doc.select('a[href]'):
+        href = (a.attr('href') or '').strip()
+        if href.lower().startswith('mailto:'):
+            mailtos.append(href[7:].split('?')[0])
+            continue
+        url, _ = urldefrag(urljoin(base_url, href))
+        if not url.startswith(('http://', 'https://')) or _site(url) != site:
+            continue
+        if urlparse(url).path.lower().endswith(SKIP_EXTENSIONS):
+            continue
+        links.append((url, a.text()))
+
+    text = doc.text()
+    contacts = extractor.extract(' '.join([text] + mailtos), max_emails=5, max_phones=5)
+
+    # 사이트가 직접 밝힌 연락처(구조화 데이터)를 앞에, 요약은 AI 파싱 입력용으로 텍스트 앞에
+    structured = extract_structured(html, extractor, doc)
+    if structured['sources']:
+        text = f"{structured['text']} {text}"
+    emails = list(dict.fromkeys(structured['emails'] + contacts['emails']))[:5]
+    phones = list(dict.fromkeys(structured['phones'] + contacts['phones']))[:5]
+    return {
+        'text': text[:text_limit] if text_limit else text,
+        'footer_text': footer_text,
+        'emails': emails,
+        'phones': phones,
+        'links': links,
+        'structured': structured['sources'],
+    }
+
+
+class ChunkScanner:
+    """
+    본문 중간(파싱하지 않고 버리는 부분)에서 받는 대로 연락처 추출 (Fetcher의 scan 콜백)
+    조각 경계에서 이메일/태그가 잘리지 않도록 마지막 공백/> 뒤는 다음 조각과 이어서 검사
+    """
+
+    def __init__(self, extractor):
+        self.extractor = extractor
+        self.emails = []
+        self.phones = []
+        self._carry = ''
+        self._hidden = False  # <script>/<style> 안인지
+
+    def __call__(self, chunk):
+        # 이메일/전화번호는 ASCII이므로 인코딩과 상관없이 latin-1로 읽어도 됨
+        text = self._carry + chunk.decode('latin-1')
+        boundary = _BOUNDARY_RE.search(text, max(0, len(text) - 256))
+        cut = boundary.start() + 1 if boundary else len(text)
+        text, self._carry = text[:cut], text[cut:]
+
+        visible = []
+        position = 0
+        for match in _HIDDEN_TAG_RE.finditer(text):
+            if not self._hidden:
+                visible.append(text[position:match.start()])
+            self._hidden = not match.group(1)
+            position = match.end()
+        if not self._hidden:
+            visible.append(text[position:])
+
+        contacts = self.extractor.extract(' '.join(visible))
+        self.emails.extend(e for e in contacts['emails'] if e not in self.emails)
+        self.phones.extend(p for p in contacts['phones'] if p not in self.phones)
+
+
+class WebsiteCrawler:
+    def __init__(self, fetcher, extractor, max_pages=WEBSITE_MAX_PAGES, stop_confidence=WEBSITE_STOP_CONFIDENCE,
+                 parse_pool=None, limits=None):
+        self.fetcher = fetcher
+        self.extractor = extractor
+        self.parse_pool = parse_pool or ParsePool(workers=0)
+        self.max_pages = max(1, max_pages)  # 홈페이지 포함
+        self.stop_confidence = stop_confidence
+        self.limits = limits or PageLimits()
+        self.stats = {'sites': 0, 'pages': 0, 'early_stops': 0, 'truncated': 0, 'structured': 0}
+
+    def parse_page(self, html, base_url):
+        """페이지 하나 파싱: 텍스트, 푸터, 연락처, 같은 도메인 링크"""
+        return parse_page(html, base_url, self.extractor)
+
+    def rank_links(self, links, exclude=()):
+        """같은 도메인 링크를 점수 순으로 (URL 중복 제거, 점수 0 제외)"""
+        scores = {}
+        for url, anchor in links:
+            if url in exclude or url.rstrip('/') in exclude:
+                continue
+            scores[url] = max(scores.get(url, 0), score_link(url, anchor))
+        ranked = [url for url, s in scores.items() if s > 0]
+        return sorted(ranked, key=lambda url: -scores[url])  # 같은 점수는 페이지 순서대로
+
+    def _confident(self, emails, website):
+        return best_contact(emails, website)[1] >= self.stop_confidence
+
+    async def _fetch_page(self, url):
+        scanner = ChunkScanner(self.extractor)
+        response = await self.fetcher.get_async(url, page=self.limits, scan=scanner)
+        if not response:
+            return url, None
+        try:
+            page = await self.parse_pool.parse(parse_page, response, response.url or url, self.extractor, 3000)
+        except Exception as e:
+            print(f"    웹사이트 오류: {e}")
+            return url, None
+        if page['structured']:
+            self.stats['structured'] += 1
+        if getattr(response, 'truncated', False):
+            self.stats['truncated'] += 1
+            # 파싱하지 않은 중간 부분의 연락처는 페이지 연락처 뒤에
+            page['emails'] += [e for e in scanner.emails if e not in page['emails']]
+            page['phones'] += [p for p in scanner.phones if p not in page['phones']]
+        return url, page
+
+    async def crawl_async(self, website_url):
+        """
+        홈페이지 + 연락처 가능성이 높은 하위 페이지 수집
+        반환: website_text, footer_text, website_emails, website_phones, contact_page_text, website_pages
+        """
+        result = {'website_text': '', 'website_emails': [], 'website_phones': [],
+                  'contact_page_text': '', 'website_pages': []}
+        if not website_url:
+            return result
+        if '//' not in website_url:
+            website_url = f'http://{website_url}'
+
+        self.stats['sites'] += 1
+        _, home = await self._fetch_page(website_url)
+        if not home:
+            return result
+        self.stats['pages'] += 1
+
+        emails = list(home['emails'])
+        phones = list(home['phones'])
+        result['website_text'] = home['text']
+        result['footer_text'] = home['footer_text']
+        result['website_pages'].append(website_url)
+
+        # 홈페이지에서 충분하면 하위 페이지는 요청하지 않음
+        candidates = []
+        if not self._confident(emails, website_url):
+            candidates = self.rank_links(home['links'], exclude={website_url, website_url.rstrip('/')})
+            candidates = candidates[:self.max_pages - 1]
+
+        sub_texts = []
+        tasks = [asyncio.create_task(self._fetch_page(url)) for url in candidates]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                url, page = await finished
+                if not page:
+                    continue
+                self.stats['pages'] += 1
+                result['website_pages'].append(url)
+                emails.extend(e for e in page['emails'] if e not in emails)
+                phones.extend(p for p in page['phones'] if p not in phones)
+                sub_texts.append(page['text'])
+                if self._confident(emails, website_url):
+                    if any(not t.done() for t in tasks):
+                        self.stats['early_stops'] += 1
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        result['website_emails'] = rank_emails(emails, website_url)[:5]
+        result['website_phones'] = phones[:5]
+        result['contact_page_text'] = ' '.join(sub_texts)[:6000]
+        return result
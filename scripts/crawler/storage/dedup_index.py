@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+중복 확인용 메모리 인덱스
+- 실행 시작 시 companies 테이블을 한 번만 조회해 정규화된 이름/웹사이트 도메인을 적재
+- 사람인 csn, 원티드 company_id 등 소스별 ID는 로컬 파일(SQLite)에 기록해
+  다음 실행부터 목록 단계에서 바로 걸러냄 (상세/웹사이트 요청 자체를 생략)
+- 행이 저장될 때마다 인덱스에 추가
+- 행 수가 많으면 집합 대신 블룸 필터 사용 (오탐률 DEDUP_BLOOM_ERROR_RATE)
+"""
+import re
+import math
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlparse
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DEDUP_DB_PATH, DEDUP_BLOOM_THRESHOLD, DEDUP_BLOOM_ERROR_RATE
+from metrics import registry
+
+# 여러 회사가 함께 쓰는 도메인은 웹사이트로 중복 판단하지 않음
+SHARED_DOMAINS = {
+    'naver.com', 'blog.naver.com', 'smartstore.naver.com', 'google.com', 'sites.google.com',
+    'facebook.com', 'instagram.com', 'linkedin.com', 'youtube.com', 'twitter.com', 'x.com',
+    'kakao.com', 'pf.kakao.com', 'tistory.com', 'notion.site', 'notion.so', 'github.io',
+    'wixsite.com', 'cafe24.com', 'imweb.me', 'modoo.at', 'saramin.co.kr', 'wanted.co.kr',
+}
+
+_COMPANY_AFFIXES = re.compile(r'\(주\)|㈜|주식회사|\(유\)|유한회사|\(사\)|사단법인')
+# 영문 법인 표기는 이름 끝에 단어로 붙은 것만 (Incross, Princeton처럼 이름 안의 글자는 그대로)
+_LATIN_SUFFIX = re.compile(r'\b(?:co\.?,?\s*ltd|inc|corp)\.?\s*$', re.IGNORECASE)
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_name(name):
+    """회사명 정규화 ((주)/주식회사, 끝의 Inc/Corp/Co., Ltd., 공백/기호 제거, 소문자)"""
+    if not name:
+        return ''
+    name = _LATIN_SUFFIX.sub('', _COMPANY_AFFIXES.sub('', name).strip())
+    return _NON_WORD.sub('', name).lower()
+
+
+def website_domain(url):
+    """웹사이트 도메인 (www. 제거), 공용 도메인이면 None"""
+    if not url:
+        return None
+    host = (urlparse(url if '//' in url else f'//{url}').hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if not host or any(host == d or host.endswith('.' + d) for d in SHARED_DOMAINS):
+        return None
+    return host
+
+
+class BloomFilter:
+    """집합 대신 쓰는 블룸 필터 (없는 값을 있다고 할 수는 있어도, 있는 값을 놓치지는 않음)"""
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for pos in self._positions(value):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+
+class DedupIndex:
+    def __init__(self, path=DEDUP_DB_PATH):
+        self.names = set()
+        self.domains = set()
+        self.skipped = 0  # 목록 단계에서 걸러낸 수
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS source_ids (
+                source TEXT NOT NULL,
+                source_id TEXT NOT NULL,
+                name TEXT,
+                PRIMARY KEY (source, source_id)
+            )
+        ''')
+        self._conn.commit()
+
+    def load(self, storage):
+        """companies 테이블에서 이름/도메인 적재 (페이지 단위로 한 번만)"""
+        rows = list(storage.iter_rows('companies', select='id,name,website'))
+        if len(rows) > DEDUP_BLOOM_THRESHOLD:
+            capacity = len(rows) * 2  # 실행 중 추가될 행 여유분
+            self.names = BloomFilter(capacity, DEDUP_BLOOM_ERROR_RATE)
+            self.domains = BloomFilter(capacity, DEDUP_BLOOM_ERROR_RATE)
+
+        for row in rows:
+            self._add(row.get('name'), row.get('website'))
+        return len(rows)
+
+    def _add(self, name, website):
+        key = normalize_name(name)
+        if key:
+            self.names.add(key)
+        domain = website_domain(website)
+        if domain:
+            self.domains.add(domain)
+
+    def contains(self, name=None, website=None):
+        """이름 또는 웹사이트 도메인이 이미 있는지"""
+        key = normalize_name(name)
+        if key and key in self.names:
+            return True
+        domain = website_domain(website)
+        return bool(domain and domain in self.domains)
+
+    def contains_source_id(self, source, source_id):
+        """소스별 ID(사람인 csn, 원티드 company_id)로 이미 처리한 기업인지"""
+        if source_id is None:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM source_ids WHERE source = ? AND source_id = ?', (source, str(source_id))
+            ).fetchone()
+        return bool(row)
+
+    def seen(self, source, source_id, name=None):
+        """목록 단계 확인 (ID 또는 이름으로), 이미 있으면 skipped 증가"""
+        known = self.contains_source_id(source, source_id) or (name and self.contains(name=name))
+        if known:
+            self.skipped += 1
+            registry.inc('skips_total', source=source, reason='known')
+        return bool(known)
+
+    def add(self, name, website=None, source=None, source_id=None):
+        """저장된(또는 중복으로 확인된) 기업을 인덱스에 추가"""
+        with self._lock:
+            self._add(name, website)
+            if source and source_id is not None:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO source_ids (source, source_id, name) VALUES (?, ?, ?)',
+                    (source, str(source_id), name)
+                )
+                self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+수집 진행 상태 (frontier, 로컬 SQLite)
+- 소스/카테고리별 목록 위치(cursor)와 기업별 처리 상태를 건마다 기록
+- 목록 페이지를 읽으면 다음 위치와 발견한 기업을 한 트랜잭션으로 저장하므로
+  실행 도중 중단돼도 읽은 페이지를 다시 요청하지 않고, 처리 못 한 기업부터 이어서 진행
+- 상태: pending(발견) → done(저장) / skipped(이름·이메일 없음, 중복) / failed(오류, 다음 실행에 재시도)
+- snapshot()을 settings 테이블(crawler_{source})에 그대로 저장해 다른 곳에서도 확인 가능
+"""
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import FRONTIER_DB_PATH, FRONTIER_MAX_ATTEMPTS
+
+PENDING = 'pending'
+DONE = 'done'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+
+
+class Frontier:
+    def __init__(self, path=FRONTIER_DB_PATH, max_attempts=FRONTIER_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS cursors (
+                source TEXT NOT NULL,
+                category TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (source, category)
+            );
+            CREATE TABLE IF NOT EXISTS items (
+                source TEXT NOT NULL,
+                source_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (source, source_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_items_status ON items (source, status, updated_at);
+        ''')
+        self._conn.commit()
+
+    # --- 목록 위치 ---
+
+    def cursor(self, source, category, default=0):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT position FROM cursors WHERE source = ? AND category = ?', (source, str(category))
+            ).fetchone()
+        return row[0] if row else default
+
+    def cursors(self, source):
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT category, position FROM cursors WHERE source = ?', (source,)
+            ).fetchall()
+        return dict(rows)
+
+    def least_recent(self, source, categories):
+        """오래 전에 읽은 카테고리부터 (한 번도 안 읽은 카테고리가 맨 앞)"""
+        with self._lock:
+            updated = dict(self._conn.execute(
+                'SELECT category, updated_at FROM cursors WHERE source = ?', (source,)
+            ).fetchall())
+        return sorted(categories, key=lambda c: updated.get(str(c), 0))
+
+    def seed(self, source, category, position):
+        """위치가 아직 없을 때만 기록 (settings의 이전 last_page에서 이어받기)"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR IGNORE INTO cursors (source, category, position, updated_at) VALUES (?, ?, ?, ?)',
+                (source, str(category), position, time.time())
+            )
+            self._conn.commit()
+
+    def _set_cursor(self, source, category, position):
+        self._conn.execute(
+            'INSERT OR REPLACE INTO cursors (source, category, position, updated_at) VALUES (?, ?, ?, ?)',
+            (source, str(category), position, time.time())
+        )
+
+    def record_page(self, source, category, next_position, items):
+        """
+        목록 페이지 하나를 처리한 결과를 한 번에 기록
+        items: 이 페이지에서 발견한 기업 (source_id 필수), 이미 있는 기업은 상태 유지
+        반환: 새로 추가된 기업 리스트
+        """
+        now = time.time()
+        added = []
+        with self._lock:
+            for item in items:
+                cursor = self._conn.execute(
+                    'INSERT OR IGNORE INTO items (source, source_id, status, data, updated_at) VALUES (?, ?, ?, ?, ?)',
+                    (source, str(item['source_id']), PENDING, json.dumps(item, ensure_ascii=False), now)
+                )
+                if cursor.rowcount:
+                    added.append(item)
+            self._set_cursor(source, category, next_position)
+            self._conn.commit()
+        return added
+
+    # --- 기업별 상태 ---
+
+    def pending(self, source, limit=None):
+        """이전 실행에서 발견했지만 끝내지 못한 기업 (오래된 순, 실패는 최대 시도 횟수까지)"""
+        with self._lock:
+            rows = self._conn.execute('''
+                SELECT data FROM items
+                WHERE source = ? AND (status = ? OR (status = ? AND attempts < ?))
+                ORDER BY updated_at ASC
+                LIMIT ?
+            ''', (source, PENDING, FAILED, self.max_attempts, -1 if limit is None else limit)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def known_ids(self, source):
+        """이 소스에서 한 번이라도 발견한 기업 ID 집합 (목록 단계 중복 제외용, 상태 무관)"""
+        with self._lock:
+            rows = self._conn.execute('SELECT source_id FROM items WHERE source = ?', (source,)).fetchall()
+        return {row[0] for row in rows}
+
+    def status(self, source, source_id):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status FROM items WHERE source = ? AND source_id = ?', (source, str(source_id))
+            ).fetchone()
+        return row[0] if row else None
+
+    def mark(self, source, source_id, status):
+        """기업 처리 결과 기록 (failed면 시도 횟수 증가)"""
+        if source_id is None:
+            return
+        with self._lock:
+            self._conn.execute('''
+                UPDATE items SET status = ?, attempts = attempts + ?, updated_at = ?
+                WHERE source = ? AND source_id = ?
+            ''', (status, 1 if status == FAILED else 0, time.time(), source, str(source_id)))
+            self._conn.commit()
+
+    def counts(self, source):
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT status, COUNT(*) FROM items WHERE source = ? GROUP BY status', (source,)
+            ).fetchall()
+        return dict(rows)
+
+    def snapshot(self, source):
+        """settings 테이블에 저장할 상태"""
+        return {
+            'cursors': self.cursors(source),
+            'items': self.counts(source),
+            'last_run': datetime.now().isoformat(),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -3,34 +3,44 @@
 Supabase 저장 모듈
 - Python 3.14 호환을 위해 SDK 대신 HTTP API 직접 호출
 """
-import requests
-
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import SUPABASE_URL, SUPABASE_KEY
+from config import SUPABASE_URL, SUPABASE_KEY, SUPABASE_POOL_SIZE
+from net.session import create_session
+
+
+def _quote(value):
+    """PostgREST in.(...) 필터용 값 인용 (쉼표/괄호가 들어간 이름 대비)"""
+    value = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{value}"'
 
 
 class SupabaseStorage:
-    def __init__(self):
-        if not SUPABASE_URL or not SUPABASE_KEY:
+    def __init__(self, url=None, key=None):
+        url = url or SUPABASE_URL
+        key = key or SUPABASE_KEY
+        if not url or not key:
             raise ValueError("Supabase 설정이 없습니다. .env.local 파일을 확인하세요.")
-        self.base_url = f"{SUPABASE_URL}/rest/v1"
+        self.base_url = f"{url}/rest/v1"
         self.headers = {
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}",
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
             "Content-Type": "application/json",
             "Prefer": "return=representation"
         }
+        # 연결 재사용 (POST는 중복 저장될 수 있어 재시도하지 않음)
+        self.session = create_session(pool_size=SUPABASE_POOL_SIZE, retry_methods=('GET', 'HEAD', 'PATCH'),
+                                      target='supabase')
 
-    def _request(self, method, endpoint, data=None, params=None):
+    def _request(self, method, endpoint, data=None, params=None, headers=None):
         """HTTP 요청 헬퍼"""
         url = f"{self.base_url}/{endpoint}"
-        response = requests.request(
+        response = self.session.request(
             method=method,
             url=url,
-            headers=self.headers,
+            headers={**self.headers, **(headers or {})},
             json=data,
             params=params,
             timeout=30
@@ -70,6 +80,73 @@ class SupabaseStorage:
                 return {'id': result[0]['id'], 'action': 'inserted'}
             return {'id': None, 'action': 'failed'}
 
+    def save_companies_bulk(self, rows, on_conflict='name'):
+        """
+        여러 기업을 한 번의 POST로 저장 (PostgREST upsert, merge-duplicates)
+        - companies.name에 unique 제약조건이 필요 (없으면 건별 save_company로 대체)
+        - 기존 여부는 저장 전 한 번의 조회로 판단 (조회가 실패하면 건별 저장으로 대체)
+        - 같은 배치 안에서 이름이 겹치면 마지막 행만 저장하고, 앞의 행은 'merged'
+        반환: 입력 순서대로 [{'name': ..., 'id': ..., 'action': 'inserted'|'updated'|'merged'|'failed'}]
+        """
+        if not rows:
+            return []
+
+        # 같은 배치 안에서 이름이 겹치면 마지막 값만 전송 (ON CONFLICT는 한 행을 두 번 수정할 수 없음)
+        unique_rows = {row[on_conflict]: row for row in rows}
+        last_index = {row[on_conflict]: i for i, row in enumerate(rows)}
+
+        def outcomes(saved):
+            # saved: 이름 -> {'id', 'action'}
+            result = []
+            for i, row in enumerate(rows):
+                key = row[on_conflict]
+                if last_index[key] != i:
+                    result.append({'name': key, 'id': saved[key]['id'], 'action': 'merged'})
+                else:
+                    result.append({'name': key, **saved[key]})
+            return result
+
+        def save_each():
+            return outcomes({key: self.save_company(row) for key, row in unique_rows.items()})
+
+        # URL 길이 제한 때문에 기존 여부 조회는 100개씩
+        keys = list(unique_rows)
+        existing_keys = set()
+        for i in range(0, len(keys), 100):
+            existing = self._request(
+                'GET',
+                'companies',
+                params={
+                    on_conflict: f"in.({','.join(_quote(k) for k in keys[i:i + 100])})",
+                    'select': f"id,{on_conflict}",
+                }
+            )
+            if existing is None:
+                print("기존 기업 조회 실패, 건별 저장으로 대체")
+                return save_each()
+            existing_keys.update(r[on_conflict] for r in existing)
+
+        result = self._request(
+            'POST',
+            'companies',
+            data=list(unique_rows.values()),
+            params={'on_conflict': on_conflict},
+            headers={'Prefer': 'resolution=merge-duplicates,return=representation'}
+        )
+
+        if result is None:
+            print("일괄 저장 실패, 건별 저장으로 대체")
+            return save_each()
+
+        saved_ids = {r[on_conflict]: r.get('id') for r in result}
+        saved = {}
+        for key in keys:
+            if key not in saved_ids:
+                saved[key] = {'id': None, 'action': 'failed'}
+            else:
+                saved[key] = {'id': saved_ids[key], 'action': 'updated' if key in existing_keys else 'inserted'}
+        return outcomes(saved)
+
     def save_contact(self, company_id, contact_data):
         """
         연락처 정보 저장 (company_contacts 테이블)
@@ -128,6 +205,25 @@ class SupabaseStorage:
         result = self._request('GET', 'companies', params=params)
         return len(result) > 0 if result else False
 
+    def iter_rows(self, table, select='*', page_size=1000):
+        """
+        테이블 전체를 페이지 단위로 조회 (Supabase는 요청당 최대 1000행)
+        """
+        offset = 0
+        while True:
+            page = self._request('GET', table, params={
+                'select': select,
+                'order': 'id.asc',
+                'limit': page_size,
+                'offset': offset,
+            })
+            if not page:
+                return
+            yield from page
+            if len(page) < page_size:
+                return
+            offset += page_size
+
     def get_crawler_state(self, source):
         """
         크롤러 상태 조회 (마지막 페이지 등)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+parser.contact_rank 테스트
+- 역할 주소 순위가 AI 프롬프트 우선순위(마케팅/영업 > 채용 > 대표 > info@)와 같은지
+- 역할을 알 수 없는 주소는 회사 도메인이어도 AI 호출 기준에 닿지 않는지
+"""
+import pytest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import AI_GATE_THRESHOLD
+from parser.contact_rank import score_email, rank_emails, best_contact
+
+WEBSITE = 'https://www.example.co.kr'
+
+
+def test_role_order_matches_prompt_priority():
+    scores = [score_email(f'{local}@example.co.kr', WEBSITE)
+              for local in ('marketing', 'recruit', 'ceo', 'info')]
+    assert scores == sorted(scores, reverse=True)
+    assert len(set(scores)) == len(scores)
+
+
+@pytest.mark.parametrize('other', ['info', 'help', 'cs', 'contact'])
+def test_recruit_ranks_above_generic_addresses(other):
+    assert score_email('recruit@example.co.kr', WEBSITE) > score_email(f'{other}@example.co.kr', WEBSITE)
+
+
+@pytest.mark.parametrize('email', ['design@example.co.kr', 'ceo2@example.co.kr', 'gildong.hong@example.co.kr'])
+def test_unknown_local_part_stays_below_gate_on_company_domain(email):
+    assert score_email(email, WEBSITE) < AI_GATE_THRESHOLD
+
+
+@pytest.mark.parametrize('email', ['sales@example.co.kr', 'marketing@example.co.kr', 'recruit@example.co.kr'])
+def test_prompt_priority_roles_on_company_domain_pass_gate(email):
+    assert score_email(email, WEBSITE) >= AI_GATE_THRESHOLD
+
+
+def test_info_address_goes_to_ai():
+    assert score_email('info@example.co.kr', WEBSITE) < AI_GATE_THRESHOLD
+
+
+def test_rank_and_best_contact():
+    emails = ['info@example.co.kr', 'noreply@example.co.kr', 'recruit@example.co.kr', 'sales@gmail.com',
+              'info@example.co.kr']
+    assert rank_emails(emails, WEBSITE) == ['recruit@example.co.kr', 'sales@gmail.com', 'info@example.co.kr',
+                                            'noreply@example.co.kr']
+    assert best_contact(emails, WEBSITE)[0] == 'recruit@example.co.kr'
+    assert best_contact([], WEBSITE) == (None, 0.0)
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+storage.dedup_index 테스트
+- 회사명 정규화: 법인 표기는 제거하고, 이름 안의 같은 글자(Inc/Corp)는 남기는지
+"""
+import pytest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.dedup_index import normalize_name
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('(주)인크로스', '인크로스'),
+    ('주식회사 테스트랩', '테스트랩'),
+    ('㈜ 가나다', '가나다'),
+    ('ABC Co., Ltd.', 'abc'),
+    ('ABC Co.,Ltd', 'abc'),
+    ('Samsung Electronics Co. Ltd', 'samsungelectronics'),
+    ('Foo, Inc.', 'foo'),
+    ('Zinc Corp', 'zinc'),
+    ('Bar Corp. (주)', 'bar'),
+])
+def test_normalize_name_strips_company_affixes(name, expected):
+    assert normalize_name(name) == expected
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('Incross', 'incross'),
+    ('Princeton', 'princeton'),
+    ('Vincent', 'vincent'),
+    ('Corpus Labs', 'corpuslabs'),
+    ('Cocoltd', 'cocoltd'),
+])
+def test_normalize_name_keeps_affix_letters_inside_names(name, expected):
+    assert normalize_name(name) == expected
+
+
+def test_normalize_name_does_not_merge_different_companies():
+    names = ['Incross', 'Ross', 'Princeton', 'Preton', 'Vincent', 'Vent', 'Corpus Labs', 'Us Labs', 'Zinc Corp', 'Z']
+    assert len({normalize_name(n) for n in names}) == len(names)
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+sources.saramin 상세 페이지 빠른 파싱 테스트
+- 파싱한 앞부분 밖의 푸터(<footer>, id="footer", class="footer")에서 연락처를 전체 파싱과 같이 찾는지
+"""
+import pytest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser.extractor import ContactExtractor, SARAMIN_BLOCKLIST
+from sources.saramin import parse_detail_fast, parse_detail_html
+
+REVIEW = '<p>' + '리뷰 내용 ' * 20000 + '</p>'
+
+
+def _page(footer):
+    return (f'<html><body><h1>테스트기업기업정보</h1><ul class="info_list"><li>업종 소프트웨어 개발</li></ul>'
+            f'{REVIEW}{footer}</body></html>')
+
+
+@pytest.mark.parametrize('footer', [
+    '<footer>대표 contact@foo.co.kr 02-555-1234</footer>',
+    '<div id="footer">대표 contact@foo.co.kr 02-555-1234</div>',
+    '<div class="wrap footer">대표 contact@foo.co.kr 02-555-1234</div>',
+    '<div data-page="detail" id=footer>대표 contact@foo.co.kr 02-555-1234</div>',
+])
+def test_fast_parse_reads_footer_outside_prefix(footer):
+    extractor = ContactExtractor(SARAMIN_BLOCKLIST)
+    html = _page(footer)
+
+    fast = parse_detail_fast(html, extractor)
+    full = parse_detail_html(html, extractor)
+
+    assert fast['name'] == full['name'] == '테스트기업'
+    assert fast['emails'] == full['emails'] == ['contact@foo.co.kr']
+    assert fast['phones'] == full['phones']
+
+
+def test_fast_parse_without_footer_skips_review_tail():
+    extractor = ContactExtractor(SARAMIN_BLOCKLIST)
+    html = _page('<div class="review-end">contact@foo.co.kr</div>')
+
+    assert parse_detail_fast(html, extractor)['emails'] == []
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+SupabaseStorage.save_companies_bulk 테스트 (bench.stub_postgrest 스텁 서버 대상)
+- on_conflict=name + merge-duplicates 일괄 저장
+- unique 제약조건이 없을 때 건별 저장으로 대체
+- 기존 여부 조회가 실패하면 건별 저장으로 대체
+- 결과가 입력 순서대로 돌아오는지 (이름이 겹치는 앞의 행은 'merged', 응답에 빠진 행은 'failed')
+"""
+import pytest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.stub_postgrest import StubPostgrestServer
+from storage.supabase_client import SupabaseStorage
+
+
+@pytest.fixture
+def stub():
+    server = StubPostgrestServer(latency=0).start()
+    yield server
+    server.stop()
+
+
+def _storage(server):
+    return SupabaseStorage(url=server.url, key='test-key')
+
+
+def _companies(server):
+    return {row['name']: row for row in server.tables.get('companies', [])}
+
+
+def test_bulk_upsert_merges_existing_rows(stub):
+    stub.tables['companies'] = [{'id': 100, 'name': '기존기업', 'email': 'old@a.co.kr'}]
+    stub._next_id = 101
+    storage = _storage(stub)
+
+    outcomes = storage.save_companies_bulk([
+        {'name': '신규기업', 'email': 'new@b.co.kr'},
+        {'name': '기존기업', 'email': 'info@a.co.kr'},
+    ])
+
+    assert outcomes == [
+        {'name': '신규기업', 'id': 101, 'action': 'inserted'},
+        {'name': '기존기업', 'id': 100, 'action': 'updated'},
+    ]
+    companies = _companies(stub)
+    assert len(companies) == 2
+    assert companies['기존기업']['email'] == 'info@a.co.kr'
+    # 기존 여부 조회 1회 + upsert 1회
+    assert stub.requests == 2
+
+
+def test_bulk_sends_on_conflict_and_merge_duplicates(stub, monkeypatch):
+    storage = _storage(stub)
+    calls = []
+    request = storage._request
+
+    def spy(method, endpoint, data=None, params=None, headers=None):
+        calls.append((method, params, headers))
+        return request(method, endpoint, data=data, params=params, headers=headers)
+
+    monkeypatch.setattr(storage, '_request', spy)
+    storage.save_companies_bulk([{'name': '기업A', 'email': 'a@a.co.kr'}])
+
+    posts = [c for c in calls if c[0] == 'POST']
+    assert len(posts) == 1
+    _, params, headers = posts[0]
+    assert params == {'on_conflict': 'name'}
+    assert 'resolution=merge-duplicates' in headers['Prefer']
+
+
+def test_bulk_reports_earlier_duplicate_names_as_merged(stub):
+    storage = _storage(stub)
+
+    outcomes = storage.save_companies_bulk([
+        {'name': '중복기업', 'email': 'first@a.co.kr'},
+        {'name': '다른기업', 'email': 'b@b.co.kr'},
+        {'name': '중복기업', 'email': 'second@a.co.kr'},
+    ])
+
+    assert [o['name'] for o in outcomes] == ['중복기업', '다른기업', '중복기업']
+    assert [o['action'] for o in outcomes] == ['merged', 'inserted', 'inserted']
+    assert outcomes[0]['id'] == outcomes[2]['id']
+    companies = _companies(stub)
+    assert len(companies) == 2
+    # 같은 이름은 마지막 값만 저장
+    assert companies['중복기업']['email'] == 'second@a.co.kr'
+
+
+def test_bulk_marks_rows_missing_from_response_as_failed(stub, monkeypatch):
+    storage = _storage(stub)
+    request = storage._request
+
+    def drop_second(method, endpoint, data=None, params=None, headers=None):
+        result = request(method, endpoint, data=data, params=params, headers=headers)
+        if method == 'POST':
+            result = [r for r in result if r['name'] != '누락기업']
+        return result
+
+    monkeypatch.setattr(storage, '_request', drop_second)
+    outcomes = storage.save_companies_bulk([
+        {'name': '정상기업', 'email': 'a@a.co.kr'},
+        {'name': '누락기업', 'email': 'b@b.co.kr'},
+    ])
+
+    assert [o['action'] for o in outcomes] == ['inserted', 'failed']
+    assert outcomes[1] == {'name': '누락기업', 'id': None, 'action': 'failed'}
+
+
+def test_bulk_falls_back_to_single_saves_without_unique_constraint(capsys):
+    stub = StubPostgrestServer(latency=0, unique={'companies': set()}).start()
+    try:
+        stub.tables['companies'] = [{'id': 100, 'name': '기존기업', 'email': 'old@a.co.kr'}]
+        stub._next_id = 101
+        storage = _storage(stub)
+
+        outcomes = storage.save_companies_bulk([
+            {'name': '기존기업', 'email': 'info@a.co.kr'},
+            {'name': '신규기업', 'email': 'new@b.co.kr'},
+        ])
+
+        assert outcomes == [
+            {'name': '기존기업', 'id': 100, 'action': 'updated'},
+            {'name': '신규기업', 'id': 101, 'action': 'inserted'},
+        ]
+        assert '건별 저장으로 대체' in capsys.readouterr().out
+        companies = _companies(stub)
+        assert len(companies) == 2
+        assert companies['기존기업']['email'] == 'info@a.co.kr'
+    finally:
+        stub.stop()
+
+
+def test_bulk_falls_back_when_existing_lookup_fails(stub, monkeypatch, capsys):
+    stub.tables['companies'] = [{'id': 100, 'name': '기존기업', 'email': 'old@a.co.kr'}]
+    stub._next_id = 101
+    storage = _storage(stub)
+    request = storage._request
+    lookups = []
+
+    def fail_first_lookup(method, endpoint, data=None, params=None, headers=None):
+        if method == 'GET' and not lookups:
+            lookups.append(params)
+            return None
+        return request(method, endpoint, data=data, params=params, headers=headers)
+
+    monkeypatch.setattr(storage, '_request', fail_first_lookup)
+    outcomes = storage.save_companies_bulk([
+        {'name': '기존기업', 'email': 'info@a.co.kr'},
+        {'name': '신규기업', 'email': 'new@b.co.kr'},
+    ])
+
+    # 조회 실패를 신규로 추측하지 않음
+    assert outcomes == [
+        {'name': '기존기업', 'id': 100, 'action': 'updated'},
+        {'name': '신규기업', 'id': 101, 'action': 'inserted'},
+    ]
+    assert '건별 저장으로 대체' in capsys.readouterr().out
+
+
+def test_single_save_fallback_sends_duplicate_names_once(monkeypatch):
+    stub = StubPostgrestServer(latency=0, unique={'companies': set()}).start()
+    try:
+        storage = _storage(stub)
+        sent = []
+        save_company = storage.save_company
+
+        def spy(row):
+            sent.append(row['email'])
+            return save_company(row)
+
+        monkeypatch.setattr(storage, 'save_company', spy)
+        outcomes = storage.save_companies_bulk([
+            {'name': '중복기업', 'email': 'first@a.co.kr'},
+            {'name': '중복기업', 'email': 'second@a.co.kr'},
+        ])
+
+        assert sent == ['second@a.co.kr']
+        assert [o['action'] for o in outcomes] == ['merged', 'inserted']
+        assert len(_companies(stub)) == 1
+    finally:
+        stub.stop()